@@ -0,0 +1,214 @@
+import os
+import sys
+import json
+import timeit
+import tracemalloc
+import contextlib
+from typing import Any, Callable, Dict, List
+
+import json_scan
+from crawler import Utils, MusinsaScraper, NaverScraper
+
+# ==========================================
+# PARSER MICROBENCHMARKS
+# ==========================================
+# 브라우저 없이 돌아가는 순수 파싱 함수들을 합성 데이터로 측정
+#
+#   python bench_parsers.py                  # 측정만
+#   python bench_parsers.py --save           # 결과를 기준값(bench_baseline.json)으로 저장
+#   python bench_parsers.py --compare        # 기준값과 비교, 느려졌으면 exit 1
+#   python bench_parsers.py --threshold=1.3  # 회귀 판정 배율 (기본 1.5)
+#   python bench_parsers.py --quick          # 작은 입력만
+
+BASELINE_PATH = "bench_baseline.json"
+SIZES = [10, 100, 1000, 5000]
+QUICK_SIZES = [10, 100]
+
+COLORS = ["블랙", "화이트", "네이비", "그레이", "베이지", "카키", "브라운", "아이보리"]
+APPAREL_SIZES = ["XS", "S", "M", "L", "XL", "XXL"]
+
+
+# --------------------------------------------------
+# 합성 데이터
+# --------------------------------------------------
+def make_actual_size_clothing(n: int) -> dict:
+    return {
+        "data": {
+            "sizes": [
+                {
+                    "name": f"{APPAREL_SIZES[i % len(APPAREL_SIZES)]}{i}",
+                    "items": [
+                        {"name": "총장", "value": 70 + i % 10},
+                        {"name": "어깨너비", "value": 50.5},
+                        {"name": "가슴단면", "value": 58},
+                        {"name": "소매길이", "value": 62.5},
+                    ],
+                }
+                for i in range(n)
+            ]
+        }
+    }
+
+
+def make_actual_size_shoes(n: int) -> dict:
+    return {"data": {"sizes": [], "footSize": [{"size": 220 + (i % 20) * 5} for i in range(n)]}}
+
+
+def make_naver_state(n: int) -> dict:
+    """
+    optionCombinations n개가 깊이 5의 노드에 있고,
+    그 앞에 비슷한 모양의 가짜 가지들이 잔뜩 있는 state
+    """
+    combos = [
+        {
+            "optionName1": COLORS[i % len(COLORS)] + (str(i // 400) if i >= 400 else ""),
+            "optionName2": str(220 + (i % 50) * 5),
+            "stockQuantity": 0 if i % 7 == 0 else i % 13,
+        }
+        for i in range(n)
+    ]
+
+    product = {"dispName": "테스트 상품", "salePrice": 39000, "optionCombinations": combos}
+    node: Dict[str, Any] = product
+    for depth in range(4):
+        node = {f"decoy{depth}_{j}": {"meta": {"k": j}, "list": [1, 2, 3]} for j in range(max(1, n // 100))} | {"A": node}
+    return {"productDetail": node, "unrelated": {f"k{j}": {"v": j} for j in range(max(1, n // 10))}}
+
+
+def make_naver_state_json(n: int) -> str:
+    return json.dumps(make_naver_state(n), ensure_ascii=False)
+
+
+def make_next_data_json(n: int) -> str:
+    """
+    상품 객체 앞에 리뷰 n개 분량의 다른 pageProps가 있는 __NEXT_DATA__ 원문 (상품이 뒤에 있는 최악의 경우)
+    """
+    reviews = [
+        {"no": i, "content": f"정사이즈 [{APPAREL_SIZES[i % 6]}] 추천 {{보통}}" * 3, "images": [{"url": f"/r/{i}.jpg"}]}
+        for i in range(n)
+    ]
+    product = {"goodsNo": 1, "goodsNm": "테스트 상품", "goodsOption": {"optionValues": [{"name": s} for s in APPAREL_SIZES]}}
+    return json.dumps({"props": {"pageProps": {"reviews": reviews, "state": {"product": product}}}}, ensure_ascii=False)
+
+
+def make_naver_product(n: int) -> dict:
+    return NaverScraper._find_real_product_data(make_naver_state(n))
+
+
+def make_price_texts(n: int) -> List[str]:
+    return [f"{'쿠폰적용가 ' * (i % 5)}{(i * 1237) % 1000000:,}원" for i in range(n)]
+
+
+def make_titles(n: int) -> List[str]:
+    return [f"[{'무신사 스탠다드' if i % 2 else '단독'}] 베이직 크루넥 티셔츠\n{'_' + COLORS[i % 8]}" for i in range(n)]
+
+
+def make_goods_names(n: int) -> List[str]:
+    forms = ["오버핏 후드 ({c})", "와이드 데님 팬츠_{c}", "스니커즈 - {c}", "색상 없는 상품명"]
+    return [forms[i % len(forms)].format(c=COLORS[i % len(COLORS)]) for i in range(n)]
+
+
+def make_shoe_sizes(n: int) -> List[str]:
+    forms = ["{mm}", "{mm}mm", "{cm}cm", "{cm}", "FREE"]
+    return [forms[i % len(forms)].format(mm=220 + (i % 20) * 5, cm=22 + (i % 20) / 2) for i in range(n)]
+
+
+# --------------------------------------------------
+# 측정 대상
+# --------------------------------------------------
+_musinsa = MusinsaScraper(None)
+
+
+def _each(fn: Callable) -> Callable:
+    return lambda items: [fn(x) for x in items]
+
+
+CASES = [
+    ("musinsa.parse_actual_size[clothing]", make_actual_size_clothing, _musinsa._parse_actual_size),
+    ("musinsa.parse_actual_size[shoes]", make_actual_size_shoes, _musinsa._parse_actual_size),
+    ("naver.find_real_product_data", make_naver_state, NaverScraper._find_real_product_data),
+    ("naver.loads+find_real_product_data", make_naver_state_json,
+     lambda raw: NaverScraper._find_real_product_data(json.loads(raw))),
+    ("naver.scan_option_node", make_naver_state_json,
+     lambda raw: json_scan.find_object_with_keys(raw, NaverScraper.OPTION_KEYS)),
+    ("musinsa.loads+find_next_data_product", make_next_data_json,
+     lambda raw: Utils.find_next_data_product(json.loads(raw))),
+    ("musinsa.scan_next_data_product", make_next_data_json, Utils.scan_next_data_product),
+    ("naver.extract_options", make_naver_product, NaverScraper._extract_options),
+    ("utils.extract_number", make_price_texts, _each(Utils.extract_number)),
+    ("utils.clean_title", make_titles, _each(Utils.clean_title)),
+    ("musinsa.extract_color_from_goods_name", make_goods_names, _each(_musinsa._extract_color_from_goods_name)),
+    ("musinsa.normalize_shoe_size_to_mm", make_shoe_sizes, _each(_musinsa._normalize_shoe_size_to_mm)),
+]
+
+
+def measure(fn: Callable, payload: Any, repeat: int = 5) -> Dict[str, float]:
+    timer = timeit.Timer(lambda: fn(payload))
+    number, _ = timer.autorange()
+    best = min(timer.repeat(repeat=repeat, number=number)) / number
+
+    tracemalloc.start()
+    fn(payload)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {"us_per_call": best * 1e6, "peak_kib": peak / 1024}
+
+
+def run(sizes: List[int]) -> Dict[str, Dict[str, float]]:
+    results = {}
+    # 파서들의 [DEBUG] 로그가 측정을 방해하지 않도록 stderr 차단
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stderr(devnull):
+        for name, make, fn in CASES:
+            for n in sizes:
+                key = f"{name}/n={n}"
+                r = results[key] = measure(fn, make(n))
+                print(f"{key:<50} {r['us_per_call']:>12.1f} us {r['peak_kib']:>10.1f} KiB", flush=True)
+    return results
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]], threshold: float) -> bool:
+    ok = True
+    print()
+    print(f"{'case':<50} {'base us':>10} {'now us':>10} {'ratio':>7}")
+    for key, now in results.items():
+        base = baseline.get(key)
+        if not base:
+            continue
+        ratio = now["us_per_call"] / base["us_per_call"] if base["us_per_call"] else 1.0
+        mark = ""
+        if ratio > threshold:
+            mark = "  << REGRESSION"
+            ok = False
+        print(f"{key:<50} {base['us_per_call']:>10.1f} {now['us_per_call']:>10.1f} {ratio:>6.2f}x{mark}")
+    return ok
+
+
+def main():
+    args = sys.argv[1:]
+    sizes = QUICK_SIZES if "--quick" in args else SIZES
+    threshold = 1.5
+    for a in args:
+        if a.startswith("--threshold="):
+            threshold = float(a.split("=", 1)[1])
+
+    print(f"{'case':<50} {'time/call':>15} {'peak mem':>14}")
+    results = run(sizes)
+
+    if "--save" in args:
+        with open(BASELINE_PATH, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nbaseline saved → {BASELINE_PATH}")
+
+    if "--compare" in args:
+        if not os.path.exists(BASELINE_PATH):
+            print(f"\nno baseline at {BASELINE_PATH} (run with --save first)")
+            sys.exit(2)
+        with open(BASELINE_PATH, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if not compare(results, baseline, threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,500 @@
+import os
+import sys
+import json
+import time
+import shutil
+import tempfile
+import itertools
+import threading
+import subprocess
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from typing import Any, Dict, List, Optional
+
+from selenium.webdriver.common.by import By
+from selenium.common.exceptions import (
+    JavascriptException,
+    NoSuchElementException,
+    NoSuchWindowException,
+    TimeoutException,
+    WebDriverException,
+)
+
+# ==========================================
+# DIRECT CDP DRIVER
+# ==========================================
+# chromedriver 없이 크롬 DevTools 웹소켓 하나로 직접 명령을 보낸다.
+#   selenium:  파이썬 → (HTTP) chromedriver → (CDP) 크롬
+#   여기:      파이썬 → (CDP 웹소켓) 크롬
+#
+# 스크래퍼가 쓰는 WebDriver API 일부만 구현:
+#   get / current_url / title / page_source / execute_script / execute_cdp_cmd
+#   find_element(s) (CSS, XPATH, ID) / set_page_load_timeout / quit / close
+#   window_handles / current_window_handle / switch_to.window / switch_to.new_window
+#   요소: text / tag_name / get_attribute / is_displayed / click / find_element(s)
+#
+# WebDriverWait / expected_conditions는 find_element만 쓰므로 그대로 동작.
+# 명령은 id로 응답을 매칭하므로 send()로 여러 개를 한꺼번에 보내고 나중에 받을 수 있다.
+#
+# 필요 패키지: websocket-client (pip install websocket-client)
+
+CHROME_CANDIDATES = [
+    "google-chrome",
+    "google-chrome-stable",
+    "chromium",
+    "chromium-browser",
+    "chrome",
+    r"C:\Program Files\Google\Chrome\Application\chrome.exe",
+    r"C:\Program Files (x86)\Google\Chrome\Application\chrome.exe",
+    "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
+]
+STARTUP_TIMEOUT = 20
+COMMAND_TIMEOUT = 30
+
+# execute_script 결과 포장: 노드(또는 노드 배열)는 객체로, 나머지는 JSON 문자열로 돌려받는다
+# (문자열은 returnByValue 없이도 값이 바로 오므로 왕복 한 번으로 끝남)
+_WRAP_SCRIPT = """function() {
+  const result = (function() { %s }).apply(null, arguments);
+  const isNode = (x) => x instanceof Node;
+  if (isNode(result) || (Array.isArray(result) && result.length && result.every(isNode))) {
+    return result;
+  }
+  return JSON.stringify({v: result === undefined ? null : result});
+}"""
+
+_FIND_SCRIPT = {
+    By.CSS_SELECTOR: "return Array.from((arguments[1] || document).querySelectorAll(arguments[0]));",
+    By.ID: "const el = document.getElementById(arguments[0]); return el ? [el] : [];",
+    By.XPATH: """
+        const snap = document.evaluate(arguments[0], arguments[1] || document, null,
+                                       XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+        const out = [];
+        for (let i = 0; i < snap.snapshotLength; i++) out.push(snap.snapshotItem(i));
+        return out;
+    """,
+}
+
+_ATTRIBUTE_SCRIPT = """
+    const el = arguments[0], name = arguments[1];
+    if (name === 'href' || name === 'src') { if (el[name]) return String(el[name]); }
+    if (el.hasAttribute(name)) {
+        const v = el.getAttribute(name);
+        // selenium처럼 불리언 속성은 "true"
+        return ['disabled', 'checked', 'selected', 'readonly', 'required'].includes(name) ? 'true' : v;
+    }
+    const p = el[name];
+    return (p === undefined || p === null || typeof p === 'object' || typeof p === 'function') ? null : String(p);
+"""
+
+_DISPLAYED_SCRIPT = """
+    const el = arguments[0];
+    if (!el.isConnected) return false;
+    const style = getComputedStyle(el);
+    if (style.display === 'none' || style.visibility === 'hidden' || style.opacity === '0') return false;
+    return el.getClientRects().length > 0;
+"""
+
+
+def find_chrome() -> str:
+    env = os.environ.get("CHROME_BINARY")
+    if env:
+        return env
+    for name in CHROME_CANDIDATES:
+        path = shutil.which(name) or (name if os.path.isfile(name) else None)
+        if path:
+            return path
+    raise WebDriverException("Chrome binary not found (set CHROME_BINARY)")
+
+
+class CDPConnection:
+    """
+    브라우저 웹소켓 하나. 명령마다 id를 붙여 보내고, 수신 스레드가 응답을 Future에 채운다.
+    flatten 세션을 쓰므로 탭이 여러 개여도 연결은 하나.
+    """
+    def __init__(self, ws_url: str):
+        try:
+            import websocket
+        except ImportError as e:
+            raise WebDriverException("CDP backend needs 'websocket-client' (pip install websocket-client)") from e
+
+        self.ws = websocket.create_connection(ws_url, suppress_origin=True)
+        self._ids = itertools.count(1)
+        self._pending: Dict[int, Future] = {}
+        self._waiters: List[tuple] = []   # (method, session_id, Future)
+        self._send_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self.closed = False
+        threading.Thread(target=self._reader, daemon=True).start()
+
+    def send(self, method: str, params: Optional[dict] = None, session_id: Optional[str] = None) -> Future:
+        """
+        응답을 기다리지 않고 바로 Future 반환 (여러 명령을 파이프라이닝할 때)
+        """
+        msg_id = next(self._ids)
+        fut: Future = Future()
+        with self._lock:
+            self._pending[msg_id] = fut
+        msg = {"id": msg_id, "method": method, "params": params or {}}
+        if session_id:
+            msg["sessionId"] = session_id
+        try:
+            with self._send_lock:
+                self.ws.send(json.dumps(msg))
+        except Exception as e:
+            with self._lock:
+                self._pending.pop(msg_id, None)
+            raise WebDriverException(f"CDP send failed: {e}") from e
+        return fut
+
+    def call(self, method: str, params: Optional[dict] = None, session_id: Optional[str] = None,
+             timeout: float = COMMAND_TIMEOUT) -> dict:
+        fut = self.send(method, params, session_id)
+        try:
+            return fut.result(timeout=timeout)
+        except FutureTimeout:
+            raise TimeoutException(f"CDP {method} timed out after {timeout}s")
+
+    def wait_for(self, method: str, session_id: Optional[str] = None) -> Future:
+        """
+        다음 이벤트 하나를 받을 Future (명령을 보내기 전에 등록해야 놓치지 않음)
+        """
+        fut: Future = Future()
+        with self._lock:
+            self._waiters.append((method, session_id, fut))
+        return fut
+
+    def cancel_wait(self, fut: Future):
+        """
+        wait_for로 등록한 Future를 이벤트가 오기 전에 해제 (다음 같은 이벤트를 가로채지 않게)
+        """
+        with self._lock:
+            self._waiters = [w for w in self._waiters if w[2] is not fut]
+        fut.cancel()
+
+    def _reader(self):
+        while True:
+            try:
+                raw = self.ws.recv()
+            except Exception:
+                break
+            if not raw:
+                continue
+            msg = json.loads(raw)
+
+            if "id" in msg:
+                with self._lock:
+                    fut = self._pending.pop(msg["id"], None)
+                if fut is None:
+                    continue
+                if "error" in msg:
+                    fut.set_exception(WebDriverException(f"CDP error: {msg['error'].get('message')}"))
+                else:
+                    fut.set_result(msg.get("result", {}))
+                continue
+
+            method, session_id = msg.get("method"), msg.get("sessionId")
+            with self._lock:
+                hits = [w for w in self._waiters if w[0] == method and w[1] in (None, session_id)]
+                self._waiters = [w for w in self._waiters if w not in hits]
+            for _, _, fut in hits:
+                fut.set_result(msg.get("params", {}))
+
+        # 연결 끊김 → 기다리던 명령 전부 실패 처리
+        self.closed = True
+        with self._lock:
+            pending, self._pending = list(self._pending.values()), {}
+            waiters, self._waiters = self._waiters, []
+        for fut in pending + [w[2] for w in waiters]:
+            if not fut.done():
+                fut.set_exception(WebDriverException("CDP connection closed"))
+
+    def close(self):
+        try:
+            self.ws.close()
+        except Exception:
+            pass
+
+
+class CDPElement:
+    def __init__(self, driver: "CDPDriver", object_id: str, session_id: str):
+        self._driver = driver
+        self._object_id = object_id
+        self._session_id = session_id
+
+    def _script(self, script: str, *args):
+        return self._driver.execute_script(script, self, *args)
+
+    @property
+    def text(self) -> str:
+        return self._script("return arguments[0].innerText || '';") or ""
+
+    @property
+    def tag_name(self) -> str:
+        return (self._script("return arguments[0].tagName;") or "").lower()
+
+    def get_attribute(self, name: str) -> Optional[str]:
+        return self._script(_ATTRIBUTE_SCRIPT, name)
+
+    def is_displayed(self) -> bool:
+        return bool(self._script(_DISPLAYED_SCRIPT))
+
+    def click(self):
+        self._script("arguments[0].scrollIntoView({block: 'center'}); arguments[0].click();")
+
+    def find_elements(self, by: str = By.CSS_SELECTOR, value: str = "") -> List["CDPElement"]:
+        return self._driver._find(by, value, self)
+
+    def find_element(self, by: str = By.CSS_SELECTOR, value: str = "") -> "CDPElement":
+        found = self.find_elements(by, value)
+        if not found:
+            raise NoSuchElementException(f"{by}={value}")
+        return found[0]
+
+
+class _SwitchTo:
+    def __init__(self, driver: "CDPDriver"):
+        self._driver = driver
+
+    def window(self, handle: str):
+        if handle not in self._driver._sessions:
+            raise NoSuchWindowException(handle)
+        self._driver._current = handle
+
+    def new_window(self, type_hint: str = "tab"):
+        self._driver._current = self._driver._open_target("about:blank")
+
+
+class CDPDriver:
+    """
+    selenium WebDriver 대신 쓸 수 있는 최소 구현 (DriverFactory.create_driver(backend="cdp"))
+    """
+    def __init__(self, arguments: List[str], profile_dir: Optional[str] = None):
+        self._temp_profile = None
+        if not profile_dir:
+            profile_dir = self._temp_profile = tempfile.mkdtemp(prefix="cdp-profile-")
+        self.profile_dir = os.path.abspath(profile_dir)
+
+        # 포트 0 → 크롬이 빈 포트를 골라 DevToolsActivePort 파일에 적어줌
+        port_file = os.path.join(self.profile_dir, "DevToolsActivePort")
+        if os.path.exists(port_file):
+            os.remove(port_file)
+
+        cmd = [
+            find_chrome(),
+            "--remote-debugging-port=0",
+            f"--user-data-dir={self.profile_dir}",
+            "--no-first-run",
+            "--no-default-browser-check",
+            # selenium은 "--" 없는 인자도 받아주므로 맞춰줌
+            *(a if a.startswith("--") else f"--{a}" for a in arguments),
+            "about:blank",
+        ]
+        self.process = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+        try:
+            ws_url = self._read_ws_url(port_file)
+            self.conn = CDPConnection(ws_url)
+        except Exception:
+            self._kill()
+            raise
+
+        self.page_load_timeout = 300.0
+        self._sessions: Dict[str, str] = {}   # target_id(=window handle) → session_id
+        self._current = ""
+        self.switch_to = _SwitchTo(self)
+        self._attach_first_page()
+
+    # --------------------------------------------------
+    # 연결 / 탭
+    # --------------------------------------------------
+    def _read_ws_url(self, port_file: str) -> str:
+        end = time.monotonic() + STARTUP_TIMEOUT
+        while time.monotonic() < end:
+            if self.process.poll() is not None:
+                raise WebDriverException(f"Chrome exited early (code {self.process.returncode})")
+            try:
+                with open(port_file, encoding="utf-8") as f:
+                    port, path = f.read().split("\n")[:2]
+                return f"ws://127.0.0.1:{port.strip()}{path.strip()}"
+            except (OSError, ValueError):
+                time.sleep(0.05)
+        raise WebDriverException("Chrome DevTools port not ready")
+
+    def _attach(self, target_id: str) -> str:
+        session_id = self.conn.call("Target.attachToTarget", {"targetId": target_id, "flatten": True})["sessionId"]
+        # 세 명령을 한꺼번에 보내고 응답은 나중에 확인 (파이프라이닝)
+        futures = [
+            self.conn.send("Page.enable", session_id=session_id),
+            self.conn.send("Runtime.enable", session_id=session_id),
+            self.conn.send("Page.setLifecycleEventsEnabled", {"enabled": True}, session_id=session_id),
+        ]
+        for fut in futures:
+            fut.result(timeout=COMMAND_TIMEOUT)
+        self._sessions[target_id] = session_id
+        return target_id
+
+    def _attach_first_page(self):
+        targets = self.conn.call("Target.getTargets")["targetInfos"]
+        pages = [t for t in targets if t.get("type") == "page"]
+        target_id = pages[0]["targetId"] if pages else self.conn.call("Target.createTarget", {"url": "about:blank"})["targetId"]
+        self._current = self._attach(target_id)
+
+    def _open_target(self, url: str) -> str:
+        target_id = self.conn.call("Target.createTarget", {"url": url})["targetId"]
+        return self._attach(target_id)
+
+    @property
+    def _session(self) -> str:
+        return self._sessions[self._current]
+
+    @property
+    def window_handles(self) -> List[str]:
+        return list(self._sessions)
+
+    @property
+    def current_window_handle(self) -> str:
+        return self._current
+
+    # --------------------------------------------------
+    # 저수준 명령 (파이프라이닝용)
+    # --------------------------------------------------
+    def send(self, method: str, params: Optional[dict] = None) -> Future:
+        """
+        현재 탭에 CDP 명령을 보내고 Future를 바로 반환
+        예: futs = [driver.send("DOM.getDocument"), driver.send("Page.getLayoutMetrics")]
+        """
+        return self.conn.send(method, params, self._session)
+
+    def execute_cdp_cmd(self, cmd: str, cmd_args: Optional[dict] = None) -> dict:
+        return self.conn.call(cmd, cmd_args or {}, self._session)
+
+    # --------------------------------------------------
+    # 탐색
+    # --------------------------------------------------
+    def set_page_load_timeout(self, seconds: float):
+        self.page_load_timeout = float(seconds)
+
+    def get(self, url: str):
+        session = self._session
+        loaded = self.conn.wait_for("Page.loadEventFired", session)
+        try:
+            result = self.conn.call("Page.navigate", {"url": url}, session)
+            if result.get("errorText"):
+                raise WebDriverException(f"navigation failed: {result['errorText']}")
+            loaded.result(timeout=self.page_load_timeout)
+        except FutureTimeout:
+            raise TimeoutException(f"page load timed out after {self.page_load_timeout}s")
+        finally:
+            # 실패/타임아웃이면 아직 등록된 채로 남아 다음 탐색의 load 이벤트를 먼저 받아버림
+            self.conn.cancel_wait(loaded)
+
+    @property
+    def current_url(self) -> str:
+        return self.execute_script("return location.href;") or ""
+
+    @property
+    def title(self) -> str:
+        return self.execute_script("return document.title;") or ""
+
+    @property
+    def page_source(self) -> str:
+        return self.execute_script("return document.documentElement.outerHTML;") or ""
+
+    # --------------------------------------------------
+    # 스크립트 / 요소
+    # --------------------------------------------------
+    def _to_call_arg(self, value: Any) -> dict:
+        if isinstance(value, CDPElement):
+            return {"objectId": value._object_id}
+        return {"value": value}
+
+    def execute_script(self, script: str, *args):
+        wrapped = _WRAP_SCRIPT % script
+        elements = [a for a in args if isinstance(a, CDPElement)]
+        # objectId는 그 요소를 찾은 탭의 세션에서만 유효 → 탭을 바꾼 뒤에 쓰는 요소도 원래 탭에서 실행
+        sessions = {el._session_id for el in elements}
+        if len(sessions) > 1:
+            raise WebDriverException("execute_script: elements from different tabs")
+        session = sessions.pop() if sessions else self._session
+        if elements:
+            # 요소 인자는 objectId로만 넘길 수 있음 → 그 요소 기준으로 함수 호출
+            method, params = "Runtime.callFunctionOn", {
+                "functionDeclaration": wrapped,
+                "objectId": elements[0]._object_id,
+                "arguments": [self._to_call_arg(a) for a in args],
+            }
+        else:
+            # 인자가 JSON 값뿐이면 식 하나로 평가 (왕복 1회)
+            method, params = "Runtime.evaluate", {
+                "expression": f"({wrapped}).apply(null, {json.dumps(list(args), ensure_ascii=False)})",
+            }
+        params.update(awaitPromise=True, userGesture=True)
+        result = self.conn.call(method, params, session)
+
+        if result.get("exceptionDetails"):
+            details = result["exceptionDetails"]
+            message = details.get("exception", {}).get("description") or details.get("text")
+            raise JavascriptException(message)
+
+        obj = result["result"]
+        if obj.get("type") == "string":
+            return json.loads(obj["value"]).get("v")
+        if obj.get("subtype") == "node":
+            return CDPElement(self, obj["objectId"], session)
+        if obj.get("subtype") == "array":
+            return self._node_list(obj["objectId"], session)
+        return obj.get("value")
+
+    def _node_list(self, object_id: str, session: str) -> List[CDPElement]:
+        props = self.conn.call("Runtime.getProperties", {"objectId": object_id, "ownProperties": True}, session)
+        nodes = []
+        for p in props.get("result", []):
+            if p.get("name", "").isdigit() and p.get("value", {}).get("objectId"):
+                nodes.append((int(p["name"]), CDPElement(self, p["value"]["objectId"], session)))
+        return [el for _, el in sorted(nodes, key=lambda x: x[0])]
+
+    def _find(self, by: str, value: str, root: Optional[CDPElement] = None) -> List[CDPElement]:
+        script = _FIND_SCRIPT.get(by)
+        if script is None:
+            raise WebDriverException(f"unsupported locator for CDP backend: {by}")
+        found = self.execute_script(script, value, root) if root else self.execute_script(script, value)
+        return found or []
+
+    def find_elements(self, by: str = By.CSS_SELECTOR, value: str = "") -> List[CDPElement]:
+        return self._find(by, value)
+
+    def find_element(self, by: str = By.CSS_SELECTOR, value: str = "") -> CDPElement:
+        found = self._find(by, value)
+        if not found:
+            raise NoSuchElementException(f"{by}={value}")
+        return found[0]
+
+    # --------------------------------------------------
+    # 종료
+    # --------------------------------------------------
+    def close(self):
+        target_id = self._current
+        self.conn.call("Target.closeTarget", {"targetId": target_id})
+        self._sessions.pop(target_id, None)
+
+    def quit(self):
+        try:
+            if not self.conn.closed:
+                self.conn.send("Browser.close")
+                self.process.wait(timeout=5)
+        except Exception:
+            pass
+        finally:
+            self.conn.close()
+            self._kill()
+
+    def _kill(self):
+        if self.process.poll() is None:
+            self.process.kill()
+            try:
+                self.process.wait(timeout=5)
+            except Exception:
+                pass
+        if self._temp_profile:
+            shutil.rmtree(self._temp_profile, ignore_errors=True)
+            self._temp_profile = None
+        print("[PY DEBUG] CDP browser closed", file=sys.stderr)
@@ -0,0 +1,227 @@
+import sys
+import json
+import time
+import hashlib
+import sqlite3
+import threading
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+import requests
+
+# ==========================================
+# CHANGE CACHE (조건부 요청 + 변경 감지)
+# ==========================================
+# 다시 긁을 때 바뀐 게 없으면 본문을 받거나 파싱하지 않고 지난 결과를 돌려준다.
+#
+#   responses : URL별 ETag / Last-Modified + 본문 해시 + 본문 (옵션/실측 API처럼 작은 JSON만)
+#               → If-None-Match / If-Modified-Since 로 요청, 304면 저장된 본문 사용
+#   pages     : 상품 페이지 HTML처럼 큰 본문은 저장하지 않고 ETag / Last-Modified + 부분 트리 해시만
+#               → 304면 본문 없이 저장된 해시 사용
+#   products  : 상품 URL별 "옵션/가격 JSON 부분 트리" 해시 + 마지막 ProductData
+#               → 해시가 같으면 나머지 단계(색상/사이즈/DOM)를 건너뜀
+#               단, 옵션 API / DOM에서만 보이는 재고는 해시에 안 잡히므로
+#               마지막으로 끝까지 긁은 지 max_age초가 지나면 해시가 같아도 다시 긁음
+#
+# retention초 동안 한 번도 확인하지 않은 항목은 열 때 지운다 (단종/내려간 상품이 계속 쌓이지 않게).
+# 크롤러: --changes=change_cache.db (여러 프로세스가 같은 파일을 써도 됨, WAL)
+
+DEFAULT_PATH = "change_cache.db"
+# 해시가 같아도 이 시간이 지나면 끝까지 다시 긁음 (초)
+DEFAULT_MAX_AGE = 3600
+# 이 기간 동안 확인하지 않은 항목은 삭제 (초)
+DEFAULT_RETENTION = 7 * 86400
+# responses에 본문을 저장하는 최대 크기 (이보다 크면 조건부 요청 없이 매번 받음)
+MAX_BODY = 256 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    url           TEXT PRIMARY KEY,
+    etag          TEXT,
+    last_modified TEXT,
+    digest        TEXT NOT NULL,
+    body          TEXT NOT NULL,
+    checked_at    INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS pages (
+    url           TEXT PRIMARY KEY,
+    etag          TEXT,
+    last_modified TEXT,
+    digest        TEXT NOT NULL,    -- 본문 해시가 아니라 호출한 쪽이 고른 부분 트리 해시
+    checked_at    INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS products (
+    url        TEXT PRIMARY KEY,
+    digest     TEXT NOT NULL,
+    doc        TEXT NOT NULL,
+    checked_at INTEGER NOT NULL     -- 마지막으로 끝까지 긁은 시각 (캐시 결과를 돌려줄 때는 안 바뀜)
+);
+CREATE INDEX IF NOT EXISTS responses_checked ON responses (checked_at);
+CREATE INDEX IF NOT EXISTS pages_checked ON pages (checked_at);
+CREATE INDEX IF NOT EXISTS products_checked ON products (checked_at);
+"""
+_TABLES = ("responses", "pages", "products")
+
+
+def content_digest(value: Any) -> str:
+    """
+    JSON 값의 내용 해시 (키 순서와 무관)
+    """
+    raw = json.dumps(value, ensure_ascii=False, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def subtree_digest(obj: Dict, keys: Iterable[str]) -> str:
+    """
+    obj에서 keys에 해당하는 부분만 골라 해시 (조회수/추천 목록처럼 자주 바뀌는 나머지는 무시)
+    """
+    return content_digest({k: obj.get(k) for k in keys if k in obj})
+
+
+class ChangeCache:
+    def __init__(self, path: str = DEFAULT_PATH, max_age: float = DEFAULT_MAX_AGE,
+                 retention: float = DEFAULT_RETENTION):
+        self.path = path
+        self.max_age = max_age
+        self.retention = retention
+        self.db = sqlite3.connect(path, timeout=10, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.executescript(_SCHEMA)
+        self.db.commit()
+        # 색상 변형 병렬 조회 등에서 같은 연결을 여러 스레드가 씀
+        self.lock = threading.Lock()
+        self.prune()
+
+    def prune(self, older_than: Optional[float] = None) -> int:
+        """
+        older_than초(기본 retention) 동안 확인하지 않은 항목 삭제. 반환값: 지운 행 수
+        (파일 크기는 그대로, 빈 페이지는 다음 기록에 재사용됨)
+        """
+        cutoff = int(time.time() - (self.retention if older_than is None else older_than))
+        removed = 0
+        with self.lock:
+            for table in _TABLES:
+                removed += self.db.execute(f"DELETE FROM {table} WHERE checked_at < ?", (cutoff,)).rowcount
+            self.db.commit()
+        if removed:
+            print(f"[PY DEBUG] change cache: pruned {removed} stale entries", file=sys.stderr)
+        return removed
+
+    # --------------------------------------------------
+    # HTTP 조건부 요청
+    # --------------------------------------------------
+    def _response(self, url: str) -> Optional[Tuple[str, str, str, str]]:
+        with self.lock:
+            return self.db.execute(
+                "SELECT etag, last_modified, digest, body FROM responses WHERE url = ?", (url,)
+            ).fetchone()
+
+    def get(self, url: str, headers: Optional[Dict[str, str]] = None, timeout: float = 5,
+            session=None) -> Optional[Tuple[str, bool]]:
+        """
+        조건부 GET → (본문, 바뀌었는지). 200/304가 아니면 None
+        304이거나 본문 해시가 같으면 바뀌지 않은 것으로 봄 (저장된 본문을 그대로 반환)
+        """
+        cached = self._response(url)
+        headers = self._conditional(headers, cached)
+
+        res = (session or requests).get(url, headers=headers, timeout=timeout)
+        if res.status_code == 304 and cached:
+            self._checked("responses", url)
+            print(f"[PY DEBUG] 304 Not Modified: {url}", file=sys.stderr)
+            return cached[3], False
+        if res.status_code != 200:
+            print(f"[PY DEBUG] conditional GET {url} → HTTP {res.status_code}", file=sys.stderr)
+            return None
+
+        body = res.text
+        digest = hashlib.sha256(res.content).hexdigest()
+        changed = not cached or cached[2] != digest
+        with self.lock:
+            if len(res.content) > MAX_BODY:
+                # 큰 본문은 저장하지 않음 (HTML 페이지는 page()로 해시만)
+                self.db.execute("DELETE FROM responses WHERE url = ?", (url,))
+            else:
+                self.db.execute(
+                    "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                    (url, res.headers.get("ETag"), res.headers.get("Last-Modified"), digest, body, int(time.time())),
+                )
+            self.db.commit()
+        return body, changed
+
+    def page(self, url: str, summarize: Callable[[str], Optional[str]], headers: Optional[Dict[str, str]] = None,
+             timeout: float = 5, session=None) -> Optional[str]:
+        """
+        큰 페이지용 조건부 GET → summarize(본문)이 돌려준 해시. 본문은 저장하지 않음
+        304면 본문을 받지도 파싱하지도 않고 저장된 해시를 반환. 실패하거나 summarize가 None이면 None
+        """
+        with self.lock:
+            cached = self.db.execute(
+                "SELECT etag, last_modified, digest FROM pages WHERE url = ?", (url,)
+            ).fetchone()
+        headers = self._conditional(headers, cached)
+
+        res = (session or requests).get(url, headers=headers, timeout=timeout)
+        if res.status_code == 304 and cached:
+            self._checked("pages", url)
+            print(f"[PY DEBUG] 304 Not Modified: {url}", file=sys.stderr)
+            return cached[2]
+        if res.status_code != 200:
+            print(f"[PY DEBUG] conditional GET {url} → HTTP {res.status_code}", file=sys.stderr)
+            return None
+
+        digest = summarize(res.text)
+        if digest is None:
+            return None
+        with self.lock:
+            self.db.execute(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?)",
+                (url, res.headers.get("ETag"), res.headers.get("Last-Modified"), digest, int(time.time())),
+            )
+            self.db.commit()
+        return digest
+
+    @staticmethod
+    def _conditional(headers: Optional[Dict[str, str]], cached: Optional[tuple]) -> Dict[str, str]:
+        # cached: (etag, last_modified, ...)
+        headers = dict(headers or {})
+        if cached:
+            etag, last_modified = cached[0], cached[1]
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+        return headers
+
+    # --------------------------------------------------
+    # 상품 단위 변경 감지
+    # --------------------------------------------------
+    def product(self, url: str, digest: str) -> Optional[dict]:
+        """
+        지난번과 같은 부분 트리 해시면 그때의 결과(ProductData.to_compact 형식), 아니면 None
+        마지막 전체 스크랩이 max_age초보다 오래됐으면 해시가 같아도 None (다시 긁게)
+        """
+        with self.lock:
+            row = self.db.execute("SELECT digest, doc, checked_at FROM products WHERE url = ?", (url,)).fetchone()
+        if not row or row[0] != digest:
+            return None
+        if time.time() - row[2] > self.max_age:
+            print(f"[PY DEBUG] cached product older than {self.max_age}s → full scrape", file=sys.stderr)
+            return None
+        return json.loads(row[1])
+
+    def remember(self, url: str, digest: str, result: dict):
+        # result: ProductData.to_compact() (조합은 인덱스 + 비트셋이라 큰 옵션 표도 작게 저장됨)
+        with self.lock:
+            self.db.execute(
+                "INSERT OR REPLACE INTO products VALUES (?, ?, ?, ?)",
+                (url, digest, json.dumps(result, ensure_ascii=False), int(time.time())),
+            )
+            self.db.commit()
+
+    def _checked(self, table: str, url: str):
+        with self.lock:
+            self.db.execute(f"UPDATE {table} SET checked_at = ? WHERE url = ?", (int(time.time()), url))
+            self.db.commit()
+
+    def close(self):
+        self.db.close()
@@ -0,0 +1,149 @@
+import sys
+import json
+import time
+import sqlite3
+import threading
+from typing import Dict, Iterator, Optional, Tuple
+
+# ==========================================
+# BATCH CHECKPOINT
+# ==========================================
+# 수천 개 URL 배치가 중간에 죽어도(크롬 크래시, 호스트 재시작) 처음부터 다시 하지 않도록
+# URL별 진행 상태와 결과를 끝나는 즉시 디스크에 남긴다.
+#
+#   pending : 시작했지만 끝나지 않음 (돌던 중에 죽었으면 이 상태로 남음)
+#   done    : 결과 저장됨 → 다시 실행하면 건너뛰고 저장된 결과를 그대로 출력
+#   failed  : 마지막 시도가 실패. attempts < max_attempts 이면 다시 실행하면 재시도
+#
+# 시작할 때 attempts를 올리므로, 크롬을 죽이는 URL도 max_attempts번 이후에는 건너뛴다.
+# 배치 하나 = 체크포인트 파일 하나 (다음 갱신 때는 새 파일을 쓰면 전부 다시 긁음).
+# 공유 큐(--queue) 워커는 lease/attempts가 같은 역할을 하므로 이 파일을 쓰지 않는다.
+#
+#   python crawler.py --worker --checkpoint=refresh.ckpt < urls.txt
+#   python crawler.py --batch=urls.txt                    # 체크포인트: urls.txt.ckpt
+#   python checkpoint.py stats refresh.ckpt
+#   python checkpoint.py results refresh.ckpt [done|failed|pending]
+
+DEFAULT_MAX_ATTEMPTS = 3
+
+PENDING, DONE, FAILED = "pending", "done", "failed"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS checkpoints (
+    url         TEXT PRIMARY KEY,
+    state       TEXT NOT NULL,
+    attempts    INTEGER NOT NULL DEFAULT 0,
+    result      TEXT,
+    error       TEXT,
+    updated_at  REAL NOT NULL
+);
+"""
+
+
+class Checkpoint:
+    def __init__(self, path: str, max_attempts: int = DEFAULT_MAX_ATTEMPTS):
+        self.path = path
+        self.max_attempts = max_attempts
+        self.db = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        # 커밋마다 fsync → 호스트가 꺼져도 끝난 작업은 남음 (스크랩 한 건에 비하면 비용은 무시할 만함)
+        self.db.execute("PRAGMA synchronous=FULL")
+        self.db.executescript(_SCHEMA)
+        self.db.commit()
+        # 탭 워커는 여러 스레드에서 기록함
+        self.lock = threading.Lock()
+
+    def check(self, url: str) -> Tuple[str, Optional[dict]]:
+        """
+        이번 실행에서 이 URL을 어떻게 할지 → ("run", None) | ("done", 결과) | ("gave_up", 마지막 오류)
+        """
+        with self.lock:
+            row = self.db.execute(
+                "SELECT state, attempts, result, error FROM checkpoints WHERE url = ?", (url,)
+            ).fetchone()
+        if row is None:
+            return "run", None
+        state, attempts, result, error = row
+        if state == DONE:
+            return "done", json.loads(result)
+        if attempts >= self.max_attempts:
+            return "gave_up", {"error": error or "interrupted", "attempts": attempts}
+        return "run", None
+
+    def start(self, url: str):
+        self._write(
+            "INSERT INTO checkpoints (url, state, attempts, updated_at) VALUES (?, ?, 1, ?) "
+            "ON CONFLICT(url) DO UPDATE SET state = excluded.state, attempts = attempts + 1, "
+            "error = NULL, updated_at = excluded.updated_at",
+            (url, PENDING, time.time()),
+        )
+
+    def done(self, url: str, result: dict):
+        self._write(
+            "UPDATE checkpoints SET state = ?, result = ?, error = NULL, updated_at = ? WHERE url = ?",
+            (DONE, json.dumps(result, ensure_ascii=False), time.time(), url),
+        )
+
+    def fail(self, url: str, error: str, retry: bool = True, refund: bool = False):
+        # retry=False (지원하지 않는 URL 등) → 다시 실행해도 시도하지 않음
+        # refund=True (사이트 차단처럼 URL 탓이 아닌 실패) → 이번 시도는 횟수에서 뺌
+        self._write(
+            "UPDATE checkpoints SET state = ?, error = ?, updated_at = ?, "
+            "attempts = CASE WHEN ? THEN attempts - ? ELSE MAX(attempts, ?) END WHERE url = ?",
+            (FAILED, error, time.time(), retry, int(refund), self.max_attempts, url),
+        )
+
+    def _write(self, sql: str, params: tuple):
+        with self.lock:
+            self.db.execute(sql, params)
+            self.db.commit()
+
+    def stats(self) -> Dict[str, int]:
+        counts = {PENDING: 0, DONE: 0, FAILED: 0}
+        with self.lock:
+            for state, n in self.db.execute("SELECT state, COUNT(*) FROM checkpoints GROUP BY state"):
+                counts[state] = n
+        return counts
+
+    def results(self, state: Optional[str] = None) -> Iterator[dict]:
+        sql = "SELECT url, state, attempts, result, error, updated_at FROM checkpoints"
+        params: tuple = ()
+        if state:
+            sql += " WHERE state = ?"
+            params = (state,)
+        with self.lock:
+            rows = self.db.execute(sql + " ORDER BY updated_at", params).fetchall()
+        for url, state, attempts, result, error, updated_at in rows:
+            yield {
+                "url": url, "state": state, "attempts": attempts,
+                "result": json.loads(result) if result else None,
+                "error": error, "updatedAt": updated_at,
+            }
+
+    def close(self):
+        self.db.close()
+
+
+# ==========================================
+# CLI
+# ==========================================
+def main():
+    args = sys.argv[1:]
+    if len(args) < 2:
+        print("usage: checkpoint.py stats|results CHECKPOINT [state]", file=sys.stderr)
+        sys.exit(2)
+
+    command, checkpoint = args[0], Checkpoint(args[1])
+    if command == "stats":
+        print(json.dumps(checkpoint.stats()))
+    elif command == "results":
+        for r in checkpoint.results(args[2] if len(args) > 2 else None):
+            print(json.dumps(r, ensure_ascii=False))
+    else:
+        print(f"unknown command: {command}", file=sys.stderr)
+        sys.exit(2)
+
+
+if __name__ == "__main__":
+    sys.stdout.reconfigure(encoding="utf-8")
+    main()
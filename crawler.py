@@ -1,11 +1,23 @@
+import os
 import sys
 import json
 import re
 import time
+import math
+import shutil
+import queue
+import base64
+import threading
 import requests
+from array import array
+from collections import deque
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FutureTimeout
+from html.parser import HTMLParser
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass, asdict, field
+from typing import Dict, List, Optional, Any, Callable, Iterable
+from urllib.parse import urlparse
+from dataclasses import dataclass, asdict, field, replace
 
 sys.stdout.reconfigure(encoding='utf-8')
 
@@ -18,6 +30,18 @@ from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
+import metrics
+import json_scan
+from cdp_driver import CDPDriver
+from file_lock import file_lock
+from price_history import HistoryStore, product_key
+from image_cache import ImageCache
+from product_index import ProductIndex
+from change_cache import ChangeCache, subtree_digest
+from export_sink import ExportSink
+from checkpoint import Checkpoint
+from job_queue import Lease, open_queue, site_of, worker_name
+
 # ==========================================
 # 1. CONFIG
 # ==========================================
@@ -38,6 +62,84 @@ class Config:
         "span[class*='Price']",
     ]
 
+    # 사이트 주소 (부하 테스트 때 환경 변수로 로컬 대역 서버를 가리키게 함, load_test.py 참고)
+    MUSINSA_ORIGIN = os.environ.get("MUSINSA_ORIGIN", "https://www.musinsa.com")
+    MUSINSA_API_ORIGIN = os.environ.get("MUSINSA_API_ORIGIN", "https://goods-detail.musinsa.com")
+
+    MUSINSA_PRODUCT_URL = MUSINSA_ORIGIN + "/products/{goods_no}"
+    MUSINSA_ACTUAL_SIZE_URL = MUSINSA_API_ORIGIN + "/api2/goods/{goods_no}/actual-size"
+    # 옵션 목록 + 옵션 조합(색상×사이즈)별 재고
+    MUSINSA_OPTIONS_URL = MUSINSA_API_ORIGIN + "/api2/goods/{goods_no}/v2/options?goodsSaleType=SALE"
+    # 다른 색상 상품 동시 조회 개수
+    VARIANT_WORKERS = 8
+    # 브라우저 로딩과 겹쳐서 미리 시작하는 HTTP 작업(actual-size, 옵션 API) 동시 실행 수
+    PREFETCH_WORKERS = 2
+
+    # 공유 큐 모드: 사이트별 작업 시작 최소 간격 (초, 모든 호스트 합산)
+    SITE_MIN_INTERVAL = {"musinsa": 2.0, "naver": 3.0}
+    QUEUE_LEASE_SECONDS = 120
+    QUEUE_IDLE_SLEEP = 2
+
+    # 차단/캡차/로그인/오류 페이지 감지 (페이지 이동 직후 스크립트 한 번으로 판단)
+    # HTTP 상태 → 종류 (5xx는 error_page)
+    BLOCK_STATUS = {401: "login", 403: "blocked", 404: "not_found", 410: "not_found", 429: "rate_limited"}
+    # 화면에 보이고 상품 JSON이 없을 때만 캡차로 봄
+    # (정상 페이지에도 reCAPTCHA v3/Enterprise의 보이지 않는 iframe이 흔히 들어 있음)
+    BLOCK_SELECTORS = [
+        "iframe[src*='recaptcha']",
+        "iframe[src*='hcaptcha']",
+        ".g-recaptcha",
+        "#rcpt_form",               # 네이버 자동입력 방지
+        "#challenge-form",          # Cloudflare
+        "#cf-challenge-running",
+    ]
+    # 리다이렉트된 주소에 들어 있으면
+    BLOCK_URL_MARKERS = {
+        "login": ["nid.naver.com/nidlogin", "/auth/login", "/member/login"],
+        "captcha": ["captcha", "ncpt.naver.com"],
+    }
+    # 제목/본문 문구 — 상품 JSON이 없는 페이지에서만 봄 (상품 페이지에도 '로그인' 같은 말은 있음)
+    BLOCK_TEXT_MARKERS = {
+        "captcha": ["Just a moment", "자동입력 방지", "보안 확인", "로봇이 아닙니다"],
+        "blocked": ["Access Denied", "Attention Required", "비정상적인 접근", "접근이 제한", "접속이 차단"],
+        "rate_limited": ["Too Many Requests", "요청이 너무 많"],
+        "not_found": ["상품이 존재하지 않습니다", "존재하지 않는 상품", "페이지를 찾을 수 없습니다"],
+        "error_page": ["일시적인 오류", "일시적으로 서비스", "서비스 점검", "시스템 오류"],
+    }
+    # 이 종류로 막히면 그 사이트를 잠시 쉼 (BASE초부터 막힐 때마다 두 배, MAX초까지)
+    BLOCK_BACKOFF_KINDS = ("captcha", "login", "blocked", "rate_limited")
+    BLOCK_BACKOFF_BASE = 60
+    BLOCK_BACKOFF_MAX = 1800
+
+    # 상품 이미지 다운로드 최대 대기 (--images 모드)
+    IMAGE_TIMEOUT = 10
+
+    # 드라이버 백엔드: "selenium" (chromedriver 경유) / "cdp" (DevTools 웹소켓 직결)
+    DRIVER_BACKEND = "selenium"
+
+    # 탭 다중화 모드: 탭 로딩 완료(readyState) 최대 대기
+    TAB_READY_TIMEOUT = 20
+
+    # 영구 프로필 (--profile=DIR): 슬롯(동시 실행 크롬)마다 user-data-dir 하나
+    PROFILE_SLOTS = 4
+    DISK_CACHE_SIZE = 200 * 1024 * 1024        # 크롬 HTTP 캐시 상한
+    PROFILE_MAX_BYTES = 600 * 1024 * 1024      # 이걸 넘으면 캐시 폴더 비움
+    PROFILE_CLEANUP_INTERVAL = 6 * 3600        # 정리 주기 (초)
+    # 크롬이 꺼져 있을 때만 지워도 되는 캐시 폴더들 (쿠키/로그인은 유지)
+    PROFILE_CACHE_DIRS = [
+        "Cache",
+        os.path.join("Default", "Cache"),
+        os.path.join("Default", "Code Cache"),
+        os.path.join("Default", "GPUCache"),
+        os.path.join("Default", "Service Worker", "CacheStorage"),
+        "GrShaderCache",
+        "ShaderCache",
+    ]
+    PREWARM_URLS = [
+        "https://www.musinsa.com/",
+        "https://smartstore.naver.com/",
+    ]
+
     MUSINSA_OPTS_BTN = ["#option1 option", ".option1 button", ".opt-list li button"]
     MUSINSA_OPTS_LIST = [".option_list li", "#size_list li", ".goods_opt_list li"]
 
@@ -51,13 +153,33 @@ class Config:
         "strong.price",
         "span.cwq0ZTei2a",
         ".lowest .price",
-        ".product_bridge_product__price"
-        ".origin_price"
-        "strong.price"
-        "div[class*='price'] > span"
-        "strong[class*='price']"
+        ".product_bridge_product__price",
+        ".origin_price",
+        "div[class*='price'] > span",
+        "strong[class*='price']",
     ]
 
+    # 색상 드롭다운 트리거 (placeholder가 '컬러'/'색상'인 input)
+    COLOR_TRIGGERS = [
+        "input[placeholder='컬러']",
+        "input[placeholder*='색상']",
+        "input[data-button-name*='컬러']",
+        "input[data-button-name*='색상']",
+        "div[data-mds='DropdownTriggerBox'] input[placeholder*='컬러']",
+        "div[data-mds='DropdownTriggerBox'] input[placeholder*='색상']",
+    ]
+    # 무신사 옵션(사이즈) 드롭다운 트리거
+    MUSINSA_OPTION_TRIGGERS = [
+        "div[class*='DropdownTrigger']",             # 가장 안정적
+        "input[class*='DropdownTriggerInput']",      # v2 구조
+        "div[class*='OptionBox__SelectContainer']",  # 예전 + 일부 최신
+        "input[placeholder*='옵션']",
+        "input[readonly]",
+    ]
+
+    # 상품정보 제공고시 표에서 찾는 항목 이름
+    INFO_NOTICE_KEYS = ["치수", "사이즈", "색상"]
+
     NAVER_TITLE = [
         "h3._22kNQuPmbq",
         "._22kNQuPmbq",
@@ -70,8 +192,165 @@ class Config:
 # ==========================================
 # 2. PRODUCT DATA MODEL
 # ==========================================
-@dataclass
+class OptionRecord:
+    """
+    색상 / 사이즈 한 개 (이름 + 품절 여부). 기존 dict처럼 o["name"], o.get("isSoldOut")로도 읽힘
+    그 밖의 키(다른 색상 상품의 goodsNo / price / isCurrent 등)는 extra에 그대로 보관
+    """
+    __slots__ = ("name", "sold_out", "extra")
+
+    def __init__(self, name: str, sold_out: bool = False, extra: Optional[dict] = None):
+        self.name = name
+        self.sold_out = sold_out
+        self.extra = extra or None
+
+    @classmethod
+    def of(cls, option) -> "OptionRecord":
+        if isinstance(option, cls):
+            return option
+        extra = {k: v for k, v in option.items() if k not in ("name", "isSoldOut")}
+        return cls(option.get("name", ""), bool(option.get("isSoldOut")), extra)
+
+    def get(self, key: str, default=None):
+        if key == "name":
+            return self.name
+        if key == "isSoldOut":
+            return self.sold_out
+        if self.extra:
+            return self.extra.get(key, default)
+        return default
+
+    def __getitem__(self, key: str):
+        value = self.get(key, KeyError)
+        if value is KeyError:
+            raise KeyError(key)
+        return value
+
+    def to_dict(self) -> dict:
+        return {"name": self.name, "isSoldOut": self.sold_out, **(self.extra or {})}
+
+
+def _option_dict(option) -> dict:
+    return option.to_dict() if isinstance(option, OptionRecord) else option
+
+
+def _pack_bits(flags: Iterable[bool]) -> str:
+    bits = bytearray()
+    for i, flag in enumerate(flags):
+        if i % 8 == 0:
+            bits.append(0)
+        if flag:
+            bits[-1] |= 1 << (i % 8)
+    return base64.b64encode(bytes(bits)).decode("ascii")
+
+
+def _unpack_bits(text: str, count: int) -> List[bool]:
+    bits = base64.b64decode(text or "")
+    return [bool(bits[i // 8] >> (i % 8) & 1) if i // 8 < len(bits) else False for i in range(count)]
+
+
+def _option_extras(options) -> Optional[List[dict]]:
+    # 이름/품절 말고 다른 키가 하나라도 있으면 옵션마다 나머지 키 (없으면 압축 형식에 안 씀)
+    extras = [OptionRecord.of(o).extra or {} for o in options]
+    return extras if any(extras) else None
+
+
+def _option_records(names: List[str], out: str, extras: Optional[List[dict]]) -> List[OptionRecord]:
+    flags = _unpack_bits(out, len(names))
+    extras = extras or [None] * len(names)
+    return [OptionRecord(n, f, e) for n, f, e in zip(names, flags, extras)]
+
+
+class StockMatrix:
+    """
+    색상×사이즈 조합 재고.
+    조합마다 색상/사이즈 문자열을 반복하지 않고 라벨 목록 + 인덱스 배열 + 품절 비트셋으로 보관
+    """
+    __slots__ = ("colors", "sizes", "color_idx", "size_idx", "sold_out")
+
+    def __init__(self):
+        self.colors: List[str] = []
+        self.sizes: List[str] = []
+        self.color_idx = array("H")
+        self.size_idx = array("H")
+        self.sold_out = bytearray()
+
+    @classmethod
+    def from_list(cls, combos: Iterable[dict]) -> "StockMatrix":
+        m = cls()
+        color_pos: Dict[str, int] = {}
+        size_pos: Dict[str, int] = {}
+        for i, c in enumerate(combos):
+            color, size = c.get("color", ""), c.get("size", "")
+            if color not in color_pos:
+                color_pos[color] = len(m.colors)
+                m.colors.append(color)
+            if size not in size_pos:
+                size_pos[size] = len(m.sizes)
+                m.sizes.append(size)
+            m.color_idx.append(color_pos[color])
+            m.size_idx.append(size_pos[size])
+            if i % 8 == 0:
+                m.sold_out.append(0)
+            if c.get("isSoldOut"):
+                m.sold_out[-1] |= 1 << (i % 8)
+        return m
+
+    def __len__(self):
+        return len(self.color_idx)
+
+    def is_sold_out(self, i: int) -> bool:
+        return bool(self.sold_out[i // 8] >> (i % 8) & 1)
+
+    def to_list(self) -> List[dict]:
+        return [
+            {"color": self.colors[c], "size": self.sizes[s], "isSoldOut": self.is_sold_out(i)}
+            for i, (c, s) in enumerate(zip(self.color_idx, self.size_idx))
+        ]
+
+    def _full_grid(self) -> bool:
+        # 색상마다 모든 사이즈가 순서대로 있으면 인덱스 배열 없이 복원 가능
+        n = len(self.sizes)
+        return len(self) == len(self.colors) * n and all(
+            c == i // n and s == i % n for i, (c, s) in enumerate(zip(self.color_idx, self.size_idx))
+        )
+
+    def to_compact(self, colors: Optional[List[str]] = None, sizes: Optional[List[str]] = None) -> dict:
+        """
+        colors / sizes: 상품 전체 색상·사이즈 이름 목록. 같으면 라벨을 다시 쓰지 않음
+        """
+        out: Dict[str, Any] = {"out": base64.b64encode(bytes(self.sold_out)).decode("ascii")}
+        if self.colors != colors:
+            out["colors"] = self.colors
+        if self.sizes != sizes:
+            out["sizes"] = self.sizes
+        if not self._full_grid():
+            out["c"] = list(self.color_idx)
+            out["s"] = list(self.size_idx)
+        return out
+
+    @classmethod
+    def from_compact(cls, d: dict, colors: List[str], sizes: List[str]) -> "StockMatrix":
+        m = cls()
+        m.colors = d.get("colors", colors)
+        m.sizes = d.get("sizes", sizes)
+        if "c" in d:
+            m.color_idx = array("H", d["c"])
+            m.size_idx = array("H", d["s"])
+        else:
+            n = len(m.sizes)
+            m.color_idx = array("H", (i // n for i in range(len(m.colors) * n)))
+            m.size_idx = array("H", (i % n for i in range(len(m.colors) * n)))
+        m.sold_out = bytearray(base64.b64decode(d.get("out", "")))
+        return m
+
+
 class ProductData:
+    __slots__ = (
+        "site", "title", "price", "image", "colors", "sizes", "_combos", "_matrix",
+        "incomplete", "commands", "thumbnails", "unchanged", "actualSizes",
+    )
+
     def __init__(self, site="", title="", price=0, image="", colors=None, sizes=None, combinations=None):
         self.site = site
         self.title = title
@@ -79,8 +358,108 @@ class ProductData:
         self.image = image
         self.colors = colors if colors else []
         self.sizes = sizes if sizes else []
-        # [추가됨] 조합 정보를 담을 변수
-        self.combinations = combinations if combinations else [] 
+        # [추가됨] 조합 정보를 담을 변수 (수집 중에는 리스트, pack() 뒤에는 StockMatrix로 압축 보관)
+        self.combinations = combinations if combinations else []
+        # 시간 예산 초과로 끝까지 못 채운 필드 이름들
+        self.incomplete = []
+        # 브라우저 명령 수 (CountingDriver로 감쌌을 때만)
+        self.commands = None
+        # 로컬 썸네일 URL들 (--images 옵션을 줬을 때만)
+        self.thumbnails = None
+        # 지난 결과와 옵션/가격이 같아서 다시 긁지 않고 돌려준 결과
+        self.unchanged = False
+
+    @property
+    def combinations(self) -> List[dict]:
+        """
+        일반 리스트처럼 append / 제자리 수정 가능. 압축된 상태면 읽는 순간 리스트로 풀어서 보관
+        (다시 압축하려면 pack())
+        """
+        if self._matrix is not None:
+            self._combos = self._matrix.to_list()
+            self._matrix = None
+        return self._combos
+
+    @combinations.setter
+    def combinations(self, combos):
+        self._combos = list(combos) if combos else []
+        self._matrix = None
+
+    def _combination_list(self) -> List[dict]:
+        # 읽기 전용 (압축 상태를 풀지 않음)
+        return self._matrix.to_list() if self._matrix is not None else self._combos
+
+    def _stock_matrix(self) -> Optional[StockMatrix]:
+        if self._matrix is not None:
+            return self._matrix
+        return StockMatrix.from_list(self._combos) if self._combos else None
+
+    def pack(self):
+        """
+        수집이 끝난 뒤 색상/사이즈 dict들을 OptionRecord로, 조합을 StockMatrix로 (캐시·이력에 오래 들고 있을 때)
+        """
+        self.colors = [OptionRecord.of(o) for o in self.colors]
+        self.sizes = [OptionRecord.of(o) for o in self.sizes]
+        if self._combos:
+            self._matrix = StockMatrix.from_list(self._combos)
+            self._combos = []
+        return self
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "ProductData":
+        if "v" in d:
+            return cls.from_compact(d)
+        return cls(
+            site=d.get("site", ""),
+            title=d.get("title", ""),
+            price=d.get("price", 0),
+            image=d.get("image", ""),
+            colors=d.get("colors"),
+            sizes=d.get("sizes"),
+            combinations=d.get("combinations"),
+        )
+
+    def to_compact(self) -> dict:
+        """
+        캐시/이력 저장용 압축 형식 (to_dict와 같은 내용, 키 반복 없음)
+        {"v": 1, ..., "colors": [이름], "colorsOut": 품절 비트셋(base64), "sizes": .., "sizesOut": ..,
+         "colorsExtra"/"sizesExtra": 옵션마다 나머지 키 (있을 때만),
+         "combos": {"out": 비트셋, "c"/"s": 인덱스 배열 (색상×사이즈 전체 격자면 생략)}}
+        """
+        colors = [o.get("name", "") for o in self.colors]
+        sizes = [o.get("name", "") for o in self.sizes]
+        out = {
+            "v": 1,
+            "site": self.site,
+            "title": self.title,
+            "price": self.price,
+            "image": self.image,
+            "colors": colors,
+            "colorsOut": _pack_bits(bool(o.get("isSoldOut")) for o in self.colors),
+            "sizes": sizes,
+            "sizesOut": _pack_bits(bool(o.get("isSoldOut")) for o in self.sizes),
+        }
+        for key, options in (("colorsExtra", self.colors), ("sizesExtra", self.sizes)):
+            extras = _option_extras(options)
+            if extras:
+                out[key] = extras
+        matrix = self._stock_matrix()
+        if matrix is not None:
+            out["combos"] = matrix.to_compact(colors, sizes)
+        if self.incomplete:
+            out["incomplete"] = self.incomplete
+        return out
+
+    @classmethod
+    def from_compact(cls, d: dict) -> "ProductData":
+        colors, sizes = d.get("colors", []), d.get("sizes", [])
+        data = cls(site=d.get("site", ""), title=d.get("title", ""), price=d.get("price", 0), image=d.get("image", ""))
+        data.colors = _option_records(colors, d.get("colorsOut"), d.get("colorsExtra"))
+        data.sizes = _option_records(sizes, d.get("sizesOut"), d.get("sizesExtra"))
+        if d.get("combos"):
+            data._matrix = StockMatrix.from_compact(d["combos"], colors, sizes)
+        data.incomplete = list(d.get("incomplete", []))
+        return data
 
     def to_dict(self):
         return {
@@ -89,12 +468,20 @@ class ProductData:
             "price": self.price,
             "priceFormatted": f"{int(self.price):,}원" if self.price else "가격 정보 없음",
             "image": self.image,
-            "colors": self.colors,
-            "sizes": self.sizes,
+            "colors": [_option_dict(o) for o in self.colors],
+            "sizes": [_option_dict(o) for o in self.sizes],
             # [추가됨] 딕셔너리로 변환할 때도 포함
-            "combinations": self.combinations 
+            "combinations": self._combination_list(),
+            "incomplete": self.incomplete,
+            **({"driverCommands": self.commands} if self.commands is not None else {}),
+            **({"thumbnail": self.thumbnails["thumbnail"], "thumbnails": self.thumbnails} if self.thumbnails else {}),
+            **({"unchanged": True} if self.unchanged else {}),
         }
 
+    def mark_incomplete(self, field_name: str):
+        if field_name not in self.incomplete:
+            self.incomplete.append(field_name)
+
 
 # ==========================================
 # 3. UTILITIES
@@ -120,6 +507,73 @@ class Utils:
         title = re.sub(r"^\[.*?\]\s*", "", title)
         return title.strip()
 
+    @staticmethod
+    def find_next_data_product(next_data: Dict) -> Optional[Dict]:
+        """
+        __NEXT_DATA__ JSON에서 상품(product / goods) 객체 찾기
+        """
+        page_props = Utils.safe_get(next_data, ["props", "pageProps"], {})
+        state = (
+            page_props.get("state")
+            or page_props.get("initialState")
+            or {}
+        )
+        return (
+            state.get("product")
+            or state.get("goods")
+            or page_props.get("product")
+            or page_props.get("goods")
+        )
+
+    # find_next_data_product와 같은 우선순위 (state → initialState → pageProps 바로 아래)
+    NEXT_DATA_PRODUCT_PATHS = [
+        ("props", "pageProps", "state", "product"),
+        ("props", "pageProps", "state", "goods"),
+        ("props", "pageProps", "initialState", "product"),
+        ("props", "pageProps", "initialState", "goods"),
+        ("props", "pageProps", "product"),
+        ("props", "pageProps", "goods"),
+    ]
+
+    @staticmethod
+    def scan_next_data_product(raw: str, start: int = 0) -> Optional[Dict]:
+        """
+        __NEXT_DATA__ 원문에서 상품 객체만 만들어 반환 (전체 json.loads 없이, 찾으면 바로 멈춤)
+        """
+        try:
+            return json_scan.find_first(raw or "", Utils.NEXT_DATA_PRODUCT_PATHS, start)
+        except ValueError as e:
+            print(f"[PY DEBUG] __NEXT_DATA__ scan error: {e}", file=sys.stderr)
+            return None
+
+    @staticmethod
+    def next_data_product(html: str) -> Optional[Dict]:
+        # <script> 내용을 잘라내지 않고 HTML 안에서 바로 훑음
+        m = re.search(r'<script[^>]*id="__NEXT_DATA__"[^>]*>', html or "")
+        if not m:
+            return None
+        return Utils.scan_next_data_product(html, m.end())
+
+    @staticmethod
+    def extract_next_data(html: str) -> Optional[Dict]:
+        m = re.search(r'<script[^>]*id="__NEXT_DATA__"[^>]*>(.*?)</script>', html or "", re.S)
+        if not m:
+            return None
+        try:
+            return json.loads(m.group(1))
+        except Exception:
+            return None
+
+    @staticmethod
+    def parse_info_notice(html: str) -> Dict[str, str]:
+        parser = InfoNoticeParser()
+        try:
+            parser.feed(html or "")
+            parser.close()
+        except Exception as e:
+            print(f"[PY DEBUG] info notice html parse error: {e}", file=sys.stderr)
+        return parser.rows
+
     @staticmethod
     def safe_get(d: Dict, keys: List[str], default=None):
         for k in keys:
@@ -130,61 +584,1085 @@ class Utils:
         return d if d else default
 
 
+class InfoNoticeParser(HTMLParser):
+    """
+    page_source 한 번으로 '상품정보 제공고시' 표를 {항목: 내용}으로 읽음
+    (무신사: dt/dd, 네이버: th/td)
+    """
+    KEY_TAGS = ("dt", "th")
+    VALUE_TAGS = ("dd", "td")
+    BREAK_TAGS = ("br", "p", "li", "div")
+    SKIP_TAGS = ("script", "style")
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.rows: Dict[str, str] = {}
+        self._key = None
+        self._mode = None
+        self._buf: List[str] = []
+        self._skip = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.SKIP_TAGS:
+            self._skip += 1
+        elif tag in self.KEY_TAGS:
+            self._mode, self._buf = "key", []
+        elif tag in self.VALUE_TAGS and self._key and self._mode is None:
+            self._mode, self._buf = "value", []
+        elif tag in self.BREAK_TAGS and self._mode:
+            self._buf.append("\n")
+
+    def handle_endtag(self, tag):
+        if tag in self.SKIP_TAGS:
+            self._skip = max(0, self._skip - 1)
+        elif tag in self.KEY_TAGS and self._mode == "key":
+            self._key = " ".join("".join(self._buf).split())
+            self._mode = None
+        elif tag in self.VALUE_TAGS and self._mode == "value":
+            lines = (" ".join(l.split()) for l in "".join(self._buf).splitlines())
+            self.rows.setdefault(self._key, "\n".join(l for l in lines if l))
+            self._key, self._mode = None, None
+
+    def handle_data(self, text):
+        if self._mode and not self._skip:
+            self._buf.append(text)
+
+
+class Deadline:
+    """
+    스크래핑 한 건의 전체 시간 예산. seconds=None이면 무제한 (기존 동작)
+    """
+    def __init__(self, seconds: Optional[float] = None):
+        self.seconds = seconds
+        self.started_at = time.monotonic()
+        self.expires_at = self.started_at + seconds if seconds is not None else None
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started_at
+
+    @property
+    def bounded(self) -> bool:
+        return self.expires_at is not None
+
+    def remaining(self) -> float:
+        if self.expires_at is None:
+            return float("inf")
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def clamp(self, timeout: float) -> float:
+        # 원래 타임아웃과 남은 예산 중 작은 값
+        return min(timeout, self.remaining())
+
+    def sleep(self, seconds: float):
+        wait = self.clamp(seconds)
+        if wait > 0:
+            time.sleep(wait)
+
+
+class BlockedError(Exception):
+    """
+    차단/캡차/로그인/오류 페이지 → 기다려도 상품 데이터가 안 나오므로 바로 중단
+    kind: captcha | login | blocked | rate_limited | error_page | not_found | backoff(쉬는 중이라 시도 안 함)
+    """
+    def __init__(self, site: str, kind: str, reason: str = "", status: int = 0,
+                 retry_after: Optional[float] = None):
+        super().__init__(f"{site} {kind}" + (f": {reason}" if reason else ""))
+        self.site = site
+        self.kind = kind
+        self.reason = reason
+        self.status = status
+        self.retry_after = retry_after
+
+    @property
+    def site_wide(self) -> bool:
+        # URL 탓이 아니라 사이트가 막은 것 → 사이트를 쉬게 하고, 작업 시도 횟수는 돌려줌
+        return self.kind == "backoff" or self.kind in Config.BLOCK_BACKOFF_KINDS
+
+    def to_dict(self) -> dict:
+        out = {"blocked": self.kind, "reason": self.reason}
+        if self.status:
+            out["status"] = self.status
+        if self.retry_after:
+            out["retryAfter"] = math.ceil(self.retry_after)
+        return out
+
+
+def detect_block(site: str, page: dict) -> Optional[BlockedError]:
+    """
+    BLOCK_PROBE_SCRIPT 결과 → 막힌 페이지면 BlockedError, 정상이면 None
+    """
+    status = page.get("status") or 0
+    url = page.get("url") or ""
+
+    if page.get("selectors") and not page.get("hasData"):
+        return BlockedError(site, "captcha", page["selectors"][0], status)
+    for kind, markers in Config.BLOCK_URL_MARKERS.items():
+        for marker in markers:
+            if marker in url:
+                return BlockedError(site, kind, f"redirected to {url}", status)
+    kind = Config.BLOCK_STATUS.get(status) or ("error_page" if status >= 500 else None)
+    if kind:
+        return BlockedError(site, kind, f"HTTP {status}", status)
+
+    if page.get("hasData"):
+        return None
+    text = f"{page.get('title') or ''}\n{page.get('text') or ''}"
+    for kind, markers in Config.BLOCK_TEXT_MARKERS.items():
+        for marker in markers:
+            if marker in text:
+                return BlockedError(site, kind, marker, status)
+    return None
+
+
+class SiteBackoff:
+    """
+    사이트별 차단 백오프 (이 프로세스 안). 막힐 때마다 쉬는 시간을 두 배로, 한 번 성공하면 초기화
+    """
+    def __init__(self, base: float = Config.BLOCK_BACKOFF_BASE, cap: float = Config.BLOCK_BACKOFF_MAX):
+        self.base = base
+        self.cap = cap
+        self.strikes: Dict[str, int] = {}
+        self.until: Dict[str, float] = {}
+        # 탭 워커는 여러 스레드에서 기록함
+        self.lock = threading.Lock()
+
+    def hit(self, site: str, at_least: Optional[float] = None) -> float:
+        with self.lock:
+            strikes = self.strikes.get(site, 0) + 1
+            self.strikes[site] = strikes
+            delay = max(at_least or 0, min(self.cap, self.base * 2 ** (strikes - 1)))
+            self.until[site] = time.monotonic() + delay
+        return delay
+
+    def remaining(self, site: str) -> float:
+        with self.lock:
+            return max(0.0, self.until.get(site, 0) - time.monotonic())
+
+    def clear(self, site: str):
+        with self.lock:
+            self.strikes.pop(site, None)
+            self.until.pop(site, None)
+
+    def check(self, site: str):
+        remaining = self.remaining(site)
+        if remaining > 0:
+            raise BlockedError(site, "backoff", "site is backing off after a block", retry_after=remaining)
+
+
+class SelectorStats:
+    """
+    셀렉터 / 추출 전략별 성공 기록 → 다음 실행부터 잘 맞던 것부터 시도
+    그룹 키는 "<site>:<page_type>:<group>" (예: "naver:brand.naver.com:price")
+    후보별로 [성공 수, 시도 수]를 저장한다.
+    """
+    # 이만큼 시도해서 한 번도 안 맞은 후보는 목록에서 뺌
+    DROP_AFTER = 30
+    # 빠진 후보도 가끔은 다시 시도 (사이트 개편 대비)
+    RETRY_EVERY = 50
+    # 그룹별 order() 호출 수를 후보처럼 같이 저장하는 자리 ([0, 호출 수])
+    # 크롤러는 요청마다 새 프로세스라서 프로세스 안의 카운터로는 RETRY_EVERY에 닿지 않음
+    CALLS = "#calls"
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self._stats: Dict[str, Dict[str, List[int]]] = {}
+        # 마지막 저장 이후 늘어난 값 (다른 프로세스 기록과 합칠 때 사용)
+        self._delta: Dict[str, Dict[str, List[int]]] = {}
+        self._lock = threading.Lock()
+        if path and os.path.exists(path):
+            self._stats = self._read(path)
+
+    @staticmethod
+    def _read(path: str) -> Dict[str, Dict[str, List[int]]]:
+        try:
+            with open(path, encoding="utf-8") as f:
+                raw = json.load(f)
+            return {g: {c: [int(v[0]), int(v[1])] for c, v in cands.items()} for g, cands in raw.items()}
+        except Exception as e:
+            print(f"[PY DEBUG] selector stats unreadable ({e}) → start fresh", file=sys.stderr)
+            return {}
+
+    @staticmethod
+    def _score(hits: int, tries: int) -> float:
+        # 시도가 적은 후보가 한두 번 실패로 바로 밀려나지 않도록 (hits+1)/(tries+2)
+        return (hits + 1) / (tries + 2)
+
+    def order(self, group: str, candidates: List[str]) -> List[str]:
+        """
+        성공률 높은 순으로 정렬 (기록 없는 후보는 원래 순서 유지)
+        DROP_AFTER번 넘게 한 번도 안 맞은 후보는 제외, 단 그룹의 (저장된 것까지 합친) 호출 RETRY_EVERY번마다 한 번은 포함
+        """
+        with self._lock:
+            stats = dict(self._stats.get(group, {}))
+            for table in (self._stats, self._delta):
+                table.setdefault(group, {}).setdefault(self.CALLS, [0, 0])[1] += 1
+            retry = self._stats[group][self.CALLS][1] % self.RETRY_EVERY == 0
+
+        ranked = sorted(candidates, key=lambda c: -self._score(*stats.get(c, (0, 0))))
+        alive = [c for c in ranked if not self._dead(stats.get(c))]
+        if retry or not alive:
+            return ranked
+        return alive
+
+    def _dead(self, entry: Optional[List[int]]) -> bool:
+        return bool(entry) and entry[0] == 0 and entry[1] >= self.DROP_AFTER
+
+    def record(self, group: str, candidate: str, hit: bool):
+        with self._lock:
+            for table in (self._stats, self._delta):
+                entry = table.setdefault(group, {}).setdefault(candidate, [0, 0])
+                entry[0] += int(hit)
+                entry[1] += 1
+
+    def save(self):
+        """
+        파일을 다시 읽어 이번 실행분(delta)만 더한 뒤 원자적으로 교체
+        (워커 여러 개가 같은 파일을 써도 서로의 기록을 덮어쓰지 않게 — 읽기~교체를 파일 락으로 묶음)
+        """
+        if not self.path:
+            return
+        with self._lock, file_lock(f"{self.path}.lock"):
+            if not self._delta:
+                return
+            merged = self._read(self.path) if os.path.exists(self.path) else {}
+            for group, cands in self._delta.items():
+                for cand, (hits, tries) in cands.items():
+                    entry = merged.setdefault(group, {}).setdefault(cand, [0, 0])
+                    entry[0] += hits
+                    entry[1] += tries
+
+            tmp = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(merged, f, ensure_ascii=False, indent=1, sort_keys=True)
+            os.replace(tmp, self.path)
+
+            self._stats = merged
+            self._delta = {}
+
+
+# 파일 없이 메모리에만 쌓는 기본 인스턴스 (main에서 파일 경로가 있는 것으로 교체)
+SELECTOR_STATS = SelectorStats()
+
+
 # ==========================================
 # 4. SELENIUM DRIVER
 # ==========================================
 class DriverFactory:
     @staticmethod
-    def create_driver() -> WebDriver:
-        options = Options()
-        #options.add_argument("--headless=new")
-        options.add_argument(f"--window-size={Config.WINDOW_SIZE}")
-        options.add_argument(f"user-agent={Config.USER_AGENT}")
-        options.add_argument("--disable-blink-features=AutomationControlled")
-        options.add_experimental_option("excludeSwitches", ["enable-automation"])
-
-        driver = webdriver.Chrome(
-            service=Service(ChromeDriverManager().install()),
-            options=options,
-        )
+    def chrome_arguments() -> List[str]:
+        return [
+            #"--headless=new",
+            f"--window-size={Config.WINDOW_SIZE}",
+            f"user-agent={Config.USER_AGENT}",
+            "--disable-blink-features=AutomationControlled",
+            # 탭 여러 개를 동시에 로딩할 때 뒤쪽 탭이 느려지지 않도록
+            "--disable-background-timer-throttling",
+            "--disable-renderer-backgrounding",
+            "--disable-backgrounding-occluded-windows",
+        ]
 
+    @staticmethod
+    def create_driver(profile_dir: Optional[str] = None, backend: Optional[str] = None) -> WebDriver:
+        backend = backend or Config.DRIVER_BACKEND
+        args = DriverFactory.chrome_arguments()
+        if profile_dir:
+            # 영구 프로필: JS 번들/이미지 캐시, 쿠키가 다음 실행에도 남음
+            args.append(f"--disk-cache-size={Config.DISK_CACHE_SIZE}")
+
+        if backend == "cdp":
+            # chromedriver 없이 DevTools 웹소켓 직결 (명령당 HTTP 왕복 한 번이 줄어듦)
+            driver = CDPDriver(args, profile_dir=profile_dir)
+        else:
+            options = Options()
+            if profile_dir:
+                options.add_argument(f"--user-data-dir={os.path.abspath(profile_dir)}")
+            for arg in args:
+                options.add_argument(arg)
+            options.add_experimental_option("excludeSwitches", ["enable-automation"])
+
+            driver = webdriver.Chrome(
+                service=Service(ChromeDriverManager().install()),
+                options=options,
+            )
+
+        DriverFactory.hide_webdriver(driver)
+        return driver
+
+    @staticmethod
+    def hide_webdriver(driver: WebDriver):
+        # CDP 스크립트는 탭(target)마다 따로 등록해야 함
         driver.execute_cdp_cmd(
             "Page.addScriptToEvaluateOnNewDocument",
             {
                 "source": "Object.defineProperty(navigator, 'webdriver', {get: () => undefined})"
             },
         )
-        return driver
+
+
+class ProfileSlot:
+    def __init__(self, path: str, lock_file):
+        self.path = path
+        self._lock_file = lock_file
+
+    def release(self):
+        if self._lock_file:
+            try:
+                self._lock_file.close()   # 닫으면 OS 락도 풀림
+            except Exception:
+                pass
+            self._lock_file = None
+
+
+class ProfileManager:
+    """
+    root/slot-N 프로필 폴더 관리.
+    크롬 두 개가 같은 user-data-dir를 쓸 수 없으므로 슬롯마다 파일 락을 잡는다
+    (프로세스가 죽으면 OS가 락을 풀어줌)
+    """
+    LOCK_NAME = ".slot.lock"
+    CLEANUP_MARK = ".last_cleanup"
+
+    def __init__(self, root: str, slots: int = Config.PROFILE_SLOTS):
+        self.root = root
+        self.slots = slots
+
+    def acquire(self) -> Optional[ProfileSlot]:
+        for i in range(self.slots):
+            path = os.path.join(self.root, f"slot-{i}")
+            os.makedirs(path, exist_ok=True)
+            lock = self._try_lock(os.path.join(path, self.LOCK_NAME))
+            if lock:
+                self._prepare(path)
+                print(f"[PY DEBUG] Using profile slot {i}: {path}", file=sys.stderr)
+                return ProfileSlot(path, lock)
+
+        print("[PY DEBUG] All profile slots busy → temporary profile", file=sys.stderr)
+        return None
+
+    @staticmethod
+    def _try_lock(path: str):
+        f = open(path, "a+")
+        try:
+            if os.name == "nt":
+                import msvcrt
+                msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+            else:
+                import fcntl
+                fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return f
+        except OSError:
+            f.close()
+            return None
+
+    @staticmethod
+    def is_fresh(path: str) -> bool:
+        return not os.path.isdir(os.path.join(path, "Default"))
+
+    def _prepare(self, path: str):
+        # 비정상 종료한 크롬이 남긴 Singleton 락 제거 (슬롯 락을 잡았으니 안전)
+        for name in ("SingletonLock", "SingletonSocket", "SingletonCookie"):
+            try:
+                os.remove(os.path.join(path, name))
+            except OSError:
+                pass
+        self.cleanup(path)
+
+    def cleanup(self, path: str, force: bool = False) -> bool:
+        """
+        크롬이 꺼진 상태(슬롯 락 보유 중, 드라이버 생성 전)에서만 호출
+        주기가 지났고 용량 상한을 넘었으면 캐시 폴더만 지움
+        """
+        mark = os.path.join(path, self.CLEANUP_MARK)
+        if not force and os.path.exists(mark):
+            if time.time() - os.path.getmtime(mark) < Config.PROFILE_CLEANUP_INTERVAL:
+                return False
+
+        size = self.dir_size(path)
+        cleaned = False
+        if force or size > Config.PROFILE_MAX_BYTES:
+            for sub in Config.PROFILE_CACHE_DIRS:
+                shutil.rmtree(os.path.join(path, sub), ignore_errors=True)
+            print(f"[PY DEBUG] Profile cache cleaned ({size // (1024 * 1024)} MB): {path}", file=sys.stderr)
+            cleaned = True
+
+        with open(mark, "w") as f:
+            f.write(str(int(time.time())))
+        return cleaned
+
+    def sweep(self):
+        """
+        지금 아무도 안 쓰는 슬롯(락을 잡을 수 있는 슬롯)의 캐시 정리
+        오래 도는 워커가 주기적으로 호출 (자기 슬롯은 락이 잡혀 있어 건너뜀)
+        """
+        for i in range(self.slots):
+            path = os.path.join(self.root, f"slot-{i}")
+            if not os.path.isdir(path):
+                continue
+            lock = self._try_lock(os.path.join(path, self.LOCK_NAME))
+            if lock:
+                try:
+                    self.cleanup(path)
+                finally:
+                    ProfileSlot(path, lock).release()
+
+    @staticmethod
+    def dir_size(path: str) -> int:
+        total = 0
+        for dirpath, _, filenames in os.walk(path):
+            for name in filenames:
+                try:
+                    total += os.path.getsize(os.path.join(dirpath, name))
+                except OSError:
+                    pass
+        return total
+
+
+def prewarm(driver: WebDriver):
+    # 사이트 첫 화면을 한 번씩 열어 JS/CSS 캐시, DNS/TLS, 쿠키를 미리 채움
+    for url in Config.PREWARM_URLS:
+        try:
+            driver.get(url)
+            print(f"[PY DEBUG] Prewarmed {url}", file=sys.stderr)
+        except Exception as e:
+            print(f"[PY DEBUG] Prewarm failed for {url}: {e}", file=sys.stderr)
+
+
+@contextmanager
+def browser_session(profile_root: Optional[str] = None, warm: bool = False, backend: Optional[str] = None):
+    """
+    드라이버 생성 ~ 종료까지 (영구 프로필 슬롯 잡기/풀기 포함)
+    """
+    manager = ProfileManager(profile_root) if profile_root else None
+    slot = manager.acquire() if manager else None
+    stop = threading.Event()
+    try:
+        fresh = slot is not None and ProfileManager.is_fresh(slot.path)
+        driver = DriverFactory.create_driver(profile_dir=slot.path if slot else None, backend=backend)
+        try:
+            if manager:
+                # 워커/큐 모드는 몇 시간씩 돌기 때문에 쉬는 슬롯 정리를 주기적으로
+                threading.Thread(target=_sweep_profiles, args=(manager, stop), daemon=True).start()
+            if warm or fresh:
+                prewarm(driver)
+            yield driver
+        finally:
+            stop.set()
+            driver.quit()
+            if slot:
+                # 크롬이 꺼졌고 락은 아직 잡고 있음 → 내 슬롯 정리하기 안전한 시점
+                manager.cleanup(slot.path)
+    finally:
+        if slot:
+            slot.release()
+
+
+def _sweep_profiles(manager: ProfileManager, stop: threading.Event):
+    while not stop.wait(Config.PROFILE_CLEANUP_INTERVAL):
+        try:
+            manager.sweep()
+        except Exception as e:
+            print(f"[PY DEBUG] profile sweep failed: {e}", file=sys.stderr)
+
+
+class TabPool:
+    """
+    브라우저 하나에서 탭 여러 개를 돌려가며 작업을 처리.
+    - 빈 탭마다 다음 URL 로딩을 걸어두고 (블로킹 없이)
+    - 가장 먼저 걸어둔 탭으로 전환해서 스크래핑
+    → 한 탭을 긁는 동안 다른 탭들이 뒤에서 로딩됨
+    """
+    def __init__(self, driver: WebDriver, size: int = 4):
+        self.driver = driver
+        self.size = max(1, size)
+        self.handles: List[str] = []
+
+    def _open_tabs(self):
+        self.handles = [self.driver.current_window_handle]
+        for _ in range(self.size - 1):
+            self.driver.switch_to.new_window("tab")
+            DriverFactory.hide_webdriver(self.driver)
+            self.handles.append(self.driver.current_window_handle)
+
+    def _close_tabs(self):
+        for handle in self.handles[1:]:
+            try:
+                self.driver.switch_to.window(handle)
+                self.driver.close()
+            except Exception:
+                pass
+        self.driver.switch_to.window(self.handles[0])
+
+    def _start(self, handle: str, job: dict):
+        # 로딩 시작 시점부터 job의 시간 예산이 흐름
+        job["_deadline"] = Deadline(job.get("deadline"))
+        self.driver.switch_to.window(handle)
+        # 재사용하는 탭에는 이전 상품 문서가 readyState=complete로 남아 있음
+        # → 이전 문서에 표시를 남기고 이동. 표시가 사라져야 새 문서로 바뀐 것
+        self.driver.execute_script(
+            "window.__crawlerStaleDoc = true; window.location.href = arguments[0];", job["url"]
+        )
+
+    def _wait_ready(self, job: dict):
+        deadline = job["_deadline"]
+        try:
+            WebDriverWait(self.driver, deadline.clamp(Config.TAB_READY_TIMEOUT)).until(
+                lambda d: d.execute_script(
+                    "return !window.__crawlerStaleDoc && location.href !== 'about:blank'"
+                    " && ['interactive', 'complete'].includes(document.readyState);"
+                )
+            )
+        except Exception:
+            print(f"[PY DEBUG] Tab not ready in time: {job['url']}", file=sys.stderr)
+
+    def run(self, jobs: "queue.Queue", process: Callable[[dict], None]):
+        """
+        jobs: job dict 큐 (None = 입력 끝). process(job)는 현재 탭에서 실행됨
+        """
+        self._open_tabs()
+        idle = list(self.handles)
+        in_flight = deque()
+        eof = False
+
+        try:
+            while True:
+                # 1. 빈 탭에 다음 작업 로딩 걸기 (처리할 탭이 있으면 기다리지 않음)
+                while idle and not eof:
+                    try:
+                        job = jobs.get(block=not in_flight)
+                    except queue.Empty:
+                        break
+                    if job is None:
+                        eof = True
+                        break
+                    handle = idle.pop()
+                    try:
+                        self._start(handle, job)
+                        in_flight.append((handle, job))
+                    except Exception as e:
+                        print(f"[PY DEBUG] Tab start failed: {e}", file=sys.stderr)
+                        idle.append(handle)
+                        process({**job, "_error": str(e)})
+
+                if not in_flight:
+                    if eof:
+                        break
+                    continue
+
+                metrics.DRIVER_SLOTS.set(len(in_flight), state="busy")
+                metrics.DRIVER_SLOTS.set(len(idle), state="idle")
+
+                # 2. 가장 오래 로딩된 탭부터 스크래핑
+                handle, job = in_flight.popleft()
+                self.driver.switch_to.window(handle)
+                self._wait_ready(job)
+                try:
+                    process(job)
+                finally:
+                    idle.append(handle)
+        finally:
+            self._close_tabs()
+
+
+class CommandBudgetExceeded(AssertionError):
+    pass
+
+
+class CommandStats:
+    """
+    브라우저 명령(= 드라이버 왕복) 수 집계
+    - by_command: find_elements / get_attribute / execute_script ...
+    - by_caller : 명령을 부른 스크래퍼 메서드 (MusinsaScraper._parse_shoe_sizes_from_dom 등)
+    """
+    def __init__(self):
+        self.total = 0
+        self.by_command: Dict[str, int] = {}
+        self.by_caller: Dict[str, int] = {}
+
+    def add(self, command: str, caller: str):
+        self.total += 1
+        self.by_command[command] = self.by_command.get(command, 0) + 1
+        self.by_caller[caller] = self.by_caller.get(caller, 0) + 1
+        metrics.DRIVER_COMMANDS.inc(command=command)
+
+    def to_dict(self) -> dict:
+        ranked = lambda d: dict(sorted(d.items(), key=lambda kv: -kv[1]))
+        return {"total": self.total, "byCommand": ranked(self.by_command), "byCaller": ranked(self.by_caller)}
+
+    def check(self, budget: int, command: Optional[str] = None):
+        """
+        명령 수가 budget을 넘으면 CommandBudgetExceeded (테스트에서 왕복 수 회귀 검사용)
+        예: stats.check(150) / stats.check(40, "get_attribute")
+        """
+        used = self.by_command.get(command, 0) if command else self.total
+        if used > budget:
+            label = command or "total"
+            top = ", ".join(f"{k}={v}" for k, v in list(self.to_dict()["byCaller"].items())[:5])
+            raise CommandBudgetExceeded(f"{label} commands {used} > budget {budget} ({top})")
+
+
+def _command_caller() -> str:
+    """
+    명령을 보낸 쪽 찾기: 스택을 올라가며 처음 만나는 스크래퍼 메서드,
+    없으면 래퍼 바깥의 첫 호출자
+    """
+    frame = sys._getframe(2)
+    fallback = ""
+    while frame is not None:
+        owner = frame.f_locals.get("self")
+        if isinstance(owner, BaseScraper):
+            return f"{type(owner).__name__}.{frame.f_code.co_name}"
+        if not fallback and not isinstance(owner, (CountingDriver, CountingElement)):
+            fallback = f"{type(owner).__name__}.{frame.f_code.co_name}" if owner is not None else frame.f_code.co_name
+        frame = frame.f_back
+    return fallback or "?"
+
+
+class CountingElement:
+    """
+    WebElement 래퍼: 속성/메서드 호출 하나하나가 브라우저 왕복이므로 모두 셈
+    """
+    def __init__(self, element, stats: CommandStats):
+        self._element = element
+        self._stats = stats
+
+    def _count(self, command: str):
+        self._stats.add(command, _command_caller())
+
+    @property
+    def text(self) -> str:
+        self._count("text")
+        return self._element.text
+
+    @property
+    def tag_name(self) -> str:
+        self._count("tag_name")
+        return self._element.tag_name
+
+    def get_attribute(self, name: str):
+        self._count("get_attribute")
+        return self._element.get_attribute(name)
+
+    def is_displayed(self) -> bool:
+        self._count("is_displayed")
+        return self._element.is_displayed()
+
+    def click(self):
+        self._count("click")
+        return self._element.click()
+
+    def find_element(self, *args, **kwargs):
+        self._count("find_element")
+        return CountingElement(self._element.find_element(*args, **kwargs), self._stats)
+
+    def find_elements(self, *args, **kwargs):
+        self._count("find_elements")
+        return [CountingElement(e, self._stats) for e in self._element.find_elements(*args, **kwargs)]
+
+    def __getattr__(self, name):
+        return getattr(self._element, name)
+
+    def __eq__(self, other):
+        return self._element == getattr(other, "_element", other)
+
+    def __hash__(self):
+        return hash(self._element)
+
+
+class CountingDriver:
+    """
+    드라이버 래퍼: scrape() 한 번이 브라우저와 몇 번 주고받는지 셈 (selenium / cdp 공통)
+    run_job에서 작업마다 새로 감싸므로 stats는 작업 단위
+    """
+    # 프로퍼티 접근도 왕복 한 번
+    _PROPERTIES = ("current_url", "title", "page_source", "current_window_handle", "window_handles")
+
+    def __init__(self, driver: WebDriver, stats: Optional[CommandStats] = None):
+        self._driver = driver
+        self.command_stats = stats or CommandStats()
+
+    def _count(self, command: str):
+        self.command_stats.add(command, _command_caller())
+
+    def _wrap(self, value):
+        if isinstance(value, list):
+            return [self._wrap(v) for v in value]
+        if hasattr(value, "get_attribute") and hasattr(value, "is_displayed"):
+            return CountingElement(value, self.command_stats)
+        return value
+
+    @staticmethod
+    def _unwrap(value):
+        return value._element if isinstance(value, CountingElement) else value
+
+    def __getattr__(self, name):
+        if name in self._PROPERTIES:
+            self._count(name)
+            return getattr(self._driver, name)
+
+        attr = getattr(self._driver, name)
+        if not callable(attr) or name.startswith("_"):
+            return attr
+
+        # 그 밖의 드라이버 메서드 (set_page_load_timeout 등)도 한 번씩 셈
+        def counted(*args, **kwargs):
+            self._count(name)
+            return attr(*args, **kwargs)
+        return counted
+
+    def get(self, url: str):
+        self._count("get")
+        return self._driver.get(url)
+
+    def find_element(self, *args, **kwargs):
+        self._count("find_element")
+        return self._wrap(self._driver.find_element(*args, **kwargs))
+
+    def find_elements(self, *args, **kwargs):
+        self._count("find_elements")
+        return self._wrap(self._driver.find_elements(*args, **kwargs))
+
+    def execute_script(self, script: str, *args):
+        self._count("execute_script")
+        return self._wrap(self._driver.execute_script(script, *[self._unwrap(a) for a in args]))
+
+    def execute_cdp_cmd(self, cmd: str, cmd_args: Optional[dict] = None):
+        self._count("execute_cdp_cmd")
+        return self._driver.execute_cdp_cmd(cmd, cmd_args or {})
 
 
 # ==========================================
 # 5. BASE SCRAPER
 # ==========================================
 class BaseScraper(ABC):
-    def __init__(self, driver: WebDriver):
+    # HTML에서 가격을 찾을 때 쓰는 후보 셀렉터 (사이트별로 덮어씀)
+    PRICE_SELECTORS = Config.MUSINSA_PRICE
+    # 변경 감지에 쓰는 상품 JSON 키 (옵션/재고/가격). 이 부분 트리가 같으면 결과도 같다고 봄
+    CHANGE_KEYS: tuple = ()
+
+    def __init__(self, driver: WebDriver, stats: Optional[SelectorStats] = None,
+                 changes: Optional[ChangeCache] = None):
         self.driver = driver
+        self.stats = stats if stats is not None else SELECTOR_STATS
+        self.changes = changes
+        self._url = ""
+        self._digest = None
+        self._product_json = None
+        self._prefetch: Dict[tuple, Any] = {}
+        self._prefetch_pool = None
+
+    def scrape(
+        self,
+        url: str,
+        on_event: Optional[Callable[[str, dict], None]] = None,
+        deadline: Optional[Deadline] = None,
+        navigate: bool = True,
+    ) -> ProductData:
+        # on_event(stage, payload): 단계가 끝날 때마다 부분 결과를 넘겨줌 (스트리밍 모드)
+        self._on_event = on_event
+        # deadline: 모든 대기/HTTP 타임아웃을 남은 예산에 맞춰 줄임
+        self._deadline = deadline or Deadline()
+        self._info_notice_rows = None
+        self._url = url
+        self._digest = None
+        self._product_json = None
+
+        site = self.site_name
+        start = time.perf_counter()
+        try:
+            data = self._scrape(url, navigate)
+        except Exception as e:
+            metrics.ERRORS.inc(site=site, type=type(e).__name__)
+            if isinstance(e, BlockedError):
+                metrics.BLOCKS.inc(site=site, kind=e.kind)
+            metrics.SCRAPES.inc(site=site, result="error")
+            raise
+        finally:
+            self._stop_prefetch()
+            metrics.SCRAPE_SECONDS.observe(time.perf_counter() - start, site=site)
+
+        result = "unchanged" if data.unchanged else "partial" if data.incomplete else "ok"
+        metrics.SCRAPES.inc(site=site, result=result)
+        return data
 
-    def scrape(self, url: str) -> ProductData:
-        self.driver.get(url)
-        time.sleep(2)
-        self._prepare_page()
+    def _scrape(self, url: str, navigate: bool) -> ProductData:
+        stage = lambda name: metrics.STAGE_SECONDS.time(site=self.site_name, stage=name)
 
-        data = self._scrape_from_json()
+        if navigate and self.changes is not None:
+            # 브라우저를 띄우기 전에 HTTP로 먼저 확인 (304 또는 해시 비교 한 번)
+            with stage("probe"):
+                cached = self._check_unchanged(url)
+            if cached:
+                return self._finish(cached)
+
+        # URL만으로 할 수 있는 API 호출은 브라우저 로딩과 동시에 시작 (필요한 단계에서 합류)
+        self._start_prefetch(url)
+
+        with stage("load"):
+            if navigate:
+                self._load_page(url)
+                self._check_blocked()
+                self._sleep(2)
+            else:
+                # 탭 다중화: 이미 뒤에서 로딩된 탭 → 남은 안정화 시간만 대기
+                self._check_blocked()
+                self._sleep(max(0, 2 - self._deadline.elapsed()))
+            self._prepare_page()
+
+        with stage("json"):
+            data = self._scrape_from_json()
+        cached = self._cached_result()
+        if cached:
+            # 옵션/가격 JSON이 지난번과 같음 → 색상/사이즈 단계 생략
+            return self._finish(cached)
         if not data:
             data = ProductData(site=self.site_name)
 
         # 1️⃣ 가격 / 이미지 / actual-size API
-        self._patch_missing_data(data)
+        if not self._over_budget(data, "price"):
+            with stage("basic"):
+                self._patch_missing_data(data)
+        data.title = Utils.clean_title(data.title)
+        self._emit("basic", {
+            "site": data.site,
+            "title": data.title,
+            "price": data.price,
+            "priceFormatted": data.to_dict()["priceFormatted"],
+            "image": data.image,
+        })
+
+        # 2️⃣ 색상×사이즈 재고 (JSON에 조합이 없을 때, 사이트가 지원하면 한 번에)
+        if not data.combinations and not self._over_budget(data, "combinations"):
+            with stage("combinations"):
+                self._collect_combination_data(data)
+
+        # 3️⃣ 색상 (DOM 기반, 상품 링크)
+        if not self._over_budget(data, "colors"):
+            with stage("colors"):
+                self._collect_color_data(data)
+        self._emit("colors", {"colors": data.colors})
+
+        # 4️⃣ 사이즈 (actualSizes 있으면 HTML 스킵)
+        if not self._over_budget(data, "sizes"):
+            with stage("sizes"):
+                self._collect_size_data(data)
+        self._emit("sizes", {"sizes": data.sizes})
+        self._emit("actualSizes", {"actualSizes": getattr(data, "actualSizes", {})})
+
+        self._emit("combinations", {"combinations": data.combinations})
+        if self.changes is not None and self._digest and not data.incomplete:
+            self.changes.remember(url, self._digest, data.to_compact())
+        return self._finish(data)
+
+    def _finish(self, data: ProductData) -> ProductData:
+        data.pack()
+        stats = getattr(self.driver, "command_stats", None)
+        if stats is not None:
+            data.commands = stats.to_dict()
+        self._emit("done", data.to_dict())
+        return data
 
-        # 2️⃣ 색상 (DOM 기반, 상품 링크)
-        self._collect_color_data(data)
+    # --------------------------------------------------
+    # 변경 감지 (--changes)
+    # --------------------------------------------------
+    def _check_unchanged(self, url: str) -> Optional[ProductData]:
+        """
+        브라우저 없이 HTTP만으로 변경 여부를 확인할 수 있는 사이트에서 덮어씀
+        """
+        return None
 
-        # 3️⃣ 사이즈 (actualSizes 있으면 HTML 스킵)
-        self._collect_size_data(data)
+    # --------------------------------------------------
+    # 브라우저와 겹치는 HTTP 작업
+    # --------------------------------------------------
+    def _prefetch_tasks(self, url: str) -> Dict[tuple, Callable[[], Any]]:
+        """
+        페이지를 열기 전에 URL만으로 시작할 수 있는 네트워크 작업 {(이름, 인자): 함수}
+        결과는 _prefetched(이름, 인자, ...)로 받음. 사이트에서 덮어씀
+        """
+        return {}
 
-        data.title = Utils.clean_title(data.title)
+    def _start_prefetch(self, url: str):
+        tasks = self._prefetch_tasks(url)
+        if not tasks:
+            return
+        self._prefetch_pool = ThreadPoolExecutor(
+            max_workers=min(len(tasks), Config.PREFETCH_WORKERS), thread_name_prefix="prefetch"
+        )
+        self._prefetch = {key: self._prefetch_pool.submit(fn) for key, fn in tasks.items()}
+        print(f"[PY DEBUG] Prefetch started: {[name for name, _ in tasks]}", file=sys.stderr)
+
+    def _prefetched(self, name: str, arg: Any, fetch: Callable[[Any], Any]) -> Any:
+        """
+        미리 시작한 작업의 결과 (아직이면 남은 예산 안에서 기다림).
+        미리 시작하지 않았으면(다른 상품으로 리다이렉트 등) 지금 fetch(arg)
+        """
+        future = self._prefetch.pop((name, arg), None)
+        if future is None:
+            return fetch(arg)
+        remaining = self.deadline.remaining()
+        try:
+            return future.result(timeout=None if remaining == float("inf") else remaining)
+        except FutureTimeout:
+            print(f"[PY DEBUG] Prefetch {name} cut by deadline", file=sys.stderr)
+            return None
+
+    def _stop_prefetch(self):
+        # 쓰지 않은 작업은 버림 (이미 보낸 요청은 각자 타임아웃으로 끝남)
+        if self._prefetch_pool is not None:
+            self._prefetch_pool.shutdown(wait=False, cancel_futures=True)
+        self._prefetch_pool = None
+        self._prefetch = {}
+
+    def _cached_result(self) -> Optional[ProductData]:
+        if self.changes is None or not self._digest:
+            return None
+        doc = self.changes.product(self._url, self._digest)
+        if doc is None:
+            return None
+        print("[PY DEBUG] Product unchanged → cached result", file=sys.stderr)
+        data = ProductData.from_dict(doc)
+        data.unchanged = True
         return data
 
+    def _http_get(self, url: str, headers: Dict[str, str], timeout: float, session=None) -> Optional[str]:
+        """
+        GET 본문 (200이 아니면 None). --changes를 주면 ETag/Last-Modified 조건부 요청
+        """
+        if self.changes is not None:
+            got = self.changes.get(url, headers, self._http_timeout(timeout), session)
+            return got[0] if got else None
+
+        r = (session or requests).get(url, headers=headers, timeout=self._http_timeout(timeout))
+        if r.status_code != 200:
+            print(f"[PY DEBUG] GET {url} → HTTP {r.status_code}", file=sys.stderr)
+            return None
+        return r.text
+
+    # --------------------------------------------------
+    # 시간 예산 헬퍼
+    # --------------------------------------------------
+    @property
+    def deadline(self) -> Deadline:
+        return getattr(self, "_deadline", None) or Deadline()
+
+    def _load_page(self, url: str):
+        if not self.deadline.bounded:
+            self.driver.get(url)
+            return
+
+        from selenium.common.exceptions import TimeoutException
+
+        self.driver.set_page_load_timeout(max(self.deadline.remaining(), 1))
+        try:
+            self.driver.get(url)
+        except TimeoutException:
+            # 로딩이 다 안 끝났어도 지금까지 그려진 DOM으로 진행
+            print("[PY DEBUG] Page load cut by deadline", file=sys.stderr)
+        finally:
+            self.driver.set_page_load_timeout(300)
+
+    # 상태 코드는 Navigation Timing에서 (CDP Network 이벤트는 백엔드마다 켜는 법이 달라서)
+    # 본문 문구는 상품 JSON이 없을 때만 읽음 (큰 상품 페이지에서 innerText 레이아웃 비용 없게)
+    BLOCK_PROBE_SCRIPT = """
+        const nav = performance.getEntriesByType('navigation')[0] || {};
+        const hasData = !!(document.getElementById('__NEXT_DATA__')
+            || window.__PRELOADED_STATE__ || window.__APOLLO_STATE__);
+        return {
+            status: nav.responseStatus || 0,
+            url: location.href,
+            title: document.title || '',
+            hasData: hasData,
+            text: hasData || !document.body ? '' : document.body.innerText.slice(0, 2000),
+            selectors: hasData ? [] : arguments[0].filter((s) => [...document.querySelectorAll(s)].some((el) => {
+                const r = el.getBoundingClientRect();
+                return el.offsetParent !== null && r.width > 0 && r.height > 0
+                    && !/[?&]size=invisible/.test(el.getAttribute('src') || '');
+            })),
+        };
+    """
+
+    def _check_blocked(self):
+        """
+        캡차/로그인/차단/오류 페이지면 BlockedError (준비 대기·fallback을 전부 건너뜀)
+        """
+        try:
+            page = self.driver.execute_script(self.BLOCK_PROBE_SCRIPT, Config.BLOCK_SELECTORS)
+        except Exception as e:
+            print(f"[PY DEBUG] block probe failed: {e}", file=sys.stderr)
+            return
+        blocked = detect_block(self.site_name, page or {})
+        if blocked:
+            print(f"[PY DEBUG] Blocked page detected: {blocked}", file=sys.stderr)
+            raise blocked
+
+    def _sleep(self, seconds: float):
+        self.deadline.sleep(seconds)
+
+    def _wait(self, timeout: float) -> WebDriverWait:
+        return WebDriverWait(self.driver, self.deadline.clamp(timeout))
+
+    def _http_timeout(self, timeout: float) -> float:
+        # requests는 0 타임아웃을 허용하지 않으므로 최소값 보장
+        return max(self.deadline.clamp(timeout), 0.1)
+
+    def _over_budget(self, data: ProductData, field_name: str) -> bool:
+        """
+        예산이 다 떨어졌으면 field_name을 미완성으로 표시하고 True
+        (남은 fallback 전략은 건너뜀)
+        """
+        if not self.deadline.expired():
+            return False
+        print(f"[PY DEBUG] Deadline reached → skip '{field_name}'", file=sys.stderr)
+        data.mark_incomplete(field_name)
+        return True
+
+    def _run_strategy(self, data: ProductData, field_name: str, strategy: str, fn: Callable, *args):
+        """
+        추출 전략 하나를 실행하면서 소요 시간과 성공 여부를 메트릭으로 남김
+        (반환값이 있으면 그걸로, None이면 data.<field>가 새로 채워졌는지로 성공 판단)
+        """
+        before = list(getattr(data, field_name, None) or [])
+        start = time.perf_counter()
+        result = fn(*args)
+        metrics.STRATEGY_SECONDS.observe(time.perf_counter() - start, site=self.site_name, strategy=strategy)
+
+        if result is not None:
+            hit = bool(result)
+        else:
+            after = getattr(data, field_name, None) or []
+            hit = bool(after) and list(after) != before
+        metrics.STRATEGY.inc(
+            site=self.site_name, field=field_name, strategy=strategy,
+            result="hit" if hit else "miss",
+        )
+        return result
+
+    # --------------------------------------------------
+    # 셀렉터 / 전략 순서 학습
+    # --------------------------------------------------
+    def _stats_group(self, group: str) -> str:
+        # 페이지 종류 = 호스트 (smartstore / brand.naver.com / m.smartstore 등은 DOM이 다름)
+        page_type = urlparse(self._url).netloc or "-"
+        return f"{self.site_name}:{page_type}:{group}"
+
+    def _ordered(self, group: str, candidates: List[str]) -> List[str]:
+        return self.stats.order(self._stats_group(group), candidates)
+
+    def _learn(self, group: str, candidate: str, hit: bool):
+        self.stats.record(self._stats_group(group), candidate, hit)
+
+    def _emit(self, stage: str, payload: dict):
+        callback = getattr(self, "_on_event", None)
+        if not callback:
+            return
+        try:
+            callback(stage, payload)
+        except Exception as e:
+            # 출력 쪽 문제로 크롤링 자체가 죽지 않도록 방어
+            print(f"[PY DEBUG] emit '{stage}' failed: {e}", file=sys.stderr)
+
     
     def _patch_missing_data(self, data: ProductData):
         print(
@@ -203,6 +1681,9 @@ class BaseScraper(ABC):
 
     def _scrape_linked_colors(self, data: ProductData) -> bool:
         return False
+
+    def _collect_combination_data(self, data: ProductData):
+        pass
     
     def _scrape_single_color(self, data: ProductData):
         pass
@@ -226,7 +1707,9 @@ class BaseScraper(ABC):
         # 2️⃣ actual-size API (상의 / 하의 / 신발 공통 A안)
         # --------------------------------------------------
         if goods_no:
-            actual_json = self._fetch_actual_size(goods_no)
+            actual_json = self._run_strategy(
+                data, "sizes", "actual_size_api", self._prefetched, "actual_size", goods_no, self._fetch_actual_size
+            )
             print(f"[PY DEBUG] actual_json is None? {actual_json is None}", file=sys.stderr)
 
             if actual_json:
@@ -250,10 +1733,12 @@ class BaseScraper(ABC):
                     data.actualSizes = actual_sizes
 
                     # 🔥 여기서 버튼용 sizes 생성
+                    # actual-size API엔 품절 정보 없음 → 조합 재고에서 알아낸 값이 있으면 유지
+                    sold_out = {s.get("name"): s.get("isSoldOut", False) for s in data.sizes}
                     data.sizes = [
                         {
                             "name": size_name,
-                            "isSoldOut": False  # actual-size API엔 품절 정보 없음
+                            "isSoldOut": sold_out.get(size_name, False)
                         }
                         for size_name in actual_sizes.keys()
                     ]
@@ -264,12 +1749,19 @@ class BaseScraper(ABC):
                     )
                     return
 
+        if data.combinations and data.sizes:
+            print("[PY DEBUG] Size source: combination matrix", file=sys.stderr)
+            return
+
         # --------------------------------------------------
         # 3️⃣ 신발 DOM 사이즈 옵션 fallback (A안 확장)
         # --------------------------------------------------
+        if self._over_budget(data, "sizes"):
+            return
+
         print("[PY DEBUG] Trying shoe DOM size parsing...", file=sys.stderr)
 
-        shoe_sizes = self._parse_shoe_sizes_from_dom()
+        shoe_sizes = self._run_strategy(data, "sizes", "shoe_dom", self._parse_shoe_sizes_from_dom)
 
         print(
             f"[PY DEBUG] shoe_sizes from DOM = {shoe_sizes}",
@@ -304,13 +1796,15 @@ class BaseScraper(ABC):
     # 4️⃣ 최후 fallback (아무것도 못 찾은 경우)
     # --------------------------------------------------
         print("[PY DEBUG] No size information found (final fallback)", file=sys.stderr)
+        if self._over_budget(data, "sizes"):
+            return
         is_global_soldout = self._check_soldout()
         print(f"[PY DEBUG] Global Soldout: {is_global_soldout}", file=sys.stderr)
 
         if is_global_soldout:
             print("[PY DEBUG] Product is Globally Soldout. Trying Info Notice fallback...", file=sys.stderr)
             # 품절 상태이므로, 여기서 가져오는 사이즈는 강제로 품절 처리됨
-            self._scrape_size_from_info_notice(data)
+            self._run_strategy(data, "sizes", "info_notice", self._scrape_size_from_info_notice, data)
         else:
             print("[PY DEBUG] Product is Active but no sizes found. Returning empty.", file=sys.stderr)
 
@@ -318,18 +1812,26 @@ class BaseScraper(ABC):
     def _collect_color_data(self, data: ProductData):
         print("[PY DEBUG] Collect color data start", file=sys.stderr)
 
-        buttons = []
-        sources = set()
-        # 1. 드롭다운 크롤링 시도
-        if self._scrape_color_dropdown(data):
-            print(f"[PY DEBUG] Found colors via Dropdown: {len(data.colors)}", file=sys.stderr)
+        if data.combinations and data.colors:
+            # 색상×사이즈 조합에서 이미 색상별 재고까지 알아냄 → 드롭다운 다시 안 엶
+            print(f"[PY DEBUG] Colors from combination matrix: {len(data.colors)}", file=sys.stderr)
             return
 
-        # 2. 다른 색상 연결 제품 확인 (Linked Products)
-        # 드롭다운이 없으면 링크형 색상인지 확인
-        if self._scrape_linked_colors(data):
-            print(f"[PY DEBUG] Found colors via Links: {len(data.colors)}", file=sys.stderr)
-            return
+        # 1. 드롭다운 / 2. 다른 색상 연결 제품 (Linked Products)
+        # 이 사이트에서 예전에 더 자주 맞았던 쪽부터 시도
+        strategies = {
+            "dropdown": self._scrape_color_dropdown,
+            "linked": self._scrape_linked_colors,
+        }
+        for name in self._ordered("color_strategy", list(strategies)):
+            found = self._run_strategy(data, "colors", name, strategies[name], data)
+            self._learn("color_strategy", name, bool(found))
+            if found:
+                print(f"[PY DEBUG] Found colors via {name}: {len(data.colors)}", file=sys.stderr)
+                return
+
+            if self._over_budget(data, "colors"):
+                return
 
         # 3. 품절 여부 확인 (구매 버튼 비활성 여부 등)
         is_global_soldout = self._check_soldout()
@@ -338,12 +1840,12 @@ class BaseScraper(ABC):
         if is_global_soldout:
             # 4. [품절인 경우] 상품 고시 정보에서 파싱
             print("[PY DEBUG] Product is sold out. Trying Info Notice fallback...", file=sys.stderr)
-            self._scrape_color_from_info_notice(data)
+            self._run_strategy(data, "colors", "info_notice", self._scrape_color_from_info_notice, data)
 
         else:
             # 5. [품절 아님 + 위에서 못 찾음] -> '상세정보 확인 불가' 처리
             #    (제목 기반 단일 색상 추출 시도 후 없으면 종료)
-            self._scrape_single_color(data)
+            self._run_strategy(data, "colors", "single", self._scrape_single_color, data)
             
             if not data.colors:
                 print("[PY DEBUG] Active product but no color options found. Returning empty.", file=sys.stderr)
@@ -356,26 +1858,18 @@ class BaseScraper(ABC):
         try:
             # 1. 드롭다운 트리거 찾기 (제공해주신 HTML 기반)
             # placeholder가 '컬러'인 input 혹은 그 부모/형제 요소
-            trigger_selectors = [
-                "input[placeholder='컬러']",
-                "input[placeholder*='색상']",
-                "input[data-button-name*='컬러']",
-                "input[data-button-name*='색상']",
-                "div[data-mds='DropdownTriggerBox'] input[placeholder*='컬러']"
-                "div[data-mds='DropdownTriggerBox'] input[placeholder*='색상']"
-            ]
-
             trigger = None
-            for sel in trigger_selectors:
+            for sel in self._ordered("color_trigger", Config.COLOR_TRIGGERS):
                 try:
                     els = self.driver.find_elements(By.CSS_SELECTOR, sel)
                     for el in els:
                         if el.is_displayed() and el.get_attribute('placeholder') and any(x in el.get_attribute('placeholder') for x in ['컬러', '색상', 'Color']):
                             trigger = el
                             break
-                    if trigger: break
                 except:
-                    continue
+                    pass
+                self._learn("color_trigger", sel, trigger is not None)
+                if trigger: break
 
             if not trigger:
                 return False
@@ -384,11 +1878,11 @@ class BaseScraper(ABC):
             
             # 클릭 (JS로 클릭하는 것이 더 안정적일 때가 많음)
             self.driver.execute_script("arguments[0].click();", trigger)
-            time.sleep(0.5) # 애니메이션 대기
+            self._sleep(0.5) # 애니메이션 대기
 
             # 2. 옵션 컨테이너 대기 (Radix Portal 내부에 생성됨)
             # data-radix-portal 내부 혹은 role='option'을 찾음
-            wait = WebDriverWait(self.driver, 3)
+            wait = self._wait(3)
             options = []
             
             try:
@@ -463,6 +1957,8 @@ class BaseScraper(ABC):
                 continue
 
             goods_no = m.group(1)
+            if any(c["goodsNo"] == goods_no for c in colors):
+                continue
 
             colors.append({
                 "goodsNo": goods_no,
@@ -484,25 +1980,98 @@ class BaseScraper(ABC):
 
         return "", "unknown"
     
-    def _fetch_color_name_from_json(self, goods_no: str) -> str:
+    # --------------------------------------------------
+    # 다른 색상 상품(형제 goods_no)들을 HTTP로 동시에 조회
+    # --------------------------------------------------
+    def _resolve_color_variants(self, variants: list) -> list:
+        """
+        [{"goodsNo", "isCurrent"}] → [{"name", "isSoldOut", "goodsNo", "price", "isCurrent"}]
+        전체가 대략 요청 1번 시간 안에 끝나도록 병렬로 가져옴
+        """
+        session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_maxsize=Config.VARIANT_WORKERS)
+        session.mount("https://", adapter)
+
+        # 드라이버는 스레드에서 쓰면 안 되므로 필요한 값은 미리 꺼내 둠
+        referer = self.driver.current_url
+
+        resolved = {}
+        workers = max(1, min(Config.VARIANT_WORKERS, len(variants)))
+        pool = ThreadPoolExecutor(max_workers=workers)
         try:
-            script_el = self.driver.find_element(By.ID, "__NEXT_DATA__")
-            json_data = json.loads(script_el.get_attribute("innerHTML"))
+            futures = {
+                pool.submit(self._fetch_variant, session, v["goodsNo"], referer): v
+                for v in variants
+            }
+            try:
+                for fut in as_completed(futures, timeout=self._http_timeout(10)):
+                    v = futures[fut]
+                    info = fut.result()
+                    if info:
+                        info["isCurrent"] = v["isCurrent"]
+                        resolved[v["goodsNo"]] = info
+            except FutureTimeout:
+                print("[PY DEBUG] Variant lookup cut by deadline", file=sys.stderr)
+        finally:
+            # 아직 안 시작한 조회는 취소하고, 도는 중인 조회(각자 남은 예산만큼의 타임아웃)는 끝날 때까지 기다린 뒤 세션을 닫음
+            pool.shutdown(wait=True, cancel_futures=True)
+            session.close()
 
-            page_props = json_data.get("props", {}).get("pageProps", {})
+        colors = []
+        for v in variants:
+            info = resolved.get(v["goodsNo"])
+            if info:
+                colors.append(info)
+            elif v["isCurrent"]:
+                # 현재 페이지는 HTTP 실패해도 DOM 기준 정보로 채움
+                name, _ = self._resolve_color_name(v["goodsNo"])
+                colors.append({
+                    "name": name,
+                    "isSoldOut": self._check_soldout(),
+                    "goodsNo": v["goodsNo"],
+                    "isCurrent": True,
+                })
+        return [c for c in colors if c.get("name")]
 
-            state = (
-                page_props.get("state")
-                or page_props.get("initialState")
-                or {}
-            )
+    def _fetch_variant(self, session, goods_no: str, referer: str = "") -> Optional[dict]:
+        url = Config.MUSINSA_PRODUCT_URL.format(goods_no=goods_no)
+        try:
+            html = self._http_get(url, {"User-Agent": Config.USER_AGENT, "Referer": referer}, 5, session)
+            if html is None:
+                print(f"[PY DEBUG] variant {goods_no} fetch failed", file=sys.stderr)
+                return None
 
-            product = (
-                state.get("product")
-                or state.get("goods")
-                or page_props.get("product")
-                or page_props.get("goods")
-            )
+            product = Utils.next_data_product(html)
+            if not product:
+                return None
+
+            goods_name = product.get("goodsNm") or product.get("goodsName", "")
+            try:
+                price = int(
+                    product.get("finalPrice")
+                    or product.get("price")
+                    or product.get("salePrice")
+                    or product.get("goodsPrice")
+                    or 0
+                )
+            except (TypeError, ValueError):
+                price = 0
+
+            return {
+                "name": self._extract_color_from_goods_name(goods_name) or goods_name,
+                "isSoldOut": bool(product.get("isSoldOut")),
+                "goodsNo": goods_no,
+                "price": price,
+            }
+
+        except Exception as e:
+            print(f"[PY DEBUG] variant {goods_no} fetch error: {e}", file=sys.stderr)
+            return None
+
+    def _fetch_color_name_from_json(self, goods_no: str) -> str:
+        try:
+            script_el = self.driver.find_element(By.ID, "__NEXT_DATA__")
+            product = Utils.scan_next_data_product(script_el.get_attribute("innerHTML"))
 
             if not product:
                 return ""
@@ -543,21 +2112,25 @@ class BaseScraper(ABC):
         return ""
 
     def _find_price_from_html(self) -> int:
+        selectors = self._ordered("price", self.PRICE_SELECTORS)
         try:
-            WebDriverWait(self.driver, 5).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "span[class*='Price']"))
+            # 후보 중 아무거나 하나라도 뜨면 진행
+            self._wait(5).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, ", ".join(selectors)))
             )
         except:
             print("[DEBUG] Price wait failed", file=sys.stderr)
 
-        for sel in Config.MUSINSA_PRICE:
+        for sel in selectors:
             elements = self.driver.find_elements(By.CSS_SELECTOR, sel)
             for el in elements:
                 txt = el.text.strip()
                 price = Utils.extract_number(txt)
                 if price > 100:
                     print(f"[DEBUG] Price found: {price}", file=sys.stderr)
+                    self._learn("price", sel, True)
                     return price
+            self._learn("price", sel, False)
 
         print("[DEBUG] Price not found", file=sys.stderr)
         return 0
@@ -578,6 +2151,41 @@ class BaseScraper(ABC):
     @abstractmethod
     def _check_soldout(self) -> bool: ...
 
+    # --------------------------------------------------
+    # 상품정보 제공고시 (정적 HTML 한 번 파싱 → 사이즈/색상 공용)
+    # --------------------------------------------------
+    def _info_notice(self) -> Dict[str, str]:
+        rows = getattr(self, "_info_notice_rows", None)
+        if rows is not None:
+            metrics.CACHE.inc(cache="info_notice", result="hit")
+            return rows
+        metrics.CACHE.inc(cache="info_notice", result="miss")
+
+        rows = Utils.parse_info_notice(self.driver.page_source)
+        if not self._has_info_notice(rows) and self._expand_info_notice():
+            # 접혀 있어서 DOM에 없던 경우에만 한 번 펼치고 다시 스냅샷
+            rows = Utils.parse_info_notice(self.driver.page_source)
+
+        print(f"[PY DEBUG] Info notice rows: {list(rows.keys())}", file=sys.stderr)
+        self._info_notice_rows = rows
+        return rows
+
+    @staticmethod
+    def _has_info_notice(rows: Dict[str, str]) -> bool:
+        return any(k in key for key in rows for k in Config.INFO_NOTICE_KEYS)
+
+    def _expand_info_notice(self) -> bool:
+        # 사이트별로 접힌 고시 정보를 펼치는 방법이 있으면 override
+        return False
+
+    def _info_notice_value(self, *keywords: str) -> str:
+        rows = self._info_notice()
+        for kw in keywords:
+            for key, value in rows.items():
+                if kw in key:
+                    return value
+        return ""
+
     def _get_meta_content(self, selector: str) -> str:
         try:
             return self.driver.find_element(By.CSS_SELECTOR, selector).get_attribute("content")
@@ -589,13 +2197,208 @@ class BaseScraper(ABC):
 # 6. MUSINSA SCRAPER
 # ==========================================
 class MusinsaScraper(BaseScraper):
+    CHANGE_KEYS = (
+        "goodsOption", "optionCombinations", "isSoldOut",
+        "goodsNm", "goodsImage", "finalPrice", "price", "salePrice", "goodsPrice",
+    )
+
     def _scrape_single_color(self, data: ProductData):
     # 색상 정보 단순화: 아무 것도 안 함
         data.colors = []
 
     def _scrape_linked_colors(self, data: ProductData) -> bool:
+        variants = self._find_color_goods_from_dom()
+        if not variants:
+            return False
+
+        # 현재 상품이 링크 목록에 없으면 직접 추가
+        current = self._extract_goods_no()
+        if current and not any(v["isCurrent"] for v in variants):
+            variants.insert(0, {"goodsNo": current, "isCurrent": True})
+
+        print(f"[PY DEBUG] Resolving {len(variants)} color variants over HTTP", file=sys.stderr)
+        colors = self._resolve_color_variants(variants)
+        if not colors:
+            return False
+
+        data.colors = colors
+        return True
+
+    # --------------------------------------------------
+    # 색상×사이즈 재고 매트릭스
+    # --------------------------------------------------
+    def _collect_combination_data(self, data: ProductData):
+        """
+        옵션 조합별 재고를 한 번에 가져와 combinations / colors / sizes를 채움
+        1) 페이지 JSON(goodsOption) 2) 옵션 API 3) 옵션 드롭다운 한 번 열기 (조합형 라벨일 때만)
+        """
+        strategies = {
+            "page_json": self._combinations_from_page_json,
+            "options_api": self._combinations_from_api,
+            "option_dropdown": self._combinations_from_dropdown,
+        }
+        for name in self._ordered("combination_strategy", list(strategies)):
+            try:
+                combos = self._run_strategy(data, "combinations", name, strategies[name])
+            except Exception as e:
+                print(f"[PY DEBUG] combination strategy {name} failed: {e}", file=sys.stderr)
+                combos = []
+            self._learn("combination_strategy", name, bool(combos))
+            if combos:
+                print(f"[PY DEBUG] Found {len(combos)} combinations via {name}", file=sys.stderr)
+                data.combinations = combos
+                data.colors, data.sizes = self._axes_from_combinations(combos)
+                return
+            if self._over_budget(data, "combinations"):
+                return
+
+    def _combinations_from_page_json(self) -> list:
+        product = self._product_json or {}
+        return self._parse_option_matrix(product.get("goodsOption") or {})
+
+    def _combinations_from_api(self) -> list:
+        goods_no = self._extract_goods_no()
+        if not goods_no:
+            return []
+        return self._parse_option_matrix(self._prefetched("options", goods_no, self._fetch_options) or {})
+
+    def _fetch_options(self, goods_no: str) -> Optional[dict]:
+        body = self._http_get(
+            Config.MUSINSA_OPTIONS_URL.format(goods_no=goods_no),
+            {"User-Agent": Config.USER_AGENT, "Referer": Config.MUSINSA_PRODUCT_URL.format(goods_no=goods_no)},
+            5,
+        )
+        return json.loads(body).get("data") if body else None
+
+    def _combinations_from_dropdown(self) -> list:
+        """
+        옵션 드롭다운을 한 번만 열고, 항목 텍스트/비활성 상태를 스크립트 한 번으로 읽은 뒤 닫음.
+        "블랙 / M" 처럼 조합형 라벨일 때만 매트릭스가 나옴
+        (색상을 고른 뒤에야 사이즈가 뜨는 2단 드롭다운은 색상마다 열어야 해서 여기선 포기)
+        """
+        trigger = None
+        for sel in self._ordered("option_trigger", Config.MUSINSA_OPTION_TRIGGERS):
+            found = self.driver.find_elements(By.CSS_SELECTOR, sel)
+            trigger = found[0] if found else None
+            self._learn("option_trigger", sel, trigger is not None)
+            if trigger:
+                break
+        if not trigger:
+            return []
+
+        self.driver.execute_script("arguments[0].click();", trigger)
+        try:
+            self._wait(3).until(EC.presence_of_element_located(
+                (By.CSS_SELECTOR, "[role='option'], div[class*='SelectOptionItemContainer']")
+            ))
+        except Exception:
+            return []
+
+        items = self.driver.execute_script("""
+            const els = document.querySelectorAll("[role='option'], div[class*='SelectOptionItemContainer']");
+            const out = [];
+            els.forEach((el) => {
+                const text = (el.innerText || "").replace(/\\s+/g, " ").trim();
+                if (!text) return;
+                const cls = String(el.className || "").toLowerCase();
+                out.push([text, el.getAttribute("aria-disabled") === "true"
+                    || el.hasAttribute("data-disabled") || cls.includes("disabled")]);
+            });
+            document.dispatchEvent(new KeyboardEvent("keydown", {key: "Escape", bubbles: true}));
+            return out;
+        """) or []
+
+        return self._parse_dropdown_items(items)
+
+    # 드롭다운 항목 끝에 붙는 재고 표시 ("품절", "(품절)", "재입고 알림", "3개 남음")
+    DROPDOWN_STATUS_RE = re.compile(r"(?:\s*[(\[]?\s*(?:품절|재입고\s*알림|재입고|\d+\s*개\s*남음)\s*[)\]]?)+\s*$")
+
+    @classmethod
+    def _parse_dropdown_items(cls, items: list) -> list:
+        """
+        [[항목 텍스트, 비활성 여부]] → [{"color", "size", "isSoldOut"}]
+        사이즈는 재고 표시만 떼고 전체를 씀 ("블랙 / FREE SIZE 품절" → "FREE SIZE")
+        """
+        combos = []
+        for text, disabled in items:
+            label = cls.DROPDOWN_STATUS_RE.sub("", text).strip()
+            parts = re.split(r"\s*/\s*", label, maxsplit=1)
+            if len(parts) != 2 or not all(parts):
+                return []   # 조합형 라벨이 아님
+            combos.append({
+                "color": parts[0],
+                "size": parts[1],
+                "isSoldOut": bool(disabled) or "품절" in text,
+            })
+        return combos
+
+    @staticmethod
+    def _parse_option_matrix(options: dict) -> list:
+        """
+        {"basic": [옵션 그룹...], "optionItems": [조합...]} → [{"color", "size", "isSoldOut"}]
+        색상 그룹과 다른 그룹이 모두 있을 때만 (단일 옵션 상품은 조합이 아님)
+        """
+        groups = options.get("basic") or options.get("optionGroups") or []
+        items = options.get("optionItems") or []
+        if len(groups) < 2 or not items:
+            return []
+
+        is_color = [
+            any(k in str(g.get("name", "")).lower() for k in ("컬러", "색상", "color"))
+            for g in groups
+        ]
+        if not any(is_color):
+            return []
+        group_pos = {g.get("no"): i for i, g in enumerate(groups) if g.get("no") is not None}
+
+        combos = []
+        for item in items:
+            values = item.get("optionValues") or []
+            if len(values) != len(groups):
+                continue
+            color, others = "", []
+            for i, v in enumerate(values):
+                pos = group_pos.get(v.get("optionNo"), i)
+                if is_color[pos]:
+                    color = v.get("name", "")
+                else:
+                    others.append(v.get("name", ""))
+            if color and all(others):
+                combos.append({
+                    "color": color,
+                    "size": " / ".join(others),
+                    "isSoldOut": MusinsaScraper._option_item_soldout(item),
+                })
+        return combos
+
+    @staticmethod
+    def _option_item_soldout(item: dict) -> bool:
+        if item.get("isDeleted") or item.get("activated") is False:
+            return True
+        for key in ("outOfStock", "isSoldOut", "soldOut"):
+            if key in item:
+                return bool(item[key])
+        if item.get("soldOutYn"):
+            return item["soldOutYn"] == "Y"
+        for key in ("remainQuantity", "stockQuantity"):
+            if isinstance(item.get(key), (int, float)):
+                return item[key] <= 0
         return False
 
+    @staticmethod
+    def _axes_from_combinations(combos: list) -> tuple:
+        """
+        조합 → (colors, sizes). 모든 조합이 품절일 때만 그 색상/사이즈를 품절로 표시
+        """
+        colors, sizes = {}, {}
+        for c in combos:
+            colors[c["color"]] = colors.get(c["color"], True) and c["isSoldOut"]
+            sizes[c["size"]] = sizes.get(c["size"], True) and c["isSoldOut"]
+        return (
+            [{"name": n, "isSoldOut": v} for n, v in colors.items()],
+            [{"name": n, "isSoldOut": v} for n, v in sizes.items()],
+        )
+
     def _check_soldout(self) -> bool:
         return "품절" in self.driver.page_source
     
@@ -606,19 +2409,48 @@ class MusinsaScraper(BaseScraper):
         m = re.search(r"/products/(\d+)", self.driver.current_url)
         return m.group(1) if m else None
 
+    def _prefetch_tasks(self, url: str) -> Dict[tuple, Callable[[], Any]]:
+        # goods_no는 URL에 이미 있음 → actual-size는 페이지 로딩/파싱/색상 수집을 기다릴 필요 없음
+        m = re.search(r"/products/(\d+)", url)
+        if not m:
+            return {}
+        goods_no = m.group(1)
+        tasks = {("actual_size", goods_no): lambda: self._fetch_actual_size(goods_no)}
+        # 조합 재고는 보통 페이지 JSON에 있음 → 이 사이트에서 옵션 API가 더 자주 맞았을 때만 미리 받음
+        if self._ordered("combination_strategy", ["page_json", "options_api"])[0] == "options_api":
+            tasks[("options", goods_no)] = lambda: self._fetch_options(goods_no)
+        return tasks
+
+    def _check_unchanged(self, url: str) -> Optional[ProductData]:
+        # 상품 페이지 HTML의 __NEXT_DATA__ 부분 트리 해시만 비교 (304면 본문도 안 받음, HTML은 저장 안 함)
+        def digest(html: str) -> Optional[str]:
+            product = Utils.next_data_product(html)
+            return subtree_digest(product, self.CHANGE_KEYS) if product else None
+
+        try:
+            found = self.changes.page(url, digest, {"User-Agent": Config.USER_AGENT}, self._http_timeout(5))
+        except Exception as e:
+            print(f"[PY DEBUG] change probe error: {e}", file=sys.stderr)
+            return None
+
+        if not found:
+            return None
+        self._digest = found
+        return self._cached_result()
+
     def _fetch_actual_size(self, goods_no: str) -> Optional[dict]:
-        url = f"https://goods-detail.musinsa.com/api2/goods/{goods_no}/actual-size"
+        url = Config.MUSINSA_ACTUAL_SIZE_URL.format(goods_no=goods_no)
         headers = {
             "User-Agent": Config.USER_AGENT,
-            "Referer": f"https://www.musinsa.com/products/{goods_no}"
+            "Referer": Config.MUSINSA_PRODUCT_URL.format(goods_no=goods_no)
         }
 
         try:
-            r = requests.get(url, headers=headers, timeout=5)
-            if r.status_code != 200:
-                print(f"[PY DEBUG] actual-size API failed: {r.status_code}", file=sys.stderr)
+            body = self._http_get(url, headers, 5)
+            if body is None:
+                print("[PY DEBUG] actual-size API failed", file=sys.stderr)
                 return None
-            return r.json()
+            return json.loads(body)
         except Exception as e:
             print(f"[PY DEBUG] actual-size request error: {e}", file=sys.stderr)
             return None
@@ -675,9 +2507,9 @@ class MusinsaScraper(BaseScraper):
     def _has_actual_size_api(self, goods_no: str) -> bool:
         if not goods_no:
             return False
-        url = f"https://goods-detail.musinsa.com/api2/goods/{goods_no}/actual-size"
+        url = Config.MUSINSA_ACTUAL_SIZE_URL.format(goods_no=goods_no)
         try:
-            res = requests.get(url, timeout=3)
+            res = requests.get(url, timeout=self._http_timeout(3))
             return res.status_code == 200 and "sizes" in res.text
         except:
             return False
@@ -711,42 +2543,15 @@ class MusinsaScraper(BaseScraper):
             raw_json = script.get_attribute("innerHTML")
             print("[DEBUG] __NEXT_DATA__ found", file=sys.stderr)
 
-            data = json.loads(raw_json)
-            print("[DEBUG] JSON loaded successfully", file=sys.stderr)
-
-            # 2. state 접근
-            page_props = Utils.safe_get(data, ["props", "pageProps"], {})
-
-            state = (
-                page_props.get("state")
-                or page_props.get("initialState")
-                or page_props
-            )
-
-            if not state:
-                print("[DEBUG] state is missing or empty", file=sys.stderr)
-                return None
-            print(f"[DEBUG] state keys: {list(state.keys())}", file=sys.stderr)
-
-            # 3. product / goods 접근
-            product = (
-                state.get("product")
-                or state.get("goods")
-                or page_props.get("product")
-                or page_props.get("goods")
-            )
+            # 2~3. product / goods 객체만 만들기 (수 MB짜리 전체를 json.loads 하지 않음)
+            product = Utils.scan_next_data_product(raw_json)
 
             if not product:
                 print("[DEBUG] product/goods object not found in state", file=sys.stderr)
                 return None
             print(f"[DEBUG] product keys: {list(product.keys())}", file=sys.stderr)
-
-            print(
-                "[DEBUG] pageProps keys:",
-                list(page_props.keys()),
-                file=sys.stderr
-            )
-
+            self._digest = subtree_digest(product, self.CHANGE_KEYS)
+            self._product_json = product
 
             # 4. 가격 확인
             price = int(
@@ -814,7 +2619,7 @@ class MusinsaScraper(BaseScraper):
             print("[PY DEBUG] JSON options already available", file=sys.stderr)
             return
 
-        wait = WebDriverWait(self.driver, 5)
+        wait = self._wait(5)
 
         print("[PY DEBUG] Try A-type static size buttons", file=sys.stderr)
 
@@ -929,22 +2734,16 @@ class MusinsaScraper(BaseScraper):
         # ============================================================
         # 1) Radix Dropdown 트리거(옵션박스 클릭)
         # ============================================================
-        trigger_selectors = [
-            "div[class*='DropdownTrigger']",             # 가장 안정적
-            "input[class*='DropdownTriggerInput']",      # v2 구조
-            "div[class*='OptionBox__SelectContainer']",  # 예전 + 일부 최신
-            "input[placeholder*='옵션']", 
-            "input[readonly]"
-        ]
-
         trigger = None
-        for sel in trigger_selectors:
+        for sel in self._ordered("option_trigger", Config.MUSINSA_OPTION_TRIGGERS):
             try:
                 trigger = self.driver.find_element(By.CSS_SELECTOR, sel)
                 print(f"[PY DEBUG] Trigger found: {sel}", file=sys.stderr)
-                break
             except:
-                continue
+                pass
+            self._learn("option_trigger", sel, trigger is not None)
+            if trigger:
+                break
 
         if not trigger:
             print("[PY DEBUG] No dropdown trigger found", file=sys.stderr)
@@ -959,7 +2758,7 @@ class MusinsaScraper(BaseScraper):
             print("[PY DEBUG] Dropdown clicked", file=sys.stderr)
 
             # ✅ 1) "열림"을 너무 좁게 잡지 말고 portal/컨텐츠 래퍼 등장으로 대기
-            WebDriverWait(self.driver, 6).until(
+            self._wait(6).until(
                 EC.presence_of_element_located(
                     (By.CSS_SELECTOR, "[data-radix-portal], div[data-mds*='DropdownMenu']")
                 )
@@ -1006,7 +2805,7 @@ class MusinsaScraper(BaseScraper):
         # ============================================================
         if not options:
             print("[PY DEBUG] No options found → retrying portal...", file=sys.stderr)
-            time.sleep(0.5)
+            self._sleep(0.5)
 
             try:
                 portal = self.driver.find_elements(By.CSS_SELECTOR, "[data-radix-portal]")
@@ -1047,17 +2846,12 @@ class MusinsaScraper(BaseScraper):
                 "isSoldOut": is_soldout
             })
 
-    def _scrape_size_from_info_notice(self, data: ProductData):
-        # 상품 정보 고시(Accordion) 내부의 '치수' 항목을 파싱
-        print("[PY DEBUG] Trying to parse Info Notice with Unicode & Click...", file=sys.stderr)
-        
-        # '치수'의 유니코드: \uce58\uc218
-        KEYWORD_SIZE = "\uce58\uc218" 
-        
+    def _expand_info_notice(self) -> bool:
+        # 상품 고시 정보(Accordion)는 접혀 있으면 DOM에 내용이 없음 → 한 번만 펼침
         try:
             # 0. 페이지 하단으로 스크롤
             self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight - 1000);")
-            time.sleep(1)
+            self._sleep(1)
 
             # 1. '상품 고시 정보' 탭 오픈
             # '상품 고시 정보'가 포함된 버튼 찾기 (유니코드: \uc0c1\ud488 \uace0\uc2dc \uc815\ubcf4)
@@ -1070,25 +2864,31 @@ class MusinsaScraper(BaseScraper):
                 if toggle_btn.get_attribute("aria-expanded") == "false":
                     self.driver.execute_script("arguments[0].click();", toggle_btn)
                     print("[PY DEBUG] Expanded Info Notice Accordion", file=sys.stderr)
-                    time.sleep(1)
+                    self._sleep(1)
             except Exception:
                 # 버튼 못 찾으면 이미 열려있거나 구조가 다르다고 판단하고 진행
                 pass
+            return True
 
-            # 2. '치수' 항목 찾기 (유니코드 적용된 XPath)
-            target_element = self.driver.find_element(
-                By.XPATH, 
-                f"//dt[.//span[contains(text(), '{KEYWORD_SIZE}')]]/following-sibling::dd[1]"
-            )
-            
-            raw_text = target_element.text.strip()
+        except Exception as e:
+            print(f"[PY DEBUG] Info Notice expand failed: {e}", file=sys.stderr)
+            return False
+
+    def _scrape_size_from_info_notice(self, data: ProductData):
+        # 상품 정보 고시 내부의 '치수' 항목을 파싱
+        print("[PY DEBUG] Trying to parse Info Notice (static HTML)...", file=sys.stderr)
+        
+        # '치수'의 유니코드: \uce58\uc218
+        KEYWORD_SIZE = "\uce58\uc218" 
+        
+        try:
+            raw_text = self._info_notice_value(KEYWORD_SIZE)
             print(f"[PY DEBUG] Found Info Notice Text: {raw_text}", file=sys.stderr)
 
-            # 3. 데이터 정제
+            # 데이터 정제
             if not raw_text or "참조" in raw_text or "이미지" in raw_text:
                 return
 
-            import re
             tokens = re.split(r'[,/\n]+', raw_text)
             
             valid_sizes = []
@@ -1114,36 +2914,12 @@ class MusinsaScraper(BaseScraper):
         collected_colors = []
 
         try:
-            self.driver.execute_script(
-                "window.scrollTo(0, document.body.scrollHeight - 1000);"
-            )
-            time.sleep(1)
-
-            try:
-                toggle_btn = self.driver.find_element(
-                    By.XPATH,
-                    "//button[contains(., '\uc0c1\ud488 \uace0\uc2dc \uc815\ubcf4')]"
-                )
-                if toggle_btn.get_attribute("aria-expanded") == "false":
-                    self.driver.execute_script(
-                        "arguments[0].click();", toggle_btn
-                    )
-                    time.sleep(1)
-            except Exception:
-                pass
-
-            target_element = self.driver.find_element(
-                By.XPATH,
-                f"//dt[.//span[contains(text(), '{KEYWORD_COLOR}')]]/following-sibling::dd[1]"
-            )
-
-            raw_text = target_element.text.strip()
+            raw_text = self._info_notice_value(KEYWORD_COLOR)
             print(f"[PY DEBUG] Found Info Notice Color Text: {raw_text}", file=sys.stderr)
 
             if not raw_text or "참조" in raw_text or "이미지" in raw_text:
                 return False
             
-            import re
             tokens = re.split(r'[,/\n]+', raw_text)
 
             for t in tokens:
@@ -1194,6 +2970,10 @@ class MusinsaScraper(BaseScraper):
         )
 
         for area in containers:
+            if self.deadline.expired():
+                print("[PY DEBUG] Deadline reached while scanning containers", file=sys.stderr)
+                break
+
             text = self.driver.execute_script(
                 "return arguments[0].innerText;", area
             )
@@ -1296,6 +3076,18 @@ class MusinsaScraper(BaseScraper):
 # 7. NAVER SCRAPER (REVISED)
 # ==========================================
 class NaverScraper(BaseScraper):
+    PRICE_SELECTORS = Config.NAVER_PRICE
+    OPTION_KEYS = ("optionCombinations", "optionStandards", "simpleOptions")
+    # 상태를 브라우저 안에서 문자열로 직렬화 (드라이버가 객체 트리를 통째로 변환해 넘기지 않게)
+    STATE_JSON_SCRIPT = """
+        const state = window.__PRELOADED_STATE__ || window.__APOLLO_STATE__ || null;
+        try { return JSON.stringify(state); } catch (e) { return undefined; }
+    """
+    CHANGE_KEYS = (
+        "optionCombinations", "optionStandards", "simpleOptions", "stockQuantity", "productStatusType",
+        "dispName", "name", "benefitsView", "discountedSalePrice", "salePrice", "price", "representImage",
+    )
+
     @property
     def site_name(self):
         return "naver"
@@ -1306,6 +3098,10 @@ class NaverScraper(BaseScraper):
         interval = 2      # 2초 간격 (총 20초 대기)
         
         for i in range(max_retries):
+            if self.deadline.expired():
+                print("[PY DEBUG] Deadline reached while waiting for page", file=sys.stderr)
+                return
+
             # 1. JSON 데이터가 로드되었는지 확인
             try:
                 is_json_ready = self.driver.execute_script(
@@ -1319,61 +3115,73 @@ class NaverScraper(BaseScraper):
 
             # 2. HTML 요소(가격/제목)가 화면에 떴는지 확인 (JSON 없는 페이지 대비)
             try:
-                for sel in Config.NAVER_PRICE + Config.NAVER_TITLE:
+                missed = []
+                for sel in self._ordered("ready", Config.NAVER_PRICE + Config.NAVER_TITLE):
                     els = self.driver.find_elements(By.CSS_SELECTOR, sel)
                     if els and els[0].is_displayed():
                         print(f"[PY DEBUG] HTML Element detected! (Attempt {i+1})", file=sys.stderr)
+                        # 이번에 먼저 시도했다가 빗나간 셀렉터도 기록 (성공만 쌓이면 순서가 치우침)
+                        for miss in missed:
+                            self._learn("ready", miss, False)
+                        self._learn("ready", sel, True)
                         return
+                    missed.append(sel)
             except:
                 pass
-            # 3. 아직 준비 안 됨 -> 대기
+            # 3. 아직 준비 안 됨 -> 로딩 뒤 스크립트가 캡차/로그인으로 보냈는지 확인하고 대기
+            self._check_blocked()
             print(f"[PY DEBUG] Page not ready yet... waiting ({i+1}/{max_retries})", file=sys.stderr)
-            time.sleep(interval)
+            self._sleep(interval)
 
         print("[PY DEBUG] Timeout: Failed to detect valid product data.", file=sys.stderr)
+        for sel in Config.NAVER_PRICE + Config.NAVER_TITLE:
+            self._learn("ready", sel, False)
 
     def _scrape_from_json(self):
         try:
             print("[DEBUG] >>> NEW SCRAPER CODE V4 (ALL-IN-ONE) RUNNING <<<", file=sys.stderr)
 
-            # 1. 데이터 가져오기
-            state = self.driver.execute_script("return window.__PRELOADED_STATE__")
-            if not state:
-                state = self.driver.execute_script("return window.__APOLLO_STATE__")
-            
-            if not state: return None
-
-            # 2. 데이터 위치 찾기 (재귀 탐색 - Deep Search)
-            # JSON 트리 구조를 탐색하여 '옵션 정보'를 가진 진짜 데이터를 찾아냅니다.
-            def find_real_product_data(data, depth=0):
-                if depth > 5: return None # 너무 깊으면 중단
-                if isinstance(data, dict):
-                    # 옵션 데이터 후보군 키워드 확인
-                    has_combos = "optionCombinations" in data and len(data["optionCombinations"] or []) > 0
-                    has_standards = "optionStandards" in data and len(data["optionStandards"] or []) > 0
-                    has_simple = "simpleOptions" in data and len(data["simpleOptions"] or []) > 0
-                    
-                    if has_combos or has_standards or has_simple:
-                        return data
-                    
-                    # 없으면 하위 딕셔너리 탐색
-                    for k, v in data.items():
-                        if isinstance(v, dict):
-                            found = find_real_product_data(v, depth+1)
-                            if found: return found
+            # 1. 데이터 가져오기 (문자열로 받아서 필요한 객체만 만듦)
+            raw = self.driver.execute_script(self.STATE_JSON_SCRIPT)
+            if raw is None:
+                return self._scrape_from_state_object()
+            if raw == "null":
                 return None
 
-            product = find_real_product_data(state)
-            
+            # 2. 데이터 위치 찾기 (옵션 키를 가진 객체, 찾으면 나머지는 읽지 않음)
+            product = json_scan.find_object_with_keys(raw, self.OPTION_KEYS, max_depth=5)
+
             # 못 찾았을 경우 기본 경로 시도
             if not product:
-                product = Utils.safe_get(state, ["productDetail", "A"]) or \
-                          Utils.safe_get(state, ["product", "A"]) or \
-                          state.get("product")
+                product = json_scan.find_first(raw, [("productDetail", "A"), ("product", "A"), ("product",)])
+
+            return self._product_from_json(product)
+
+        except Exception as e:
+            print(f"[DEBUG] V4 Error: {e}", file=sys.stderr)
+            return None
+
+    def _scrape_from_state_object(self):
+        # JSON.stringify가 안 되는 state(순환 참조 등) → 예전처럼 객체를 통째로 받아서 탐색
+        state = self.driver.execute_script("return window.__PRELOADED_STATE__")
+        if not state:
+            state = self.driver.execute_script("return window.__APOLLO_STATE__")
+        if not state:
+            return None
 
+        product = self._find_real_product_data(state)
+        if not product:
+            product = Utils.safe_get(state, ["productDetail", "A"]) or \
+                      Utils.safe_get(state, ["product", "A"]) or \
+                      state.get("product")
+        return self._product_from_json(product)
+
+    def _product_from_json(self, product: Optional[dict]):
+        try:
             if not product:
                 print("[DEBUG] FAILED to find product object.", file=sys.stderr)
                 return None
+            self._digest = subtree_digest(product, self.CHANGE_KEYS)
 
             print("[DEBUG] Product Object Found! Extracting details...", file=sys.stderr)
 
@@ -1393,62 +3201,8 @@ class NaverScraper(BaseScraper):
             elif product.get("images"):
                 image_url = product["images"][0].get("url", "") if isinstance(product["images"][0], dict) else product["images"][0]
 
-            # ================================================================
             # 4. [핵심] 옵션 추출 (조합 정보 포함)
-            # ================================================================
-            colors_map = {}
-            sizes_map = {}
-            combinations_list = []  # [추가됨] 모든 조합(색상+사이즈) 정보를 담을 리스트
-
-            # (A) 조합형 옵션
-            combinations = product.get("optionCombinations", [])
-            
-            # (B) 독립형/표준형 옵션
-            standards = product.get("optionStandards", [])
-            
-            if combinations:
-                print(f"[DEBUG] Extracting from COMBINATIONS ({len(combinations)})", file=sys.stderr)
-                for combo in combinations:
-                    n1 = combo.get("optionName1") # 색상
-                    n2 = combo.get("optionName2") # 사이즈
-                    stock = combo.get("stockQuantity", 0)
-                    is_avail = stock > 0
-                    
-                    # [추가됨] 조합 정보 저장
-                    if n1 and n2:
-                        combinations_list.append({
-                            "color": n1,
-                            "size": n2,
-                            "isSoldOut": not is_avail
-                        })
-
-                    if n1: 
-                        if n1 not in colors_map: colors_map[n1] = False
-                        if is_avail: colors_map[n1] = True
-                    if n2:
-                        if n2 not in sizes_map: sizes_map[n2] = False
-                        if is_avail: sizes_map[n2] = True
-
-            elif standards:
-                print(f"[DEBUG] Extracting from STANDARDS ({len(standards)})", file=sys.stderr)
-                # 표준형은 구조가 복잡하여 n1(색상), n2(사이즈) 매칭이 어려울 수 있으나
-                # 가능한 범위 내에서 처리 (보통 드롭다운 2개인 경우)
-                # 여기서는 단순화하여 기존 로직 유지하되 combinations_list는 비워둡니다.
-                # (프론트엔드에서 데이터가 없으면 기존 방식대로 동작)
-                for std in standards:
-                    opt_type = std.get("type") or std.get("optionName")
-                    options = std.get("options") or []
-                    for opt in options:
-                        opt_name = opt.get("optionName") or opt.get("name")
-                        is_avail = opt.get("usable", True) and opt.get("stockQuantity", 1) > 0
-                        
-                        if "COLOR" in str(opt_type).upper() or "색상" in str(opt_type):
-                            colors_map[opt_name] = is_avail
-                        else:
-                            sizes_map[opt_name] = is_avail
-
-            colors_list = [{"name": n, "isSoldOut": not v} for n, v in colors_map.items()]
-            sizes_list = [{"name": n, "isSoldOut": not v} for n, v in sizes_map.items()]
+            colors_list, sizes_list, combinations_list = self._extract_options(product)
 
             return ProductData(
                 site="naver",
@@ -1464,6 +3218,86 @@ class NaverScraper(BaseScraper):
             print(f"[DEBUG] V4 Error: {e}", file=sys.stderr)
             return None
 
+    # JSON 트리 구조를 탐색하여 '옵션 정보'를 가진 진짜 데이터를 찾아냅니다.
+    @staticmethod
+    def _find_real_product_data(data, depth=0):
+        if depth > 5: return None # 너무 깊으면 중단
+        if isinstance(data, dict):
+            # 옵션 데이터 후보군 키워드 확인
+            has_combos = "optionCombinations" in data and len(data["optionCombinations"] or []) > 0
+            has_standards = "optionStandards" in data and len(data["optionStandards"] or []) > 0
+            has_simple = "simpleOptions" in data and len(data["simpleOptions"] or []) > 0
+            
+            if has_combos or has_standards or has_simple:
+                return data
+            
+            # 없으면 하위 딕셔너리 탐색
+            for k, v in data.items():
+                if isinstance(v, dict):
+                    found = NaverScraper._find_real_product_data(v, depth+1)
+                    if found: return found
+        return None
+
+    @staticmethod
+    def _extract_options(product: dict) -> tuple:
+        """
+        optionCombinations / optionStandards → (colors, sizes, combinations)
+        """
+        colors_map = {}
+        sizes_map = {}
+        combinations_list = []  # [추가됨] 모든 조합(색상+사이즈) 정보를 담을 리스트
+
+        # (A) 조합형 옵션
+        combinations = product.get("optionCombinations", [])
+        
+        # (B) 독립형/표준형 옵션
+        standards = product.get("optionStandards", [])
+        
+        if combinations:
+            print(f"[DEBUG] Extracting from COMBINATIONS ({len(combinations)})", file=sys.stderr)
+            for combo in combinations:
+                n1 = combo.get("optionName1") # 색상
+                n2 = combo.get("optionName2") # 사이즈
+                stock = combo.get("stockQuantity", 0)
+                is_avail = stock > 0
+                
+                # [추가됨] 조합 정보 저장
+                if n1 and n2:
+                    combinations_list.append({
+                        "color": n1,
+                        "size": n2,
+                        "isSoldOut": not is_avail
+                    })
+
+                if n1: 
+                    if n1 not in colors_map: colors_map[n1] = False
+                    if is_avail: colors_map[n1] = True
+                if n2:
+                    if n2 not in sizes_map: sizes_map[n2] = False
+                    if is_avail: sizes_map[n2] = True
+
+        elif standards:
+            print(f"[DEBUG] Extracting from STANDARDS ({len(standards)})", file=sys.stderr)
+            # 표준형은 구조가 복잡하여 n1(색상), n2(사이즈) 매칭이 어려울 수 있으나
+            # 가능한 범위 내에서 처리 (보통 드롭다운 2개인 경우)
+            # 여기서는 단순화하여 기존 로직 유지하되 combinations_list는 비워둡니다.
+            # (프론트엔드에서 데이터가 없으면 기존 방식대로 동작)
+            for std in standards:
+                opt_type = std.get("type") or std.get("optionName")
+                options = std.get("options") or []
+                for opt in options:
+                    opt_name = opt.get("optionName") or opt.get("name")
+                    is_avail = opt.get("usable", True) and opt.get("stockQuantity", 1) > 0
+                    
+                    if "COLOR" in str(opt_type).upper() or "색상" in str(opt_type):
+                        colors_map[opt_name] = is_avail
+                    else:
+                        sizes_map[opt_name] = is_avail
+
+        colors_list = [{"name": n, "isSoldOut": not v} for n, v in colors_map.items()]
+        sizes_list = [{"name": n, "isSoldOut": not v} for n, v in sizes_map.items()]
+        return colors_list, sizes_list, combinations_list
+
     # ================================================================
     # [추가할 함수 2] 색상 함수 바로 밑에 붙여넣으세요
     # ================================================================
@@ -1474,22 +3308,15 @@ class NaverScraper(BaseScraper):
         try:
             print("[DEBUG] Trying Info Notice fallback for SIZE...", file=sys.stderr)
             
-            # 1. '치수' 또는 '사이즈' 텍스트가 포함된 테이블 행(th) 찾기
-            target = None
-            try:
-                # '치수'라는 단어를 먼저 찾고, 없으면 '사이즈'를 찾음
-                target = self.driver.find_element(By.XPATH, "//th[contains(text(), '치수') or contains(text(), '사이즈')]/following-sibling::td")
-            except:
-                pass
+            # 1. '치수'를 먼저 찾고, 없으면 '사이즈'를 찾음 (page_source 한 번 파싱한 결과 재사용)
+            text = self._info_notice_value("치수", "사이즈")
             
             # 2. 찾았으면 텍스트 파싱
-            if target:
-                text = target.text.strip()
+            if text:
                 print(f"[DEBUG] Found size text in notice: {text}", file=sys.stderr)
                 
                 # '참조', '상세' 같은 말이 아니면 유효한 사이즈로 간주
                 if "참조" not in text and "상세" not in text:
-                    import re
                     # 콤마(,)나 슬래시(/)로 구분된 경우 분리
                     sizes_list = re.split(r'[,/]', text)
                     
@@ -1512,23 +3339,16 @@ class NaverScraper(BaseScraper):
         try:
             print("[DEBUG] Trying Info Notice fallback...", file=sys.stderr)
             
-            # 1. '색상' 이라는 글자가 포함된 테이블 행(th) 찾기
-            # (XPath: 색상이라는 글자가 있는 th의 바로 다음 td)
-            target = None
-            try:
-                target = self.driver.find_element(By.XPATH, "//th[contains(text(), '색상')]/following-sibling::td")
-            except:
-                pass
+            # 1. '색상' 항목 (page_source 한 번 파싱한 결과 재사용)
+            text = self._info_notice_value("색상")
             
             # 2. 찾았으면 텍스트 파싱
-            if target:
-                text = target.text.strip()
+            if text:
                 print(f"[DEBUG] Found text in notice: {text}", file=sys.stderr)
                 
                 # '참조', '상세' 같은 말이 아니면 유효한 색상으로 간주
                 if "참조" not in text and "상세" not in text:
                     # 쉼표(,)나 슬래시(/)로 구분된 경우 분리
-                    import re
                     colors = re.split(r'[,/]', text)
                     
                     for c in colors:
@@ -1564,25 +3384,484 @@ class NaverScraper(BaseScraper):
 # ==========================================
 # 8. MAIN
 # ==========================================
-def main():
-    url = sys.argv[1] if len(sys.argv) > 1 else input("URL: ")
+STREAM_FLAG = "--stream"
+WORKER_FLAG = "--worker"
+DEADLINE_FLAG = "--deadline="   # --deadline=15 (초 단위 전체 예산)
+HISTORY_FLAG = "--history="     # --history=history (가격/재고 이력 저장 폴더)
+TABS_FLAG = "--tabs="           # --tabs=4 (워커 모드: 브라우저 하나에서 탭 4개 병행)
+PROFILE_FLAG = "--profile="     # --profile=profiles (영구 프로필 + 디스크 캐시 루트)
+PREWARM_FLAG = "--prewarm"      # 시작할 때 사이트 첫 화면으로 캐시 예열
+METRICS_PORT_FLAG = "--metrics-port="   # --metrics-port=9108 (GET /metrics)
+METRICS_FILE_FLAG = "--metrics-file="   # --metrics-file=crawler.prom (작업마다 갱신)
+SELECTOR_STATS_FLAG = "--selector-stats="  # --selector-stats=stats.json (셀렉터 성공 기록을 파일에 남김, 없으면 메모리에만)
+DRIVER_FLAG = "--driver="       # --driver=cdp (chromedriver 없이 DevTools 직결)
+IMAGES_FLAG = "--images="       # --images=image_cache (상품 이미지 썸네일 캐시 폴더)
+INDEX_FLAG = "--index="         # --index=product_index.db (검색용 로컬 상품 색인)
+CHANGES_FLAG = "--changes="     # --changes=change_cache.db (ETag/해시로 안 바뀐 상품은 다시 긁지 않음)
+EXPORT_FLAG = "--export="       # --export=exports (옵션 한 개 = 한 행, 열 단위 파일로 내보내기)
+EXPORT_FORMAT_FLAG = "--export-format="   # --export-format=parquet|arrow|csv
+EXPORT_WINDOW_FLAG = "--export-window="   # --export-window=3600 (이 초마다 새 파일)
+QUEUE_FLAG = "--queue="         # --queue=sqlite:///jobs.db (공유 큐에서 작업을 받아오는 워커)
+CONCURRENCY_FLAG = "--concurrency="   # --concurrency=3 (큐 워커: 이 호스트에서 띄울 브라우저 수)
+DRAIN_FLAG = "--drain"          # 큐가 비면 종료 (배치 한 번 처리용)
+CHECKPOINT_FLAG = "--checkpoint="   # --checkpoint=refresh.ckpt (워커/배치: 끝난 URL은 다시 실행해도 건너뜀)
+BATCH_FLAG = "--batch="         # --batch=urls.txt (stdin 대신 파일에서 작업을 읽음, 체크포인트 기본값 urls.txt.ckpt)
 
-    driver = DriverFactory.create_driver()
 
-    scraper = None
-    if "musinsa.com" in url:
-        scraper = MusinsaScraper(driver)
-    elif "naver" in url or "smartstore" in url:
-        scraper = NaverScraper(driver)
+@dataclass
+class RunOptions:
+    stream: bool = False
+    budget: Optional[float] = None
+    history: Optional[HistoryStore] = None
+    tabs: int = 1
+    metrics_file: Optional[str] = None
+    selector_stats: Optional[SelectorStats] = None
+    images: Optional[ImageCache] = None
+    index: Optional[ProductIndex] = None
+    changes: Optional[ChangeCache] = None
+    export: Optional[ExportSink] = None
+    checkpoint: Optional[Checkpoint] = None
+    # 차단된 사이트를 잠시 쉬는 상태 (None이면 안 씀 — 큐 모드는 큐가 호스트 전체에 걸쳐 관리)
+    backoff: Optional[SiteBackoff] = field(default_factory=SiteBackoff)
+
+
+def flag_value(args: List[str], prefix: str) -> Optional[str]:
+    for a in args:
+        if a.startswith(prefix):
+            return a[len(prefix):]
+    return None
+
+
+def create_scraper(url: str, driver: WebDriver, stats: Optional[SelectorStats] = None,
+                   changes: Optional[ChangeCache] = None) -> Optional[BaseScraper]:
+    site = site_of(url)
+    if site == "musinsa":
+        return MusinsaScraper(driver, stats, changes)
+    if site == "naver":
+        return NaverScraper(driver, stats, changes)
+    return None
+
+
+def write_line(obj: dict):
+    # NDJSON 한 줄 출력 (클라이언트가 바로 읽을 수 있게 즉시 flush)
+    print(json.dumps(obj, ensure_ascii=False), flush=True)
+
+
+def flush_metrics(opts: RunOptions):
+    if not opts.metrics_file:
+        return
+    try:
+        metrics.REGISTRY.write_file(opts.metrics_file)
+    except Exception as e:
+        print(f"[PY DEBUG] metrics write failed: {e}", file=sys.stderr)
+
 
+def save_selector_stats(opts: RunOptions):
+    if opts.selector_stats is None:
+        return
+    try:
+        opts.selector_stats.save()
+    except Exception as e:
+        print(f"[PY DEBUG] selector stats write failed: {e}", file=sys.stderr)
+
+
+def run_job(
+    driver: WebDriver,
+    job: dict,
+    opts: RunOptions,
+    deadline: Optional[Deadline] = None,
+    navigate: bool = True,
+) -> Optional[ProductData]:
+    url = job["url"]
+    tag = {"url": url}
+    if job.get("id") is not None:
+        tag["id"] = job["id"]
+
+    # 작업마다 새 카운터 → 결과의 driverCommands는 이 작업의 왕복 수
+    scraper = create_scraper(
+        url, CountingDriver(driver) if driver is not None else None, opts.selector_stats, opts.changes
+    )
     if not scraper:
-        print(json.dumps({"error": "Unsupported URL"}, ensure_ascii=False))
+        metrics.ERRORS.inc(site="unknown", type="UnsupportedURL")
+        if opts.stream:
+            write_line({"event": "error", **tag, "data": {"error": "Unsupported URL"}})
+        else:
+            write_line({"error": "Unsupported URL", **{k: v for k, v in tag.items() if k == "id"}})
+        return
+
+    site = scraper.site_name
+    if opts.backoff is not None:
+        # 최근에 막힌 사이트 → 브라우저를 쓰지 않고 바로 실패
+        opts.backoff.check(site)
+
+    deadline = deadline or Deadline(job.get("deadline", opts.budget))
+    image = {}
+
+    def on_event(stage: str, payload: dict):
+        if stage == "basic" and opts.images is not None and payload.get("image") and not image:
+            # 이미지 주소가 나오자마자 받기 시작 (색상/사이즈 단계와 겹침)
+            timeout = deadline.clamp(Config.IMAGE_TIMEOUT)
+            if timeout > 0:
+                image["url"] = payload["image"]
+                image["pool"] = ThreadPoolExecutor(max_workers=1, thread_name_prefix="image")
+                image["future"] = image["pool"].submit(opts.images.store, image["url"], referer=url, timeout=timeout)
+        if opts.stream:
+            write_line({"event": stage, **tag, "data": payload})
+
+    try:
+        result = scraper.scrape(
+            url,
+            on_event=on_event if opts.stream or opts.images is not None else None,
+            deadline=deadline,
+            navigate=navigate,
+        )
+    except BlockedError as e:
+        if e.site_wide and opts.backoff is not None:
+            e.retry_after = opts.backoff.hit(site, e.retry_after)
+        raise
+    finally:
+        if image:
+            image["pool"].shutdown(wait=False)
+        flush_metrics(opts)
+        save_selector_stats(opts)
+    if opts.backoff is not None:
+        opts.backoff.clear(site)
+
+    if opts.history is not None:
+        try:
+            opts.history.append(product_key(url, scraper.site_name), result)
+        except Exception as e:
+            print(f"[PY DEBUG] history append failed: {e}", file=sys.stderr)
+
+    if opts.images is not None and result.image:
+        # 이미지는 한 번만 받아서 로컬 썸네일 URL로 (남은 예산 안에서만)
+        timeout = deadline.clamp(Config.IMAGE_TIMEOUT)
+        if image.get("url") == result.image:
+            try:
+                result.thumbnails = image["future"].result(timeout=timeout)
+            except FutureTimeout:
+                print("[PY DEBUG] image fetch cut by deadline", file=sys.stderr)
+        elif timeout > 0:
+            result.thumbnails = opts.images.store(result.image, referer=url, timeout=timeout)
+        if opts.stream and result.thumbnails:
+            write_line({"event": "images", **tag, "data": result.thumbnails})
+
+    if opts.index is not None and (result.title or result.price):
+        try:
+            opts.index.add(url, result)
+        except Exception as e:
+            print(f"[PY DEBUG] index update failed: {e}", file=sys.stderr)
+
+    if opts.export is not None:
+        try:
+            opts.export.write(url, result)
+        except Exception as e:
+            print(f"[PY DEBUG] export failed: {e}", file=sys.stderr)
+
+    if not opts.stream:
+        out = result.to_dict()
+        if job.get("id") is not None:
+            out["id"] = job["id"]
+        write_line(out)
+    return result
+
+
+def parse_job_line(line: str, budget: Optional[float] = None) -> dict:
+    """
+    URL 문자열 또는 {"id": ..., "url": ..., "deadline": 초} JSON → job dict
+    """
+    if line.startswith("{"):
+        job = json.loads(line)
+        return {
+            "id": job.get("id"),
+            "url": job.get("url", ""),
+            "deadline": job.get("deadline", budget),
+        }
+    return {"id": None, "url": line, "deadline": budget}
+
+
+def report_job_error(job: dict, opts: RunOptions, error):
+    # error: 문자열 또는 예외 (BlockedError면 blocked/retryAfter 필드를 같이 씀)
+    print(f"[PY DEBUG] worker job failed: {error}", file=sys.stderr)
+    err = {"url": job.get("url", ""), "error": str(error)}
+    if isinstance(error, BlockedError):
+        err.update(error.to_dict())
+    if job.get("id") is not None:
+        err["id"] = job["id"]
+    write_line({"event": "error", **err} if opts.stream else err)
+
+
+def read_jobs(opts: RunOptions, source: Optional[Iterable[str]] = None) -> Iterable[dict]:
+    for line in source if source is not None else sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            job = parse_job_line(line, opts.budget)
+        except Exception as e:
+            metrics.ERRORS.inc(site="unknown", type="BadJobLine")
+            write_line({"event": "error", "data": {"error": f"Bad job line: {e}"}})
+            continue
+        if opts.checkpoint is None or not skip_checkpointed(job, opts):
+            yield job
+
+
+def skip_checkpointed(job: dict, opts: RunOptions) -> bool:
+    """
+    체크포인트에 이미 끝났거나 시도 횟수를 다 쓴 URL → 저장된 결과/오류를 출력하고 건너뜀
+    """
+    state, saved = opts.checkpoint.check(job["url"])
+    if state == "run":
+        return False
+
+    tag = {"url": job["url"]}
+    if job.get("id") is not None:
+        tag["id"] = job["id"]
+    if state == "done":
+        print(f"[PY DEBUG] checkpoint: already done {job['url']}", file=sys.stderr)
+        if opts.stream:
+            write_line({"event": "done", **tag, "resumed": True, "data": saved})
+        else:
+            out = {**saved, "resumed": True}
+            if job.get("id") is not None:
+                out["id"] = job["id"]
+            write_line(out)
+    else:
+        print(f"[PY DEBUG] checkpoint: giving up on {job['url']} after {saved['attempts']} attempts", file=sys.stderr)
+        report_job_error(job, opts, f"gave up after {saved['attempts']} attempts: {saved['error']}")
+    return True
+
+
+def run_checkpointed(driver: WebDriver, job: dict, opts: RunOptions, **kwargs) -> Optional[ProductData]:
+    """
+    run_job + 체크포인트 기록 (시작 → 끝/실패). 체크포인트가 없으면 run_job 그대로
+    """
+    if opts.checkpoint is None:
+        return run_job(driver, job, opts, **kwargs)
+
+    url = job["url"]
+    opts.checkpoint.start(url)
+    try:
+        result = run_job(driver, job, opts, **kwargs)
+    except BlockedError as e:
+        # 사이트가 막은 건 이 URL의 시도로 치지 않음, 없는 상품은 다시 시도하지 않음
+        opts.checkpoint.fail(url, str(e), retry=e.kind != "not_found", refund=e.site_wide)
+        raise
+    except Exception as e:
+        opts.checkpoint.fail(url, str(e))
+        raise
+    if result is None:
+        opts.checkpoint.fail(url, "Unsupported URL", retry=False)
+    else:
+        opts.checkpoint.done(url, result.to_dict())
+    return result
+
+
+def run_worker(driver: WebDriver, opts: RunOptions, source: Optional[Iterable[str]] = None):
+    """
+    stdin(또는 source 줄들)으로 한 줄에 하나씩 작업을 받아 같은 드라이버로 계속 처리
+    (URL 문자열 또는 {"id": ..., "url": ..., "deadline": 초} JSON)
+    tabs > 1 이면 브라우저 하나의 탭 여러 개에 작업을 나눠 로딩을 겹침
+    """
+    if opts.tabs > 1:
+        run_tab_worker(driver, opts, source)
         return
 
-    result = scraper.scrape(url)
-    print(json.dumps(result.to_dict(), ensure_ascii=False))
+    metrics.DRIVER_SLOTS.set(1, state="idle")
+    for job in read_jobs(opts, source):
+        metrics.DRIVER_SLOTS.set(1, state="busy")
+        metrics.DRIVER_SLOTS.set(0, state="idle")
+        try:
+            run_checkpointed(driver, job, opts)
+        except Exception as e:
+            report_job_error(job, opts, e)
+        finally:
+            metrics.DRIVER_SLOTS.set(0, state="busy")
+            metrics.DRIVER_SLOTS.set(1, state="idle")
+
+
+def run_tab_worker(driver: WebDriver, opts: RunOptions, source: Optional[Iterable[str]] = None):
+    # stdin은 블로킹이라 별도 스레드에서 큐로 넘김 (로딩된 탭 처리가 막히지 않게)
+    jobs: "queue.Queue" = queue.Queue()
+
+    def reader():
+        for job in read_jobs(opts, source):
+            jobs.put(job)
+        jobs.put(None)
+
+    threading.Thread(target=reader, daemon=True).start()
+
+    def process(job: dict):
+        if job.get("_error"):
+            metrics.ERRORS.inc(site=site_of(job["url"]) or "unknown", type="TabStart")
+            if opts.checkpoint is not None:
+                opts.checkpoint.start(job["url"])
+                opts.checkpoint.fail(job["url"], job["_error"])
+            report_job_error(job, opts, job["_error"])
+            return
+        try:
+            run_checkpointed(driver, job, opts, deadline=job["_deadline"], navigate=False)
+        except Exception as e:
+            report_job_error(job, opts, e)
+
+    TabPool(driver, opts.tabs).run(jobs, process)
+
+
+def keep_lease(queue_url: str, lease: Lease, stop: threading.Event):
+    """
+    작업하는 동안 lease를 주기적으로 연장 (sqlite 연결은 스레드마다 따로)
+    """
+    job_queue = open_queue(queue_url)
+    try:
+        while not stop.wait(Config.QUEUE_LEASE_SECONDS / 3):
+            if not job_queue.heartbeat(lease, Config.QUEUE_LEASE_SECONDS):
+                print(f"[PY DEBUG] lost lease on job {lease.job_id}", file=sys.stderr)
+                return
+    finally:
+        job_queue.close()
+
+
+def run_queue_worker(driver: WebDriver, opts: RunOptions, queue_url: str, drain: bool = False):
+    """
+    공유 큐에서 lease로 작업을 받아 처리하고 결과를 큐에 돌려줌.
+    프로세스가 죽으면 연장이 끊기므로 lease가 만료된 뒤 다른 워커가 다시 가져감
+    """
+    job_queue = open_queue(queue_url)
+    owner = worker_name()
+    print(f"[PY DEBUG] queue worker {owner} on {queue_url}", file=sys.stderr)
+    try:
+        while True:
+            lease = job_queue.lease(owner, Config.QUEUE_LEASE_SECONDS, Config.SITE_MIN_INTERVAL)
+            if lease is None:
+                counts = job_queue.stats()
+                if drain and not counts["queued"] and not counts["leased"]:
+                    return
+                time.sleep(min(job_queue.next_ready_in(), Config.QUEUE_IDLE_SLEEP))
+                continue
+
+            stop = threading.Event()
+            threading.Thread(target=keep_lease, args=(queue_url, lease, stop), daemon=True).start()
+            job = {"id": lease.job_id, "url": lease.url, "deadline": lease.payload.get("deadline", opts.budget)}
+            try:
+                result = run_job(driver, job, opts)
+                if result is None:
+                    job_queue.fail(lease, "Unsupported URL", retry=False)
+                elif not job_queue.complete(lease, {**result.to_dict(), "sourceUrl": lease.url}):
+                    print(f"[PY DEBUG] job {lease.job_id} was re-leased; result dropped", file=sys.stderr)
+            except BlockedError as e:
+                if e.site_wide:
+                    # 이 사이트 작업은 모든 호스트에서 delay초 동안 안 가져감 (이 작업은 횟수 차감 없이 대기열로)
+                    delay = job_queue.backoff(lease, str(e), Config.BLOCK_BACKOFF_BASE, Config.BLOCK_BACKOFF_MAX)
+                    print(f"[PY DEBUG] {lease.site} {e.kind}; pausing site for {delay:.0f}s", file=sys.stderr)
+                else:
+                    job_queue.fail(lease, str(e), retry=e.kind != "not_found")
+            except Exception as e:
+                metrics.ERRORS.inc(site=lease.site or "unknown", type=type(e).__name__)
+                print(f"[PY DEBUG] queue job {lease.job_id} failed: {e}", file=sys.stderr)
+                job_queue.fail(lease, str(e))
+            finally:
+                stop.set()
+    finally:
+        job_queue.close()
+
+
+def run_queue_workers(opts: RunOptions, queue_url: str, concurrency: int,
+                      profile_root: Optional[str], warm: bool, backend: Optional[str], drain: bool):
+    """
+    이 호스트에서 브라우저 concurrency개를 띄워 각각 큐 워커로 돌림
+    """
+    def work():
+        # 색인 sqlite 연결은 스레드끼리 공유하지 않음, 차단 백오프는 큐(site_slots)가 호스트 전체에 걸쳐 관리
+        local = replace(opts, backoff=None)
+        if opts.index is not None:
+            local = replace(local, index=ProductIndex(opts.index.path))
+        with browser_session(profile_root, warm, backend) as driver:
+            run_queue_worker(driver, local, queue_url, drain)
+
+    threads = [threading.Thread(target=work, name=f"queue-worker-{i}") for i in range(max(1, concurrency))]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+
+def main():
+    args = sys.argv[1:]
+    worker = WORKER_FLAG in args
+    positional = [a for a in args if not a.startswith("--")]
+
+    budget = flag_value(args, DEADLINE_FLAG)
+    history_dir = flag_value(args, HISTORY_FLAG)
+    images_dir = flag_value(args, IMAGES_FLAG)
+    index_path = flag_value(args, INDEX_FLAG)
+    changes_path = flag_value(args, CHANGES_FLAG)
+    export_dir = flag_value(args, EXPORT_FLAG)
+    batch_path = flag_value(args, BATCH_FLAG)
+    checkpoint_path = flag_value(args, CHECKPOINT_FLAG) or (f"{batch_path}.ckpt" if batch_path else None)
+    stats_path = flag_value(args, SELECTOR_STATS_FLAG)
+    opts = RunOptions(
+        stream=STREAM_FLAG in args,
+        budget=float(budget) if budget else None,
+        history=HistoryStore(history_dir) if history_dir else None,
+        tabs=int(flag_value(args, TABS_FLAG) or 1),
+        metrics_file=flag_value(args, METRICS_FILE_FLAG),
+        selector_stats=SelectorStats(stats_path) if stats_path else None,
+        images=ImageCache(images_dir) if images_dir else None,
+        index=ProductIndex(index_path) if index_path else None,
+        changes=ChangeCache(changes_path) if changes_path else None,
+        export=ExportSink(
+            export_dir,
+            flag_value(args, EXPORT_FORMAT_FLAG) or "parquet",
+            int(flag_value(args, EXPORT_WINDOW_FLAG) or 3600),
+        ) if export_dir else None,
+        checkpoint=Checkpoint(checkpoint_path) if checkpoint_path else None,
+    )
+
+    profile_root = flag_value(args, PROFILE_FLAG)
+    warm = PREWARM_FLAG in args
+    backend = flag_value(args, DRIVER_FLAG)
+
+    metrics_port = flag_value(args, METRICS_PORT_FLAG)
+    if metrics_port:
+        metrics.REGISTRY.serve(int(metrics_port))
+
+    queue_url = flag_value(args, QUEUE_FLAG)
+    try:
+        if queue_url:
+            concurrency = int(flag_value(args, CONCURRENCY_FLAG) or 1)
+            run_queue_workers(opts, queue_url, concurrency, profile_root, warm, backend, DRAIN_FLAG in args)
+            return
+
+        if worker or batch_path:
+            source = open(batch_path, encoding="utf-8") if batch_path else None
+            try:
+                with browser_session(profile_root, warm, backend) as driver:
+                    run_worker(driver, opts, source)
+            finally:
+                if source is not None:
+                    source.close()
+            if opts.checkpoint is not None:
+                print(f"[PY DEBUG] checkpoint {checkpoint_path}: {opts.checkpoint.stats()}", file=sys.stderr)
+            return
 
-    driver.quit()
+        url = positional[0] if positional else input("URL: ")
+
+        if not create_scraper(url, None):
+            print(json.dumps({"error": "Unsupported URL"}, ensure_ascii=False))
+            return
+
+        with browser_session(profile_root, warm, backend) as driver:
+            try:
+                run_job(driver, {"id": None, "url": url}, opts)
+            except BlockedError as e:
+                # 정상 종료 + blocked 필드 → 서버가 503 + Retry-After로 돌려주고 그 사이트를 쉼
+                report_job_error({"url": url}, opts, e)
+    finally:
+        if opts.export is not None:
+            # parquet / arrow는 닫아야 footer가 써져서 읽을 수 있음
+            opts.export.close()
+        if opts.checkpoint is not None:
+            opts.checkpoint.close()
 
 
 if __name__ == "__main__":
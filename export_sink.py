@@ -0,0 +1,208 @@
+import io
+import os
+import sys
+import csv
+import time
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from price_history import product_key
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:   # pyarrow 없으면 CSV로만 내보냄
+    pa = pq = None
+
+# ==========================================
+# COLUMNAR EXPORT SINK
+# ==========================================
+# 배치 / 큐 워커 결과를 분석용 파일로 바로 흘려보낸다 (to_dict JSON 줄을 다시 파싱할 필요 없음).
+#
+#   한 행 = 상품 옵션 하나 (색상×사이즈 조합 → 없으면 사이즈/색상 하나씩 → 옵션이 없으면 상품 한 행)
+#   열    = ts, site, product, url, title, price, color, size, sold_out, incomplete
+#
+# 행은 열 단위 버퍼에 모으다가 row_group_rows개가 차면 row group 하나로 기록한다 (메모리 = 버퍼 크기).
+# 파일은 시간 창(window 초)마다 새로 연다:  <root>/<prefix>-20250101T1300.<ext>
+# 같은 창 파일이 이미 있으면 CSV는 이어 쓰고, parquet / arrow는 -1, -2 ... 조각 파일을 새로 만든다.
+# parquet / arrow 파일은 닫혀야(창이 바뀌거나 close) 읽을 수 있다.
+
+FORMATS = ("parquet", "arrow", "csv")
+EXTENSIONS = {"parquet": "parquet", "arrow": "arrow", "csv": "csv"}
+COLUMNS = ["ts", "site", "product", "url", "title", "price", "color", "size", "sold_out", "incomplete"]
+DEFAULT_ROW_GROUP = 10000
+DEFAULT_WINDOW = 3600
+
+
+def _schema():
+    return pa.schema([
+        ("ts", pa.timestamp("s", tz="UTC")),
+        ("site", pa.string()),
+        ("product", pa.string()),
+        ("url", pa.string()),
+        ("title", pa.string()),
+        ("price", pa.int64()),
+        ("color", pa.string()),
+        ("size", pa.string()),
+        ("sold_out", pa.bool_()),
+        ("incomplete", pa.string()),
+    ])
+
+
+def option_rows(url: str, result: Any, ts: int) -> Iterator[Tuple]:
+    """
+    ProductData → 옵션별 행 (COLUMNS 순서)
+    """
+    key = product_key(url, result.site)
+    try:
+        price = int(result.price or 0)
+    except (TypeError, ValueError):
+        price = 0
+    head = (ts, result.site, key, url, result.title, price)
+    tail = (",".join(result.incomplete),)
+
+    combos = result.combinations
+    if combos:
+        for c in combos:
+            yield head + (c["color"], c["size"], bool(c["isSoldOut"])) + tail
+        return
+
+    options = [("", s.get("name", ""), s) for s in result.sizes]
+    options += [(c.get("name", ""), "", c) for c in result.colors]
+    if not options:
+        yield head + ("", "", False) + tail
+        return
+    for color, size, option in options:
+        yield head + (color, size, bool(option.get("isSoldOut"))) + tail
+
+
+class ExportSink:
+    def __init__(self, root: str = "exports", fmt: str = "parquet", window: int = DEFAULT_WINDOW,
+                 row_group_rows: int = DEFAULT_ROW_GROUP, prefix: str = "crawl"):
+        if fmt not in FORMATS:
+            raise ValueError(f"unknown export format: {fmt} (one of {', '.join(FORMATS)})")
+        if fmt != "csv" and pa is None:
+            print(f"[PY DEBUG] pyarrow not installed → exporting csv instead of {fmt}", file=sys.stderr)
+            fmt = "csv"
+
+        self.root = root
+        self.fmt = fmt
+        self.window = max(1, int(window))
+        self.row_group_rows = max(1, int(row_group_rows))
+        self.prefix = prefix
+        self.columns: Dict[str, List] = {name: [] for name in COLUMNS}
+        self.rows = 0
+        self.path: Optional[str] = None
+        self._window_start: Optional[int] = None
+        self._writer = None
+        # 큐 워커는 스레드 여러 개가 싱크 하나를 같이 씀
+        self.lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+
+    def write(self, url: str, result: Any, ts: Optional[float] = None):
+        ts = int(ts if ts is not None else time.time())
+        with self.lock:
+            start = ts - ts % self.window
+            if start != self._window_start:
+                self._rotate(start)
+            for row in option_rows(url, result, ts):
+                for name, value in zip(COLUMNS, row):
+                    self.columns[name].append(value)
+                self.rows += 1
+                if self.rows >= self.row_group_rows:
+                    self._flush()
+
+    def flush(self):
+        with self.lock:
+            self._flush()
+
+    def close(self):
+        with self.lock:
+            self._flush()
+            self._close_writer()
+            self._window_start = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # --------------------------------------------------
+    # 파일 / row group
+    # --------------------------------------------------
+    def _rotate(self, start: int):
+        self._flush()
+        self._close_writer()
+        self._window_start = start
+        stamp = time.strftime("%Y%m%dT%H%M", time.gmtime(start))
+        base = os.path.join(self.root, f"{self.prefix}-{stamp}")
+        ext = EXTENSIONS[self.fmt]
+
+        path = f"{base}.{ext}"
+        if self.fmt != "csv":
+            # 닫힌 parquet / arrow 파일에는 이어 쓸 수 없음 → 조각 파일.
+            # 이름은 지금 O_EXCL로 만들어 선점 (같은 창의 다른 프로세스/호스트가 같은 이름을 골라 덮어쓰지 않게)
+            part = 0
+            while True:
+                try:
+                    os.close(os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644))
+                    break
+                except FileExistsError:
+                    part += 1
+                    path = f"{base}-{part}.{ext}"
+        self.path = path
+
+    def _open_writer(self):
+        if self.fmt == "csv":
+            # 헤더만 든 임시 파일을 link로 붙여서 "파일 생성 + 헤더"를 한 번에 (이미 있으면 다른 프로세스가 만든 것)
+            if not os.path.exists(self.path):
+                tmp = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                with open(tmp, "wb") as f:
+                    f.write((",".join(COLUMNS) + "\r\n").encode("utf-8"))
+                try:
+                    os.link(tmp, self.path)
+                except FileExistsError:
+                    pass
+                finally:
+                    os.remove(tmp)
+            # O_APPEND + row group 단위 write 한 번 → 여러 프로세스가 같은 파일에 붙여도 행이 섞이지 않음
+            self._writer = os.open(self.path, os.O_WRONLY | os.O_APPEND, 0o644)
+        elif self.fmt == "parquet":
+            self._writer = pq.ParquetWriter(self.path, _schema(), compression="zstd")
+        else:
+            self._writer = pa.ipc.new_file(self.path, _schema())
+        print(f"[PY DEBUG] export → {self.path}", file=sys.stderr)
+
+    def _flush(self):
+        if not self.rows:
+            return
+        if self._writer is None:
+            self._open_writer()
+
+        if self.fmt == "csv":
+            buf = io.StringIO()
+            csv.writer(buf).writerows(zip(*(self.columns[name] for name in COLUMNS)))
+            os.write(self._writer, buf.getvalue().encode("utf-8"))
+        else:
+            batch = pa.record_batch([self.columns[name] for name in COLUMNS], schema=_schema())
+            if self.fmt == "parquet":
+                self._writer.write_table(pa.Table.from_batches([batch]))   # 한 번 = row group 하나
+            else:
+                self._writer.write_batch(batch)
+
+        for values in self.columns.values():
+            values.clear()
+        self.rows = 0
+
+    def _close_writer(self):
+        if self._writer is None:
+            if self.fmt != "csv" and self.path and os.path.exists(self.path) and not os.path.getsize(self.path):
+                # 선점만 하고 한 행도 안 쓴 조각 파일 (빈 파일은 parquet/arrow로 읽히지 않음)
+                os.remove(self.path)
+            return
+        if self.fmt == "csv":
+            os.close(self._writer)
+        else:
+            self._writer.close()
+        self._writer = None
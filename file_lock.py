@@ -0,0 +1,36 @@
+import os
+from contextlib import contextmanager
+
+# ==========================================
+# FILE LOCK (프로세스 간 배타 락)
+# ==========================================
+# 같은 파일을 여러 프로세스(server.js가 띄우는 크롤러, --worker, 큐 워커)가 읽고-고치고-쓰는 구간을 묶는다.
+# 락은 데이터 파일이 아니라 옆의 잠금 파일에 건다 (데이터 파일은 os.replace로 바뀔 수 있으므로).
+#
+#   with file_lock("selector_stats.json.lock"):
+#       ...
+
+
+@contextmanager
+def file_lock(path: str):
+    """
+    path 파일에 배타 락. 다른 프로세스가 잡고 있으면 풀릴 때까지 기다림
+    """
+    with open(path, "a+") as f:
+        if os.name == "nt":
+            import msvcrt
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if os.name == "nt":
+                import msvcrt
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                import fcntl
+                fcntl.flock(f, fcntl.LOCK_UN)
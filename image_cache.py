@@ -0,0 +1,281 @@
+import os
+import sys
+import time
+import hashlib
+from io import BytesIO
+from typing import Dict, List, Optional, Tuple
+
+import requests
+
+try:
+    from PIL import Image
+except ImportError:   # Pillow 없으면 원본만 저장 (썸네일 없이)
+    Image = None
+
+# ==========================================
+# PRODUCT IMAGE CACHE
+# ==========================================
+# 상품 이미지를 한 번만 내려받아 썸네일(JPEG + WebP)을 만들고 로컬에서 서빙한다.
+#
+#   root/urls/<sha1(url)>              → 그 URL 이미지의 내용 해시 (한 줄)
+#   root/objects/<h[:2]>/<h>.<ext>     → 원본 (내용 해시 = 파일 이름)
+#   root/thumbs/<h[:2]>/<h>-<w>.jpg    → 가로 w 썸네일
+#   root/thumbs/<h[:2]>/<h>-<w>.webp
+#
+# 내용 주소 방식이라 같은 이미지를 여러 URL이 가리켜도 한 벌만 저장되고,
+# 파일이 절대 바뀌지 않으므로 서버에서 immutable 캐시 헤더를 붙일 수 있다.
+# 전체 용량이 max_bytes를 넘으면 오래 안 쓴(mtime) 이미지부터 통째로 지운다.
+# 용량은 새로 받을 때마다 더해 가는 추정치로 보고, 넘었을 때만 폴더를 훑는다
+# (다른 프로세스가 넣은 몫은 RESCAN_EVERY번 저장마다 다시 세어서 맞춤).
+
+THUMB_WIDTHS = (160, 320)
+DEFAULT_MAX_BYTES = 500 * 1024 * 1024
+MAX_DOWNLOAD_BYTES = 15 * 1024 * 1024
+JPEG_QUALITY = 82
+WEBP_QUALITY = 80
+RESCAN_EVERY = 200
+
+_EXTENSIONS = {
+    "image/jpeg": "jpg",
+    "image/png": "png",
+    "image/webp": "webp",
+    "image/gif": "gif",
+    "image/avif": "avif",
+}
+_USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36"
+)
+
+
+def _write_atomic(path: str, data: bytes):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+class ImageCache:
+    def __init__(self, root: str = "image_cache", url_prefix: str = "/images",
+                 max_bytes: int = DEFAULT_MAX_BYTES, widths: Tuple[int, ...] = THUMB_WIDTHS):
+        self.root = root
+        self.url_prefix = url_prefix.rstrip("/")
+        self.max_bytes = max_bytes
+        self.widths = widths
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = _USER_AGENT
+        if Image is None:
+            print("[PY DEBUG] Pillow not installed → storing originals only", file=sys.stderr)
+        # 캐시 전체 바이트 추정치 (처음 정리 확인 때 한 번 세고, 이후 새 이미지만큼 더함)
+        self._bytes: Optional[int] = None
+        self._stores = 0
+
+    # --------------------------------------------------
+    # 경로
+    # --------------------------------------------------
+    def _url_path(self, url: str) -> str:
+        return os.path.join(self.root, "urls", hashlib.sha1(url.encode("utf-8")).hexdigest())
+
+    def _object_path(self, digest: str, ext: str) -> str:
+        return os.path.join(self.root, "objects", digest[:2], f"{digest}.{ext}")
+
+    def _thumb_path(self, digest: str, width: int, ext: str) -> str:
+        return os.path.join(self.root, "thumbs", digest[:2], f"{digest}-{width}.{ext}")
+
+    def _public(self, path: str) -> str:
+        rel = os.path.relpath(path, self.root).replace(os.sep, "/")
+        return f"{self.url_prefix}/{rel}"
+
+    # --------------------------------------------------
+    # 저장
+    # --------------------------------------------------
+    def store(self, url: str, referer: str = "", timeout: float = 10) -> Optional[dict]:
+        """
+        url 이미지를 캐시에 넣고 로컬 URL들을 반환. 실패하면 None
+        {"original": "/images/objects/..", "thumbnail": "/images/thumbs/..-320.webp",
+         "thumbs": {"160": {"jpeg": .., "webp": ..}, "320": {...}}}
+        """
+        if not url or not url.startswith("http"):
+            return None
+
+        entry = self._lookup(url)
+        if entry is None:
+            try:
+                entry = self._download(url, referer, timeout)
+            except Exception as e:
+                print(f"[PY DEBUG] image cache failed for {url}: {e}", file=sys.stderr)
+                return None
+            self._added(*entry)
+            self.evict(keep=entry[0])
+
+        digest, ext = entry
+        return self._describe(digest, ext)
+
+    def _lookup(self, url: str) -> Optional[Tuple[str, str]]:
+        try:
+            with open(self._url_path(url), encoding="utf-8") as f:
+                digest, ext = f.read().split()
+        except (OSError, ValueError):
+            return None
+
+        original = self._object_path(digest, ext)
+        if not os.path.exists(original):
+            return None   # 용량 정리로 지워짐 → 다시 받기
+        self._touch(digest, ext)
+        return digest, ext
+
+    def _download(self, url: str, referer: str, timeout: float) -> Tuple[str, str]:
+        headers = {"Referer": referer} if referer else {}
+        res = self.session.get(url, headers=headers, timeout=timeout, stream=True)
+        res.raise_for_status()
+
+        chunks, size = [], 0
+        for chunk in res.iter_content(64 * 1024):
+            size += len(chunk)
+            if size > MAX_DOWNLOAD_BYTES:
+                raise ValueError(f"image larger than {MAX_DOWNLOAD_BYTES} bytes")
+            chunks.append(chunk)
+        body = b"".join(chunks)
+
+        content_type = res.headers.get("Content-Type", "").split(";")[0].strip().lower()
+        ext = _EXTENSIONS.get(content_type) or os.path.splitext(url.split("?")[0])[1].lstrip(".").lower() or "img"
+        digest = hashlib.sha256(body).hexdigest()
+
+        original = self._object_path(digest, ext)
+        if not os.path.exists(original):
+            _write_atomic(original, body)
+            self._make_thumbs(digest, body)
+        _write_atomic(self._url_path(url), f"{digest} {ext}".encode("utf-8"))
+        print(f"[PY DEBUG] image cached {digest[:12]} ({size} bytes)", file=sys.stderr)
+        return digest, ext
+
+    def _make_thumbs(self, digest: str, body: bytes):
+        if Image is None:
+            return
+        try:
+            img = Image.open(BytesIO(body))
+            img.load()
+        except Exception as e:
+            print(f"[PY DEBUG] thumbnail decode failed: {e}", file=sys.stderr)
+            return
+
+        if img.mode not in ("RGB", "L"):
+            # 투명 배경(PNG 등)은 흰 바탕으로 합성
+            rgba = img.convert("RGBA")
+            img = Image.new("RGB", rgba.size, (255, 255, 255))
+            img.paste(rgba, mask=rgba.split()[-1])
+
+        for width in self.widths:
+            thumb = img.copy()
+            thumb.thumbnail((width, width * 4))
+            for ext, kwargs in (("jpg", {"format": "JPEG", "quality": JPEG_QUALITY, "optimize": True}),
+                                ("webp", {"format": "WEBP", "quality": WEBP_QUALITY, "method": 4})):
+                buf = BytesIO()
+                try:
+                    thumb.save(buf, **kwargs)
+                except Exception as e:   # WebP 인코더 없이 빌드된 Pillow 등
+                    print(f"[PY DEBUG] thumbnail {ext} failed: {e}", file=sys.stderr)
+                    continue
+                _write_atomic(self._thumb_path(digest, width, ext), buf.getvalue())
+
+    def _files(self, digest: str, ext: str) -> List[str]:
+        paths = [self._object_path(digest, ext)]
+        for width in self.widths:
+            paths += [self._thumb_path(digest, width, "jpg"), self._thumb_path(digest, width, "webp")]
+        return paths
+
+    def _touch(self, digest: str, ext: str):
+        # mtime = 마지막 사용 시각 (정리할 때 오래된 것부터)
+        now = time.time()
+        for path in self._files(digest, ext):
+            try:
+                os.utime(path, (now, now))
+            except OSError:
+                pass
+
+    def _describe(self, digest: str, ext: str) -> dict:
+        thumbs: Dict[str, Dict[str, str]] = {}
+        for width in self.widths:
+            formats = {}
+            for fmt, fext in (("jpeg", "jpg"), ("webp", "webp")):
+                path = self._thumb_path(digest, width, fext)
+                if os.path.exists(path):
+                    formats[fmt] = self._public(path)
+            if formats:
+                thumbs[str(width)] = formats
+
+        original = self._public(self._object_path(digest, ext))
+        largest = thumbs.get(str(max(self.widths)), {}) if self.widths else {}
+        return {
+            "original": original,
+            "thumbnail": largest.get("webp") or largest.get("jpeg") or original,
+            "thumbs": thumbs,
+        }
+
+    # --------------------------------------------------
+    # 용량 정리
+    # --------------------------------------------------
+    def usage(self) -> Tuple[int, Dict[str, Tuple[float, int]]]:
+        """
+        (전체 바이트, {digest: (마지막 사용 시각, 바이트)})
+        """
+        groups: Dict[str, Tuple[float, int]] = {}
+        total = 0
+        for sub in ("objects", "thumbs"):
+            for dirpath, _, filenames in os.walk(os.path.join(self.root, sub)):
+                for name in filenames:
+                    try:
+                        st = os.stat(os.path.join(dirpath, name))
+                    except OSError:
+                        continue
+                    digest = name.split(".")[0].split("-")[0]
+                    used, size = groups.get(digest, (0.0, 0))
+                    groups[digest] = (max(used, st.st_mtime), size + st.st_size)
+                    total += st.st_size
+        return total, groups
+
+    def _added(self, digest: str, ext: str):
+        if self._bytes is not None:
+            self._bytes += sum(os.path.getsize(p) for p in self._files(digest, ext) if os.path.exists(p))
+        self._stores += 1
+
+    def evict(self, keep: str = "") -> int:
+        """
+        max_bytes를 넘으면 90%까지 오래된 이미지부터 삭제. 지운 이미지 수 반환
+        keep: 방금 넣은 이미지 (돌려줄 URL이 바로 깨지지 않게 남김)
+        (urls/ 항목은 남겨두고, 조회할 때 원본이 없으면 다시 받음)
+        추정치가 상한 아래면 폴더를 훑지 않고 바로 끝남
+        """
+        if self._bytes is None or self._stores >= RESCAN_EVERY:
+            self._bytes = self.usage()[0]
+            self._stores = 0
+        if self._bytes <= self.max_bytes:
+            return 0
+
+        total, groups = self.usage()
+        if total <= self.max_bytes:
+            self._bytes = total
+            return 0
+
+        target = self.max_bytes * 0.9
+        removed = 0
+        for digest, (_, size) in sorted(groups.items(), key=lambda kv: kv[1][0]):
+            if total <= target:
+                break
+            if digest == keep:
+                continue
+            for sub in ("objects", "thumbs"):
+                folder = os.path.join(self.root, sub, digest[:2])
+                for name in os.listdir(folder) if os.path.isdir(folder) else []:
+                    if name.startswith(digest):
+                        try:
+                            os.remove(os.path.join(folder, name))
+                        except OSError:
+                            pass
+            total -= size
+            removed += 1
+
+        self._bytes = total
+        print(f"[PY DEBUG] image cache evicted {removed} images", file=sys.stderr)
+        return removed
@@ -0,0 +1,366 @@
+import os
+import re
+import sys
+import json
+import time
+import uuid
+import socket
+import sqlite3
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional
+
+# ==========================================
+# SHARED JOB QUEUE
+# ==========================================
+# 여러 크롤러 호스트가 하나의 큐에서 작업을 나눠 가져가는 모드.
+#
+#   - lease: 작업을 가져간 워커는 lease_seconds 안에 끝내거나 heartbeat로 연장해야 함.
+#            워커가 죽어서 연장이 끊기면 만료 후 다른 워커가 다시 가져감 (attempts 증가)
+#   - 사이트별 속도 제한: "이 사이트 다음 요청 가능 시각"을 큐 안에 같이 저장해서
+#            호스트가 몇 대든 전체 합이 제한을 넘지 않게 함
+#   - 차단 백오프: 캡차/차단 페이지를 만나면 같은 시각을 뒤로 미뤄 모든 호스트가 그 사이트를 쉼
+#            (막힐 때마다 두 배, 한 번 성공하면 초기화)
+#
+# 백엔드는 open_queue("sqlite:///jobs.db") 처럼 URL로 고른다.
+# SQLite는 한 대(또는 공유 디스크)에서 쓰는 로컬 대역. 다른 백엔드는 register_backend로 추가.
+#
+#   python job_queue.py put sqlite:///jobs.db URL [URL ...]
+#   python job_queue.py stats sqlite:///jobs.db
+#   python job_queue.py results sqlite:///jobs.db [since_id]
+
+DEFAULT_LEASE_SECONDS = 120
+DEFAULT_MAX_ATTEMPTS = 3
+
+QUEUED, LEASED, DONE, FAILED = "queued", "leased", "done", "failed"
+
+
+def site_of(url: str) -> str:
+    if "musinsa.com" in url:
+        return "musinsa"
+    if "naver" in url or "smartstore" in url:
+        return "naver"
+    return ""
+
+
+def worker_name() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+
+@dataclass
+class Lease:
+    job_id: int
+    url: str
+    site: str
+    payload: dict
+    attempts: int
+    owner: str
+    expires_at: float
+
+
+class JobQueue(ABC):
+    """
+    백엔드 공통 인터페이스
+    """
+    @abstractmethod
+    def put(self, jobs: Iterable[dict], priority: int = 0) -> List[int]:
+        """jobs: {"url": ..., "deadline": 초, ...} → job id 목록"""
+
+    @abstractmethod
+    def lease(self, owner: str, lease_seconds: float = DEFAULT_LEASE_SECONDS,
+              rate_limits: Optional[Dict[str, float]] = None) -> Optional[Lease]:
+        """
+        실행 가능한 작업 하나를 owner에게 빌려줌. 없으면 None
+        rate_limits: {site: 최소 간격(초)} — 간격이 안 된 사이트(또는 백오프 중인 사이트) 작업은 건너뜀
+        """
+
+    @abstractmethod
+    def heartbeat(self, lease: Lease, lease_seconds: float = DEFAULT_LEASE_SECONDS) -> bool:
+        """lease 연장. 이미 다른 워커에게 넘어갔으면 False"""
+
+    @abstractmethod
+    def complete(self, lease: Lease, result: dict) -> bool:
+        """결과 저장. 내 lease가 아니게 됐으면 False (결과 버림)"""
+
+    @abstractmethod
+    def fail(self, lease: Lease, error: str, retry: bool = True) -> bool:
+        """실패 기록. retry면 다시 대기열로 (max_attempts까지)"""
+
+    def backoff(self, lease: Lease, error: str, base: float, cap: float) -> float:
+        """
+        사이트가 막음 → 그 사이트 작업을 모든 워커가 잠시 안 가져가게 하고,
+        이 작업은 시도 횟수를 돌려준 채 다시 대기열로. 쉬는 시간(초)을 돌려줌
+        백엔드가 지원하지 않으면 일반 실패로 처리
+        """
+        self.fail(lease, error)
+        return 0.0
+
+    @abstractmethod
+    def results(self, since_id: int = 0, limit: int = 100) -> List[dict]:
+        """끝난 작업(done/failed)을 id 순서로"""
+
+    @abstractmethod
+    def stats(self) -> Dict[str, int]:
+        """상태별 작업 수"""
+
+    def next_ready_in(self) -> float:
+        """다음 작업이 실행 가능해질 때까지 대략 몇 초 (대기 간격 힌트)"""
+        return 1.0
+
+    def close(self):
+        pass
+
+
+_BACKENDS: Dict[str, Callable[[str], JobQueue]] = {}
+
+
+def register_backend(scheme: str, factory: Callable[[str], JobQueue]):
+    _BACKENDS[scheme] = factory
+
+
+def open_queue(url: str) -> JobQueue:
+    """
+    "sqlite:///jobs.db", "sqlite:////abs/path/jobs.db", 또는 그냥 파일 경로
+    """
+    m = re.match(r"^(\w+)://(.*)$", url)
+    scheme, rest = (m.group(1), m.group(2)) if m else ("sqlite", url)
+    factory = _BACKENDS.get(scheme)
+    if factory is None:
+        raise ValueError(f"unknown job queue backend: {scheme}")
+    return factory(rest)
+
+
+# ==========================================
+# SQLITE BACKEND
+# ==========================================
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id           INTEGER PRIMARY KEY AUTOINCREMENT,
+    url          TEXT NOT NULL,
+    site         TEXT NOT NULL,
+    payload      TEXT NOT NULL,
+    priority     INTEGER NOT NULL DEFAULT 0,
+    state        TEXT NOT NULL,
+    attempts     INTEGER NOT NULL DEFAULT 0,
+    owner        TEXT,
+    lease_until  REAL,
+    result       TEXT,
+    error        TEXT,
+    created_at   REAL NOT NULL,
+    finished_at  REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_ready ON jobs(state, priority, id);
+CREATE TABLE IF NOT EXISTS site_slots (
+    site     TEXT PRIMARY KEY,
+    next_at  REAL NOT NULL,
+    strikes  INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+
+class SQLiteJobQueue(JobQueue):
+    def __init__(self, path: str, max_attempts: int = DEFAULT_MAX_ATTEMPTS):
+        self.path = path
+        self.max_attempts = max_attempts
+        # isolation_level=None → BEGIN IMMEDIATE로 직접 트랜잭션 관리 (다른 프로세스와 경합)
+        self.db = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.executescript(_SCHEMA)
+        # 백오프 전에 만든 큐 파일 (워커 여러 개가 동시에 열면 한 쪽만 추가하고 나머지는 이미 있음)
+        with self._tx():
+            if "strikes" not in {r["name"] for r in self.db.execute("PRAGMA table_info(site_slots)")}:
+                try:
+                    self.db.execute("ALTER TABLE site_slots ADD COLUMN strikes INTEGER NOT NULL DEFAULT 0")
+                except sqlite3.OperationalError as e:
+                    if "duplicate column" not in str(e):
+                        raise
+
+    def _tx(self):
+        return _Transaction(self.db)
+
+    def put(self, jobs: Iterable[dict], priority: int = 0) -> List[int]:
+        now = time.time()
+        ids = []
+        with self._tx():
+            for job in jobs:
+                url = job["url"]
+                cur = self.db.execute(
+                    "INSERT INTO jobs (url, site, payload, priority, state, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                    (url, job.get("site") or site_of(url), json.dumps(job, ensure_ascii=False), priority, QUEUED, now),
+                )
+                ids.append(cur.lastrowid)
+        return ids
+
+    def lease(self, owner: str, lease_seconds: float = DEFAULT_LEASE_SECONDS,
+              rate_limits: Optional[Dict[str, float]] = None) -> Optional[Lease]:
+        rate_limits = rate_limits or {}
+        now = time.time()
+        with self._tx():
+            # 만료된 lease → 다시 대기열로 (시도 횟수를 다 쓴 작업은 실패 처리)
+            self.db.execute(
+                "UPDATE jobs SET state = ?, owner = NULL, error = 'lease expired', finished_at = ? "
+                "WHERE state = ? AND lease_until < ? AND attempts >= ?",
+                (FAILED, now, LEASED, now, self.max_attempts),
+            )
+            self.db.execute(
+                "UPDATE jobs SET state = ?, owner = NULL WHERE state = ? AND lease_until < ?",
+                (QUEUED, LEASED, now),
+            )
+
+            busy = {row["site"] for row in self.db.execute("SELECT site FROM site_slots WHERE next_at > ?", (now,))}
+            placeholders = ",".join("?" * len(busy))
+            sql = "SELECT * FROM jobs WHERE state = ?"
+            if busy:
+                sql += f" AND site NOT IN ({placeholders})"
+            sql += " ORDER BY priority DESC, id LIMIT 1"
+            row = self.db.execute(sql, (QUEUED, *busy)).fetchone()
+            if row is None:
+                return None
+
+            expires = now + lease_seconds
+            self.db.execute(
+                "UPDATE jobs SET state = ?, owner = ?, lease_until = ?, attempts = attempts + 1 WHERE id = ?",
+                (LEASED, owner, expires, row["id"]),
+            )
+            interval = rate_limits.get(row["site"])
+            if interval:
+                self.db.execute(
+                    "INSERT INTO site_slots (site, next_at) VALUES (?, ?) "
+                    "ON CONFLICT(site) DO UPDATE SET next_at = excluded.next_at",
+                    (row["site"], now + interval),
+                )
+
+        return Lease(
+            job_id=row["id"], url=row["url"], site=row["site"], payload=json.loads(row["payload"]),
+            attempts=row["attempts"] + 1, owner=owner, expires_at=expires,
+        )
+
+    def heartbeat(self, lease: Lease, lease_seconds: float = DEFAULT_LEASE_SECONDS) -> bool:
+        expires = time.time() + lease_seconds
+        with self._tx():
+            cur = self.db.execute(
+                "UPDATE jobs SET lease_until = ? WHERE id = ? AND owner = ? AND state = ?",
+                (expires, lease.job_id, lease.owner, LEASED),
+            )
+        if cur.rowcount:
+            lease.expires_at = expires
+        return bool(cur.rowcount)
+
+    def complete(self, lease: Lease, result: dict) -> bool:
+        with self._tx():
+            cur = self.db.execute(
+                "UPDATE jobs SET state = ?, result = ?, error = NULL, owner = NULL, finished_at = ? "
+                "WHERE id = ? AND owner = ? AND state = ?",
+                (DONE, json.dumps(result, ensure_ascii=False), time.time(), lease.job_id, lease.owner, LEASED),
+            )
+            self.db.execute("UPDATE site_slots SET strikes = 0 WHERE site = ? AND strikes > 0", (lease.site,))
+        return bool(cur.rowcount)
+
+    def fail(self, lease: Lease, error: str, retry: bool = True) -> bool:
+        final = not retry or lease.attempts >= self.max_attempts
+        with self._tx():
+            cur = self.db.execute(
+                "UPDATE jobs SET state = ?, error = ?, owner = NULL, finished_at = ? "
+                "WHERE id = ? AND owner = ? AND state = ?",
+                (FAILED if final else QUEUED, error, time.time() if final else None,
+                 lease.job_id, lease.owner, LEASED),
+            )
+        return bool(cur.rowcount)
+
+    def backoff(self, lease: Lease, error: str, base: float, cap: float) -> float:
+        now = time.time()
+        with self._tx():
+            row = self.db.execute("SELECT next_at, strikes FROM site_slots WHERE site = ?", (lease.site,)).fetchone()
+            if row and row["strikes"] and row["next_at"] > now:
+                # 다른 워커가 이미 쉬게 함 (같이 막힌 작업들이 한꺼번에 두 배씩 올리지 않게)
+                delay = row["next_at"] - now
+            else:
+                strikes = (row["strikes"] if row else 0) + 1
+                delay = min(cap, base * 2 ** (strikes - 1))
+                self.db.execute(
+                    "INSERT INTO site_slots (site, next_at, strikes) VALUES (?, ?, ?) "
+                    "ON CONFLICT(site) DO UPDATE SET next_at = excluded.next_at, strikes = excluded.strikes",
+                    (lease.site, now + delay, strikes),
+                )
+            self.db.execute(
+                "UPDATE jobs SET state = ?, error = ?, owner = NULL, attempts = MAX(attempts - 1, 0) "
+                "WHERE id = ? AND owner = ? AND state = ?",
+                (QUEUED, error, lease.job_id, lease.owner, LEASED),
+            )
+        return delay
+
+    def results(self, since_id: int = 0, limit: int = 100) -> List[dict]:
+        rows = self.db.execute(
+            "SELECT id, url, state, attempts, result, error, finished_at FROM jobs "
+            "WHERE id > ? AND state IN (?, ?) ORDER BY id LIMIT ?",
+            (since_id, DONE, FAILED, limit),
+        )
+        return [
+            {
+                "id": r["id"], "url": r["url"], "state": r["state"], "attempts": r["attempts"],
+                "result": json.loads(r["result"]) if r["result"] else None,
+                "error": r["error"], "finishedAt": r["finished_at"],
+            }
+            for r in rows
+        ]
+
+    def stats(self) -> Dict[str, int]:
+        counts = {QUEUED: 0, LEASED: 0, DONE: 0, FAILED: 0}
+        for r in self.db.execute("SELECT state, COUNT(*) AS n FROM jobs GROUP BY state"):
+            counts[r["state"]] = r["n"]
+        return counts
+
+    def next_ready_in(self) -> float:
+        row = self.db.execute("SELECT MIN(next_at) AS t FROM site_slots WHERE next_at > ?", (time.time(),)).fetchone()
+        return max(0.2, (row["t"] - time.time()) if row and row["t"] else 1.0)
+
+    def close(self):
+        self.db.close()
+
+
+class _Transaction:
+    # BEGIN IMMEDIATE: 쓰기 락을 먼저 잡아서 두 워커가 같은 작업을 가져가지 않게 함
+    def __init__(self, db: sqlite3.Connection):
+        self.db = db
+
+    def __enter__(self):
+        self.db.execute("BEGIN IMMEDIATE")
+        return self.db
+
+    def __exit__(self, exc_type, exc, tb):
+        self.db.execute("ROLLBACK" if exc_type else "COMMIT")
+        return False
+
+
+register_backend("sqlite", lambda rest: SQLiteJobQueue(rest[1:] if rest.startswith("/") else rest))
+
+
+# ==========================================
+# CLI
+# ==========================================
+def main():
+    args = sys.argv[1:]
+    if len(args) < 2:
+        print("usage: job_queue.py put|stats|results QUEUE [URL ... | since_id]", file=sys.stderr)
+        sys.exit(2)
+
+    command, queue = args[0], open_queue(args[1])
+    if command == "put":
+        lines = args[2:] or [line.strip() for line in sys.stdin if line.strip()]
+        jobs = [json.loads(line) if line.startswith("{") else {"url": line} for line in lines]
+        print(json.dumps({"queued": queue.put(jobs)}))
+    elif command == "stats":
+        print(json.dumps(queue.stats()))
+    elif command == "results":
+        since = int(args[2]) if len(args) > 2 else 0
+        for r in queue.results(since):
+            print(json.dumps(r, ensure_ascii=False))
+    else:
+        print(f"unknown command: {command}", file=sys.stderr)
+        sys.exit(2)
+
+
+if __name__ == "__main__":
+    sys.stdout.reconfigure(encoding="utf-8")
+    main()
@@ -0,0 +1,319 @@
+import re
+import json
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# ==========================================
+# STREAMING JSON SCAN
+# ==========================================
+# 수 MB짜리 상태 JSON(__NEXT_DATA__, __PRELOADED_STATE__)을 통째로 json.loads 하지 않고
+# 원문 텍스트를 앞에서부터 훑어서 필요한 부분 트리만 dict로 만든다. 찾으면 바로 멈춤.
+#
+#   find_first(text, paths)              : 경로 후보 중 우선순위가 가장 높은 (truthy) 값
+#   find_object_with_keys(text, keys)    : keys 중 하나가 비어 있지 않은 값으로 들어 있는 첫 객체
+#
+# 건너뛸 값은 "중첩 괄호 정규식" 한 번으로 통째로 넘기고(C 안에서, 객체를 만들지 않음)
+# 필요한 부분만 JSONDecoder.raw_decode(C)로 만든다. 그래서 메모리는 찾은 부분 트리 크기만큼만 쓴다.
+# text 중간(start)부터 시작할 수 있어서 HTML 안의 <script> 내용을 잘라내지 않고 바로 읽는다.
+
+_decoder = json.JSONDecoder()
+
+_STRING_RE = r'"[^"\\]*(?:\\.[^"\\]*)*"'
+_WS = re.compile(r"[ \t\n\r]*")
+_STRING = re.compile(_STRING_RE)
+# 괄호 아닌 글자와 문자열을 한 번에 넘김 (문자열 안의 괄호는 세지 않음)
+_NON_BRACKET_RUN = re.compile(rf'(?:[^"\[\]{{}}]+|{_STRING_RE})*')
+_SCALAR = re.compile(rf'{_STRING_RE}|[^,}}\]\s]+')
+_MAX_NEST = 12
+
+
+def _balanced(levels: int) -> Optional["re.Pattern"]:
+    """
+    중첩 levels단까지의 객체/배열 하나에 통째로 맞는 정규식 (C 안에서 한 번에 건너뜀).
+    possessive(*+)가 없는 파이썬(3.11 미만)에서는 되돌아가기가 폭발할 수 있어 쓰지 않음 → None
+    """
+    try:
+        re.compile("a*+")
+    except re.error:
+        return None
+    string = r'"[^"\\]*+(?:\\.[^"\\]*+)*+"'
+    other = r'[^"\[\]{}]*+'
+    body = rf'{other}(?:{string}{other})*+'
+    for _ in range(levels):
+        body = rf'{other}(?:(?:{string}|[\[{{]{body}[\]}}]){other})*+'
+    return re.compile(rf'[\[{{]{body}[\]}}]')
+
+
+_BALANCED = _balanced(_MAX_NEST)
+
+
+class _Found(Exception):
+    # 답이 정해지면 재귀를 한 번에 빠져나옴
+    def __init__(self, value: Any):
+        self.value = value
+
+
+def _ws(text: str, pos: int) -> int:
+    return _WS.match(text, pos).end()
+
+
+def _expect(text: str, pos: int, char: str) -> int:
+    pos = _ws(text, pos)
+    if text[pos:pos + 1] != char:
+        raise ValueError(f"expected {char!r} at {pos}")
+    return pos + 1
+
+
+def skip_value(text: str, pos: int) -> int:
+    """
+    pos(공백 포함)에서 시작하는 값 하나를 만들지 않고 건너뛰어 끝 위치를 돌려줌
+    """
+    pos = _ws(text, pos)
+    c = text[pos:pos + 1]
+    if c not in ("{", "["):
+        m = _SCALAR.match(text, pos)
+        if not m:
+            raise ValueError(f"bad JSON value at {pos}")
+        return m.end()
+
+    if _BALANCED is not None:
+        m = _BALANCED.match(text, pos)
+        if m:
+            return m.end()
+
+    # 중첩이 _MAX_NEST보다 깊음 → 괄호를 직접 세되, 안쪽 컨테이너는 되도록 한 번에 넘김
+    depth = 0
+    end = len(text)
+    while pos < end:
+        c = text[pos]
+        if c in "{[":
+            m = _BALANCED.match(text, pos) if depth and _BALANCED is not None else None
+            if m:
+                pos = _NON_BRACKET_RUN.match(text, m.end()).end()
+                continue
+            depth += 1
+        elif c in "}]":
+            depth -= 1
+            if depth == 0:
+                return pos + 1
+        pos = _NON_BRACKET_RUN.match(text, pos + 1).end()
+    raise ValueError("unterminated JSON container")
+
+
+def _members(text: str, pos: int) -> Iterable[Tuple[int, str, int]]:
+    """
+    pos의 객체에서 (키 위치, 키, 값 시작 위치)를 차례로 내줌.
+    값을 소비하지 않았으면 다음 차례에 skip_value로 넘김 → 호출한 쪽은 값을 건너뛸 필요 없음
+    """
+    pos = _expect(text, pos, "{")
+    pos = _ws(text, pos)
+    if text[pos:pos + 1] == "}":
+        return
+    while True:
+        m = _STRING.match(text, pos)
+        if not m:
+            raise ValueError(f"expected object key at {pos}")
+        raw = m.group()
+        key = json.loads(raw) if "\\" in raw else raw[1:-1]
+        value = _ws(text, _expect(text, m.end(), ":"))
+        yield pos, key, value
+
+        pos = _ws(text, skip_value(text, value))
+        c = text[pos:pos + 1]
+        if c == "}":
+            return
+        if c != ",":
+            raise ValueError(f"expected ',' or '}}' at {pos}")
+        pos = _ws(text, pos + 1)
+
+
+def decode_at(text: str, pos: int) -> Any:
+    return _decoder.raw_decode(text, _ws(text, pos))[0]
+
+
+# --------------------------------------------------
+# 경로로 찾기
+# --------------------------------------------------
+def find_first(text: str, paths: Sequence[Sequence[str]], start: int = 0) -> Optional[Any]:
+    """
+    paths(우선순위 순) 중 값이 truthy인 첫 경로의 값.
+    더 앞선 경로가 아직 나올 수 있으면 계속 읽고, 답이 정해지는 순간 멈춤
+    (예: 첫 후보를 찾았으면 나머지 문서는 읽지 않음)
+    """
+    paths = [tuple(p) for p in paths]
+    prefixes = {p[:i] for p in paths for i in range(1, len(p))}
+    found: Dict[Tuple[str, ...], Any] = {}
+    resolved = set()
+
+    def decide(final: bool = False):
+        for p in paths:
+            if found.get(p):
+                raise _Found(found[p])
+            if p not in resolved and not final:
+                return
+
+    def walk(pos: int, prefix: Tuple[str, ...]):
+        for _, key, value in _members(text, pos):
+            path = prefix + (key,)
+            if path in found:
+                continue   # 같은 키가 또 나오면 첫 번째 것만 봄
+            if path in paths:
+                found[path] = decode_at(text, value)
+                # 이 값 아래의 더 긴 후보 경로도 이미 만든 값에서 바로 확인
+                for p in paths:
+                    if p[:len(path)] == path:
+                        sub = found[path]
+                        for k in p[len(path):]:
+                            sub = sub.get(k) if isinstance(sub, dict) else None
+                        found[p] = sub
+                        resolved.add(p)
+                decide()
+            elif path in prefixes and text[value:value + 1] == "{":
+                walk(value, path)
+        # 이 객체가 닫혔으니 아래 경로 중 안 나온 것은 없는 것
+        for p in paths:
+            if p[:len(prefix)] == prefix:
+                resolved.add(p)
+        decide()
+
+    try:
+        pos = _ws(text, start)
+        if text[pos:pos + 1] == "{":
+            walk(pos, ())
+        decide(final=True)
+    except _Found as f:
+        return f.value
+    return None
+
+
+# --------------------------------------------------
+# 키로 찾기
+# --------------------------------------------------
+def _nonempty(text: str, pos: int) -> bool:
+    # len(value or []) > 0 과 같은 판정 (배열/객체/문자열이 비어 있지 않음)
+    c = text[pos:pos + 1]
+    if c in ("[", "{"):
+        after = _ws(text, pos + 1)
+        return text[after:after + 1] != ("]" if c == "[" else "}")
+    if c == '"':
+        return text[pos + 1:pos + 2] != '"'
+    return False
+
+
+class _Unsure(Exception):
+    # 빠른 경로로는 판단할 수 없음 → 정확한 순회로
+    pass
+
+
+def _owner_of(text: str, obj: int, hit: int, max_depth: int) -> Optional[int]:
+    """
+    hit 위치의 키를 직접 가진 객체의 시작 위치. 객체만 따라 max_depth 안에서 닿을 때만, 아니면 None.
+    값이 hit를 품는지는 endpos=hit로 제한한 괄호 정규식이 실패하는지로 보므로 hit 앞부분만 읽는다
+    """
+    depth = 0
+    while True:
+        pos = _ws(text, _expect(text, obj, "{"))
+        child = None
+        while text[pos:pos + 1] != "}":
+            if pos == hit:
+                return obj
+            if pos > hit:
+                return None   # 문자열 값 안에 있던 글자
+            m = _STRING.match(text, pos)
+            if not m:
+                raise ValueError(f"expected object key at {pos}")
+            value = _ws(text, _expect(text, m.end(), ":"))
+            if value > hit:
+                return None
+            c = text[value:value + 1]
+            if c in ("{", "["):
+                inner = _BALANCED.match(text, value, hit)
+                if inner is None:
+                    # hit가 이 값 안에 있거나, 괄호 정규식 한도보다 깊게 중첩된 값
+                    if c == "[" or depth >= max_depth:
+                        # 배열 안이거나 너무 깊으면 대상 아님 (중첩 한도 때문인지는 끝까지 맞춰서 확인)
+                        if _BALANCED.match(text, value) is None:
+                            raise _Unsure()
+                        return None
+                    child = value
+                    break
+                end = inner.end()
+            else:
+                end = skip_value(text, value)
+            pos = _ws(text, end)
+            if text[pos:pos + 1] == ",":
+                pos = _ws(text, pos + 1)
+        if child is None:
+            raise _Unsure()   # 괄호 정규식 한도보다 깊은 중첩 → hit 위치를 지나쳤을 수 있음
+        obj, depth = child, depth + 1
+
+
+def find_object_with_keys(text: str, keys: Iterable[str], max_depth: int = 5, start: int = 0,
+                          max_guided: int = 8) -> Optional[dict]:
+    """
+    keys 중 하나라도 비어 있지 않은 값으로 가진 첫 객체 (깊이 max_depth까지, 배열 안은 보지 않음).
+    자기 키를 먼저 다 본 뒤 자식 객체로 내려가는 dict 재귀 탐색과 결과가 같다.
+
+    키 문자열 위치(hit)를 먼저 찾아두고(C) 앞에서부터 hit의 주인 객체를 바로 찾아간다.
+    찾은 객체 뒤에 다른 hit가 없으면 그게 답 (뒤에서 조상 객체가 자기 키로 먼저 잡힐 수 없음).
+    그 밖의 경우(뒤에 hit가 더 있음, 중첩이 너무 깊음 등)는 정확한 순회로 다시 찾는다
+    """
+    keys = set(keys)
+    pattern = re.compile(r'"(?:%s)"\s*:' % "|".join(re.escape(k) for k in keys))
+    hits = [m.start() for m in pattern.finditer(text, start)]
+    if not hits:
+        return None
+    root = _ws(text, start)
+    if text[root:root + 1] != "{":
+        return None
+
+    if _BALANCED is not None:
+        try:
+            for hit in hits[:max_guided]:
+                obj = _owner_of(text, root, hit, max_depth)
+                if obj is None:
+                    continue
+                value = _ws(text, _expect(text, _STRING.match(text, hit).end(), ":"))
+                if not _nonempty(text, value):
+                    continue
+                found, end = _decoder.raw_decode(text, obj)
+                if bisect_left(hits, end) == len(hits):
+                    return found
+                break
+            else:
+                if len(hits) <= max_guided:
+                    return None   # 모든 hit가 대상이 아님
+        except _Unsure:
+            pass
+    return _walk_for_keys(text, root, keys, hits, max_depth)
+
+
+def _walk_for_keys(text: str, root: int, keys: set, hits: List[int], max_depth: int) -> Optional[dict]:
+    def has_hit(a: int, b: int) -> bool:
+        i = bisect_left(hits, a)
+        return i < len(hits) and hits[i] < b
+
+    def walk(pos: int, depth: int) -> Optional[dict]:
+        children: List[Tuple[int, int]] = []   # (값 시작, 다음 키 위치)
+        child = None
+        for key_pos, key, value in _members(text, pos):
+            if child is not None:
+                children.append((child, key_pos))
+                child = None
+            if key_pos > hits[-1]:
+                break   # 여기부터는 키 문자열이 없음 → 후보도, 후보를 품은 자식도 없음
+            if key in keys and _nonempty(text, value):
+                return decode_at(text, pos)
+            if depth < max_depth and text[value:value + 1] == "{":
+                child = value
+        if child is not None:
+            children.append((child, len(text)))
+
+        for a, b in children:
+            if has_hit(a, b):
+                found = walk(a, depth + 1)
+                if found is not None:
+                    return found
+        return None
+
+    return walk(root, 0)
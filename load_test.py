@@ -0,0 +1,707 @@
+import os
+import re
+import sys
+import json
+import math
+import time
+import random
+import shlex
+import threading
+import subprocess
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+
+import requests
+
+try:
+    import psutil
+except ImportError:   # psutil 없으면 리눅스 /proc에서 직접 읽음 (그 외 OS는 CPU/메모리 생략)
+    psutil = None
+
+# ==========================================
+# LOAD TEST HARNESS
+# ==========================================
+# 실제 사이트 대신 로컬 대역(stand-in) 서버를 띄우고, 크롤러를 여러 방식으로 동시에 돌려
+# 처리량 / 지연 분위수 / 워커(크롬 포함 프로세스 트리)별 CPU·메모리를 잰다.
+#
+#   python load_test.py                                     # spawn 모드 (요청마다 crawler.py 실행), 동시 4
+#   python load_test.py --mode=worker --concurrency=8 --workers=4 --requests=200
+#   python load_test.py --mode=worker --workers=1 --crawler-args="--tabs=4"
+#   python load_test.py --mode=server --target=http://localhost:3000
+#   python load_test.py --mix=musinsa:3,naver:1 --latency=300 --api-latency=80 --jitter=0.3
+#   python load_test.py --json=report.json
+#   python load_test.py --serve --port=8900                 # 대역 서버만 (server.js를 붙여서 테스트할 때)
+#   python load_test.py --record URL [URL ...]              # 실제 페이지를 녹화 (loadtest/recordings)
+#
+# 크롤러는 MUSINSA_ORIGIN / MUSINSA_API_ORIGIN 환경 변수로 대역 서버를 보게 된다.
+# server 모드에서는 server.js를 같은 환경 변수로 띄워야 한다 (실행하면 안내 문구가 나옴).
+# 대역 서버 URL은 http://127.0.0.1:PORT/musinsa.com/products/N, .../smartstore.naver.com/standin/products/N
+
+RECORDINGS_DIR = os.path.join("loadtest", "recordings")
+DEFAULTS = {
+    "mode": "spawn",
+    "concurrency": 4,
+    "requests": 40,
+    "mix": "musinsa:1,naver:1",
+    "products": 50,
+    "latency": 200,      # 상품 페이지 응답 지연 (ms)
+    "api-latency": 50,   # actual-size / options API 지연 (ms)
+    "jitter": 0.2,       # 지연 ±비율
+    "deadline": 30,
+    "timeout": 120,
+}
+SAMPLE_INTERVAL = 0.5
+
+COLORS = ["블랙", "화이트", "네이비", "그레이", "베이지", "카키"]
+SIZES = ["S", "M", "L", "XL"]
+
+
+# --------------------------------------------------
+# 대역 서버 페이지 (녹화본이 없으면 합성)
+# --------------------------------------------------
+def _sold_out(n: int, i: int) -> bool:
+    return (n * 7 + i * 3) % 5 == 0
+
+
+def musinsa_product(n: int) -> dict:
+    return {
+        "goodsNo": n,
+        "goodsNm": f"대역 상품 {n} 오버핏 후드",
+        "goodsImage": "",
+        "finalPrice": 29000 + (n % 20) * 1000,
+        "isSoldOut": False,
+        "goodsOption": {
+            "optionValues": [{"name": s, "soldOutYn": "N"} for s in SIZES],
+            "basic": [{"no": 1, "name": "컬러"}, {"no": 2, "name": "사이즈"}],
+            "optionItems": [
+                {
+                    "optionValues": [{"optionNo": 1, "name": c}, {"optionNo": 2, "name": s}],
+                    "outOfStock": _sold_out(n, i),
+                }
+                for i, (c, s) in enumerate((c, s) for c in COLORS[: 2 + n % 4] for s in SIZES)
+            ],
+        },
+    }
+
+
+def musinsa_page(n: int) -> str:
+    product = musinsa_product(n)
+    next_data = {"props": {"pageProps": {"state": {"product": product}}}}
+    return (
+        "<html><head>"
+        f"<meta property='og:title' content='{product['goodsNm']}'>"
+        "</head><body>"
+        f"<span class='Price__CalculatedPrice'>{product['finalPrice']:,}원</span>"
+        f"<script id='__NEXT_DATA__' type='application/json'>{json.dumps(next_data, ensure_ascii=False)}</script>"
+        "</body></html>"
+    )
+
+
+def musinsa_actual_size(n: int) -> dict:
+    return {"data": {"sizes": [
+        {"name": s, "items": [{"name": "총장", "value": 68 + i * 2}, {"name": "가슴단면", "value": 55 + i * 3}]}
+        for i, s in enumerate(SIZES)
+    ]}}
+
+
+def naver_page(n: int) -> str:
+    combos = [
+        {"optionName1": c, "optionName2": s, "stockQuantity": 0 if _sold_out(n, i) else 3}
+        for i, (c, s) in enumerate((c, s) for c in COLORS[: 2 + n % 4] for s in SIZES)
+    ]
+    product = {"dispName": f"대역 스토어 상품 {n}", "salePrice": 19000 + (n % 30) * 500, "optionCombinations": combos}
+    state = {"product": {"A": product}}
+    return (
+        "<html><head><meta property='og:title' content='" + product["dispName"] + "'></head><body>"
+        f"<h3 class='_22kNQuPmbq'>{product['dispName']}</h3>"
+        f"<script>window.__PRELOADED_STATE__ = {json.dumps(state, ensure_ascii=False)};</script>"
+        "</body></html>"
+    )
+
+
+class Recordings:
+    """
+    loadtest/recordings/<kind>/*.html|json 을 돌려가며 제공 (kind: musinsa, naver, musinsa-actual-size)
+    """
+    def __init__(self, root: str = RECORDINGS_DIR):
+        self.files: Dict[str, List[bytes]] = {}
+        if not os.path.isdir(root):
+            return
+        for kind in os.listdir(root):
+            folder = os.path.join(root, kind)
+            names = sorted(os.listdir(folder)) if os.path.isdir(folder) else []
+            self.files[kind] = [open(os.path.join(folder, name), "rb").read() for name in names]
+
+    def get(self, kind: str, n: int) -> Optional[bytes]:
+        files = self.files.get(kind)
+        return files[n % len(files)] if files else None
+
+
+class StandInServer:
+    def __init__(self, port: int = 0, latency: float = 200, api_latency: float = 50, jitter: float = 0.2):
+        self.latency = latency / 1000
+        self.api_latency = api_latency / 1000
+        self.jitter = jitter
+        self.recordings = Recordings()
+        self.hits: Dict[str, int] = {}
+        self.lock = threading.Lock()
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                status, ctype, body, delay = server.route(self.path)
+                server.sleep(delay)
+                self.send_response(status)
+                self.send_header("Content-Type", ctype)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        self.httpd.daemon_threads = True
+        self.base = f"http://127.0.0.1:{self.httpd.server_port}"
+
+    def sleep(self, seconds: float):
+        if seconds > 0:
+            time.sleep(max(0.0, seconds * (1 + random.uniform(-self.jitter, self.jitter))))
+
+    def route(self, path: str) -> Tuple[int, str, bytes, float]:
+        m = re.search(r"/products/(\d+)|/goods/(\d+)/", path)
+        n = int(m.group(1) or m.group(2)) if m else 0
+
+        if path.startswith("/musinsa.com/products/"):
+            kind, ctype, delay = "musinsa", "text/html; charset=utf-8", self.latency
+            body = self.recordings.get(kind, n) or musinsa_page(n).encode("utf-8")
+        elif path.startswith("/smartstore.naver.com/"):
+            kind, ctype, delay = "naver", "text/html; charset=utf-8", self.latency
+            body = self.recordings.get(kind, n) or naver_page(n).encode("utf-8")
+        elif path.startswith("/goods-detail.musinsa.com/") and "/actual-size" in path:
+            kind, ctype, delay = "musinsa-actual-size", "application/json", self.api_latency
+            body = self.recordings.get(kind, n) or json.dumps(musinsa_actual_size(n)).encode("utf-8")
+        elif path.startswith("/goods-detail.musinsa.com/") and "/options" in path:
+            kind, ctype, delay = "musinsa-options", "application/json", self.api_latency
+            body = self.recordings.get(kind, n) or json.dumps({"data": musinsa_product(n)["goodsOption"]}).encode("utf-8")
+        else:
+            kind, ctype, delay, body = "other", "text/plain", 0, b"not found"
+
+        with self.lock:
+            self.hits[kind] = self.hits.get(kind, 0) + 1
+        return (404 if kind == "other" else 200), ctype, body, delay
+
+    def env(self) -> Dict[str, str]:
+        return {
+            "MUSINSA_ORIGIN": f"{self.base}/musinsa.com",
+            "MUSINSA_API_ORIGIN": f"{self.base}/goods-detail.musinsa.com",
+        }
+
+    def start(self):
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+
+
+def record(urls: List[str]):
+    """
+    실제 페이지를 녹화. 외부 스크립트/스타일은 지워서 부하 테스트 중에 실제 사이트로 나가지 않게 함
+    """
+    headers = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) Chrome/122.0.0.0 Safari/537.36"}
+    for i, url in enumerate(urls):
+        kind = "musinsa" if "musinsa.com" in url else "naver"
+        html = requests.get(url, headers=headers, timeout=15).text
+        html = re.sub(r"<script[^>]+src=[^>]*>\s*</script>", "", html, flags=re.I)
+        html = re.sub(r"<link[^>]+rel=[\"']?stylesheet[^>]*>", "", html, flags=re.I)
+        save = lambda k, name, data: _write(os.path.join(RECORDINGS_DIR, k, name), data)
+        save(kind, f"{i:04d}.html", html.encode("utf-8"))
+
+        m = re.search(r"/products/(\d+)", url)
+        if kind == "musinsa" and m:
+            api = f"https://goods-detail.musinsa.com/api2/goods/{m.group(1)}"
+            for sub, path in (("musinsa-actual-size", "/actual-size"), ("musinsa-options", "/v2/options?goodsSaleType=SALE")):
+                res = requests.get(api + path, headers=headers, timeout=15)
+                if res.status_code == 200:
+                    save(sub, f"{i:04d}.json", res.content)
+        print(f"recorded {url}")
+
+
+def _write(path: str, data: bytes):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+# --------------------------------------------------
+# 프로세스 트리 CPU / 메모리 샘플링
+# --------------------------------------------------
+def _list_processes() -> Dict[int, Tuple[int, List[str], float, int]]:
+    """
+    {pid: (ppid, argv, cpu 초, rss 바이트)}
+    """
+    procs = {}
+    if psutil is not None:
+        for p in psutil.process_iter(["pid", "ppid", "cmdline", "cpu_times", "memory_info"]):
+            info = p.info
+            if info["cpu_times"] is None or info["memory_info"] is None:
+                continue
+            cpu = info["cpu_times"].user + info["cpu_times"].system
+            procs[info["pid"]] = (info["ppid"], info["cmdline"] or [], cpu, info["memory_info"].rss)
+        return procs
+
+    if not os.path.isdir("/proc"):
+        return procs
+    ticks = os.sysconf("SC_CLK_TCK")
+    page = os.sysconf("SC_PAGE_SIZE")
+    for name in os.listdir("/proc"):
+        if not name.isdigit():
+            continue
+        try:
+            with open(f"/proc/{name}/stat", "rb") as f:
+                fields = f.read().rsplit(b")", 1)[1].split()
+            with open(f"/proc/{name}/statm", "rb") as f:
+                rss = int(f.read().split()[1]) * page
+            with open(f"/proc/{name}/cmdline", "rb") as f:
+                argv = f.read().decode("utf-8", "replace").split("\0")
+        except (OSError, IndexError, ValueError):
+            continue
+        procs[int(name)] = (int(fields[1]), argv, (int(fields[11]) + int(fields[12])) / ticks, rss)
+    return procs
+
+
+class ProcessSampler(threading.Thread):
+    """
+    인자 중에 match 파일이 있는 프로세스(= 크롤러 워커) 각각의 하위 트리(chromedriver, chrome)까지 합산
+    """
+    def __init__(self, match: str = "crawler.py", interval: float = SAMPLE_INTERVAL):
+        super().__init__(daemon=True)
+        self.match = match
+        self.interval = interval
+        self.stop_event = threading.Event()
+        self.workers: Dict[int, Dict[str, Any]] = {}
+        self.enabled = psutil is not None or os.path.isdir("/proc")
+
+    def run(self):
+        while self.enabled and not self.stop_event.wait(self.interval):
+            self.sample()
+
+    def stop(self):
+        self.stop_event.set()
+        self.join(timeout=2)
+        if self.enabled:
+            self.sample()
+
+    def _is_worker(self, argv: List[str]) -> bool:
+        return any(os.path.basename(a) == self.match for a in argv[1:3])
+
+    def sample(self):
+        procs = _list_processes()
+        children: Dict[int, List[int]] = {}
+        for pid, (ppid, _, _, _) in procs.items():
+            children.setdefault(ppid, []).append(pid)
+
+        now = time.time()
+        me = os.getpid()
+        for pid, (ppid, argv, _, _) in procs.items():
+            if pid == me or not self._is_worker(argv) or self._is_worker(procs.get(ppid, (0, []))[1]):
+                continue
+            tree, stack = [], [pid]
+            while stack:
+                p = stack.pop()
+                tree.append(p)
+                stack.extend(children.get(p, []))
+
+            w = self.workers.setdefault(pid, {"first": now, "cpu": {}, "rss": [], "procs": 0})
+            w["last"] = now
+            for p in tree:
+                # 먼저 끝난 자식 프로세스의 CPU 시간도 남도록 pid별 최대값 유지
+                w["cpu"][p] = max(w["cpu"].get(p, 0.0), procs[p][2])
+            w["rss"].append(sum(procs[p][3] for p in tree))
+            w["procs"] = max(w["procs"], len(tree))
+
+    def report(self) -> List[Dict[str, Any]]:
+        out = []
+        for pid, w in sorted(self.workers.items()):
+            cpu = sum(w["cpu"].values())
+            wall = max(w["last"] - w["first"], self.interval)
+            out.append({
+                "pid": pid,
+                "wall_s": round(wall, 2),
+                "cpu_s": round(cpu, 2),
+                "cpu_pct": round(100 * cpu / wall, 1),
+                "rss_avg_mb": round(sum(w["rss"]) / len(w["rss"]) / 2 ** 20, 1),
+                "rss_peak_mb": round(max(w["rss"]) / 2 ** 20, 1),
+                "procs": w["procs"],
+            })
+        return out
+
+
+# --------------------------------------------------
+# 요청 생성 / 실행 모드
+# --------------------------------------------------
+def parse_mix(text: str) -> List[Tuple[str, int]]:
+    mix = []
+    for part in text.split(","):
+        site, _, weight = part.partition(":")
+        if site.strip() not in ("musinsa", "naver"):
+            raise ValueError(f"unknown site in --mix: {site}")
+        mix.append((site.strip(), int(weight or 1)))
+    return mix
+
+
+def make_urls(base: str, mix: List[Tuple[str, int]], count: int, products: int, seed: int = 7) -> List[Tuple[str, str]]:
+    rng = random.Random(seed)
+    sites = [site for site, weight in mix for _ in range(weight)]
+    urls = []
+    for _ in range(count):
+        site, n = rng.choice(sites), rng.randrange(1, products + 1)
+        if site == "musinsa":
+            urls.append((site, f"{base}/musinsa.com/products/{n}"))
+        else:
+            urls.append((site, f"{base}/smartstore.naver.com/standin/products/{n}"))
+    return urls
+
+
+class Result:
+    __slots__ = ("site", "seconds", "ok", "rejected", "error")
+
+    def __init__(self, site: str, seconds: float, ok: bool, rejected: bool = False, error: str = ""):
+        self.site = site
+        self.seconds = seconds
+        self.ok = ok
+        self.rejected = rejected
+        self.error = error
+
+
+def _check_output(site: str, started: float, line: str) -> Result:
+    try:
+        out = json.loads(line)
+    except ValueError:
+        return Result(site, time.perf_counter() - started, False, error="bad output")
+    if out.get("error"):
+        return Result(site, time.perf_counter() - started, False, error=str(out["error"])[:80])
+    return Result(site, time.perf_counter() - started, True)
+
+
+class SpawnRunner:
+    """
+    server.js /api/scrape와 같은 방식: 요청마다 python crawler.py URL 을 새로 띄움
+    """
+    def __init__(self, python: str, crawler_args: List[str], env: Dict[str, str], timeout: float):
+        self.cmd = [python, "crawler.py", *crawler_args]
+        self.env = env
+        self.timeout = timeout
+
+    def start(self, workers: int):
+        pass
+
+    def call(self, site: str, url: str, slot: int) -> Result:
+        started = time.perf_counter()
+        try:
+            proc = subprocess.run(self.cmd + [url], capture_output=True, text=True, env=self.env, timeout=self.timeout)
+        except subprocess.TimeoutExpired:
+            return Result(site, time.perf_counter() - started, False, error="timeout")
+        lines = [line for line in proc.stdout.splitlines() if line.strip()]
+        if not lines:
+            return Result(site, time.perf_counter() - started, False, error=f"exit {proc.returncode}")
+        return _check_output(site, started, lines[-1])
+
+    def close(self):
+        pass
+
+
+class WorkerRunner:
+    """
+    python crawler.py --worker 프로세스 여러 개에 stdin으로 작업을 보내고 id로 결과를 맞춤
+    (crawler-args에 --tabs=N을 주면 워커 하나가 여러 작업을 동시에 처리)
+    """
+    def __init__(self, python: str, crawler_args: List[str], env: Dict[str, str], timeout: float):
+        self.cmd = [python, "crawler.py", "--worker", *crawler_args]
+        self.env = env
+        self.timeout = timeout
+        self.procs: List[subprocess.Popen] = []
+        self.pending: Dict[int, Tuple[threading.Event, List[str]]] = {}
+        self.lock = threading.Lock()
+        self.seq = 0
+
+    def start(self, workers: int):
+        for _ in range(workers):
+            proc = subprocess.Popen(
+                self.cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                text=True, encoding="utf-8", env=self.env, bufsize=1,
+            )
+            threading.Thread(target=self._read, args=(proc,), daemon=True).start()
+            self.procs.append(proc)
+
+    def _read(self, proc: subprocess.Popen):
+        for line in proc.stdout:
+            try:
+                job_id = json.loads(line).get("id")
+            except ValueError:
+                continue
+            with self.lock:
+                waiter = self.pending.pop(job_id, None)
+            if waiter:
+                waiter[1].append(line)
+                waiter[0].set()
+
+    def call(self, site: str, url: str, slot: int) -> Result:
+        with self.lock:
+            self.seq += 1
+            job_id = self.seq
+            waiter = self.pending[job_id] = (threading.Event(), [])
+        proc = self.procs[slot % len(self.procs)]
+
+        started = time.perf_counter()
+        proc.stdin.write(json.dumps({"id": job_id, "url": url}) + "\n")
+        proc.stdin.flush()
+        if not waiter[0].wait(self.timeout):
+            with self.lock:
+                self.pending.pop(job_id, None)
+            return Result(site, time.perf_counter() - started, False, error="timeout")
+        return _check_output(site, started, waiter[1][0])
+
+    def close(self):
+        for proc in self.procs:
+            try:
+                proc.stdin.close()
+                proc.wait(timeout=30)
+            except Exception:
+                proc.kill()
+
+
+class ServerRunner:
+    """
+    실제 서비스 경로: GET <target>/api/scrape?url=... (스케줄러가 503을 주면 rejected로 셈)
+    """
+    def __init__(self, target: str, timeout: float):
+        self.target = target.rstrip("/")
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.mount("http://", requests.adapters.HTTPAdapter(pool_maxsize=64))
+
+    def start(self, workers: int):
+        pass
+
+    def call(self, site: str, url: str, slot: int) -> Result:
+        started = time.perf_counter()
+        try:
+            res = self.session.get(f"{self.target}/api/scrape", params={"url": url}, timeout=self.timeout)
+        except requests.RequestException as e:
+            return Result(site, time.perf_counter() - started, False, error=type(e).__name__)
+        if res.status_code == 503:
+            return Result(site, time.perf_counter() - started, False, rejected=True)
+        if res.status_code != 200:
+            return Result(site, time.perf_counter() - started, False, error=f"HTTP {res.status_code}")
+        return _check_output(site, started, res.text)
+
+    def close(self):
+        self.session.close()
+
+
+def drive(runner, urls: List[Tuple[str, str]], concurrency: int, warmup: int) -> Tuple[List[Result], float]:
+    """
+    닫힌 루프: 클라이언트 concurrency개가 각자 응답을 받으면 바로 다음 요청
+    처음 warmup건(브라우저 기동 등)은 통계에서 뺌
+    """
+    results: List[Optional[Result]] = [None] * len(urls)
+    cursor = iter(range(len(urls)))
+    lock = threading.Lock()
+    measured_start: List[float] = []
+
+    def client(slot: int):
+        while True:
+            with lock:
+                i = next(cursor, None)
+                if i == warmup:
+                    measured_start.append(time.perf_counter())
+            if i is None:
+                return
+            site, url = urls[i]
+            results[i] = runner.call(site, url, slot)
+
+    threads = [threading.Thread(target=client, args=(slot,), daemon=True) for slot in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    end = time.perf_counter()
+    start = measured_start[0] if measured_start else end
+    return [r for r in results[warmup:] if r is not None], end - start
+
+
+# --------------------------------------------------
+# 집계 / 출력
+# --------------------------------------------------
+def percentile(values: List[float], p: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(p * len(ordered) / 100))   # nearest-rank
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def latency_summary(results: List[Result]) -> Dict[str, float]:
+    ms = [r.seconds * 1000 for r in results if r.ok]
+    return {
+        "n": len(ms),
+        "p50_ms": round(percentile(ms, 50), 1),
+        "p95_ms": round(percentile(ms, 95), 1),
+        "p99_ms": round(percentile(ms, 99), 1),
+        "max_ms": round(max(ms), 1) if ms else 0.0,
+        "mean_ms": round(sum(ms) / len(ms), 1) if ms else 0.0,
+    }
+
+
+def summarize(results: List[Result], wall: float, workers: List[Dict[str, Any]], config: Dict[str, Any]) -> Dict[str, Any]:
+    ok = [r for r in results if r.ok]
+    errors: Dict[str, int] = {}
+    for r in results:
+        if not r.ok and not r.rejected:
+            errors[r.error] = errors.get(r.error, 0) + 1
+
+    report = {
+        "config": config,
+        "wall_s": round(wall, 2),
+        "requests": len(results),
+        "ok": len(ok),
+        "rejected": sum(r.rejected for r in results),
+        "errors": errors,
+        "throughput_rps": round(len(ok) / wall, 3) if wall > 0 else 0.0,
+        "latency": latency_summary(results),
+        "by_site": {site: latency_summary([r for r in results if r.site == site])
+                    for site in sorted({r.site for r in results})},
+        "workers": workers,
+    }
+    if workers:
+        report["per_worker"] = {
+            "count": len(workers),
+            "cpu_s_mean": round(sum(w["cpu_s"] for w in workers) / len(workers), 2),
+            "cpu_pct_mean": round(sum(w["cpu_pct"] for w in workers) / len(workers), 1),
+            "rss_peak_mb_max": max(w["rss_peak_mb"] for w in workers),
+            "rss_avg_mb_mean": round(sum(w["rss_avg_mb"] for w in workers) / len(workers), 1),
+        }
+    return report
+
+
+def print_report(report: Dict[str, Any]):
+    c = report["config"]
+    lat = report["latency"]
+    print()
+    print(f"mode={c['mode']} concurrency={c['concurrency']} requests={report['requests']} "
+          f"(warmup {c['warmup']}) wall={report['wall_s']}s")
+    print(f"throughput {report['throughput_rps']} req/s   ok {report['ok']}   "
+          f"rejected {report['rejected']}   errors {sum(report['errors'].values())}")
+    print(f"latency    p50 {lat['p50_ms']} ms   p95 {lat['p95_ms']} ms   p99 {lat['p99_ms']} ms   "
+          f"max {lat['max_ms']} ms   mean {lat['mean_ms']} ms")
+    for site, s in report["by_site"].items():
+        print(f"  {site:<8} n={s['n']:<5} p50 {s['p50_ms']} ms   p95 {s['p95_ms']} ms   p99 {s['p99_ms']} ms")
+    for error, count in report["errors"].items():
+        print(f"  error x{count}: {error}")
+
+    workers = report["workers"]
+    if not workers:
+        print("workers: (CPU/메모리 측정 불가 — psutil 또는 /proc 필요)")
+        return
+    if c["mode"] == "spawn" or len(workers) > 16:
+        w = report["per_worker"]
+        print(f"workers    {w['count']} processes   cpu {w['cpu_s_mean']} s/worker ({w['cpu_pct_mean']}%)   "
+              f"rss avg {w['rss_avg_mb_mean']} MB   peak {w['rss_peak_mb_max']} MB")
+        return
+    print(f"{'pid':>8} {'wall s':>8} {'cpu s':>8} {'cpu %':>7} {'rss avg MB':>11} {'rss peak MB':>12} {'procs':>6}")
+    for w in workers:
+        print(f"{w['pid']:>8} {w['wall_s']:>8} {w['cpu_s']:>8} {w['cpu_pct']:>7} "
+              f"{w['rss_avg_mb']:>11} {w['rss_peak_mb']:>12} {w['procs']:>6}")
+
+
+def flag(args: List[str], name: str, default: Any = None) -> Any:
+    prefix = f"--{name}="
+    for a in args:
+        if a.startswith(prefix):
+            return a[len(prefix):]
+    return DEFAULTS.get(name, default)
+
+
+def main():
+    args = sys.argv[1:]
+
+    if "--record" in args:
+        record([a for a in args if not a.startswith("--")])
+        return
+
+    standin_url = flag(args, "standin")
+    standin = None
+    if not standin_url:
+        standin = StandInServer(
+            int(flag(args, "port", 0)),
+            float(flag(args, "latency")), float(flag(args, "api-latency")), float(flag(args, "jitter")),
+        ).start()
+        standin_url = standin.base
+
+    if "--serve" in args:
+        print(f"stand-in server on {standin_url}")
+        for k, v in standin.env().items():
+            print(f"  {k}={v}")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            return
+
+    mode = flag(args, "mode")
+    concurrency = int(flag(args, "concurrency"))
+    workers = int(flag(args, "workers", concurrency))
+    count = int(flag(args, "requests"))
+    timeout = float(flag(args, "timeout"))
+    warmup = int(flag(args, "warmup", workers if mode == "worker" else 0))
+    crawler_args = [f"--deadline={flag(args, 'deadline')}", *shlex.split(flag(args, "crawler-args", ""))]
+
+    env = dict(os.environ)
+    if standin is not None:
+        env.update(standin.env())
+    if mode == "spawn":
+        runner = SpawnRunner(flag(args, "python", sys.executable), crawler_args, env, timeout)
+    elif mode == "worker":
+        runner = WorkerRunner(flag(args, "python", sys.executable), crawler_args, env, timeout)
+    elif mode == "server":
+        runner = ServerRunner(flag(args, "target", "http://localhost:3000"), timeout)
+        if standin is not None:
+            print("server 모드: server.js를 아래 환경 변수로 띄워야 크롤러가 대역 서버를 봅니다")
+            for k, v in standin.env().items():
+                print(f"  {k}={v}")
+    else:
+        raise SystemExit(f"unknown --mode={mode} (spawn | worker | server)")
+
+    urls = make_urls(standin_url, parse_mix(flag(args, "mix")), count + warmup, int(flag(args, "products")))
+    sampler = ProcessSampler()
+    sampler.start()
+    runner.start(workers)
+    try:
+        results, wall = drive(runner, urls, concurrency, warmup)
+    finally:
+        runner.close()
+        sampler.stop()
+
+    config = {
+        "mode": mode, "concurrency": concurrency, "workers": workers, "warmup": warmup,
+        "mix": flag(args, "mix"), "latency_ms": float(flag(args, "latency")),
+        "api_latency_ms": float(flag(args, "api-latency")), "crawler_args": crawler_args,
+        "standin_hits": dict(standin.hits) if standin else None,
+    }
+    report = summarize(results, wall, sampler.report(), config)
+    print_report(report)
+
+    out = flag(args, "json")
+    if out:
+        with open(out, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\nreport saved → {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,379 @@
+import os
+import re
+import time
+import struct
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from typing import Dict, List, Optional, Any, Tuple
+
+from file_lock import file_lock
+
+# ==========================================
+# PRICE / STOCK HISTORY STORE
+# ==========================================
+# 상품(goods_no)마다 파일 하나에 append-only로 기록한다.
+#
+#   L 레코드: 옵션 라벨 사전에 새 라벨 추가 ("size:270", "color:블랙", "combo:블랙/270")
+#   S 레코드: 스냅샷 1건 = ts(uint32) + price(uint32) + 품절 비트맵
+#
+# 비트맵의 i번째 비트 = 라벨 i가 그 시점에 품절(또는 목록에 없음)이면 1.
+# 라벨 사전은 늘어나기만 하므로 예전 비트맵도 그대로 해석된다.
+# 읽을 때는 ts / price / 비트맵을 각각 array 컬럼으로 올린다.
+#
+# 같은 상품 파일에 여러 프로세스(server.js 백그라운드 갱신, --worker, 큐 워커 스레드)가 쓸 수 있으므로
+# 기록 / 다운샘플링은 <파일>.lock을 잡은 채로 "파일 뒤쪽에 새로 붙은 레코드 읽기 → 라벨 번호 배정 → 쓰기"를 한다.
+# (락 없이 각자 캐시한 라벨 사전으로 번호를 매기면 같은 번호가 다른 라벨을 가리키게 됨)
+
+_LABEL = b"L"
+_SNAPSHOT = b"S"
+_LABEL_HEAD = struct.Struct("<H")      # 라벨 길이
+_SNAPSHOT_HEAD = struct.Struct("<IIH")  # ts, price, 비트맵 바이트 수
+# 캐시한 이력이 아직 같은 파일인지 확인할 때 비교하는 마지막 바이트 수
+# (다운샘플링으로 교체된 파일이 지워진 옛 파일의 inode 번호를 다시 받을 수 있어서 inode만으로는 부족)
+_TAIL = 16
+
+DAY = 86400
+
+
+def product_key(url: str, site: str = "") -> str:
+    """
+    URL에서 상품 번호를 뽑아 '<site>/<goods_no>' 형태의 키로 만든다.
+    번호가 없으면 URL 자체를 정리해서 사용
+    """
+    if not site:
+        site = "musinsa" if "musinsa" in url else "naver" if ("naver" in url or "smartstore" in url) else "etc"
+
+    m = re.search(r"/products/(\d+)", url or "")
+    goods_no = m.group(1) if m else re.sub(r"[^\w.-]+", "_", url or "")[-80:]
+    return f"{site}/{goods_no}"
+
+
+def option_states(result: Any) -> Dict[str, bool]:
+    """
+    ProductData(또는 to_dict() 결과)를 {라벨: 품절여부}로 변환
+    """
+    d = result.to_dict() if hasattr(result, "to_dict") else result
+    states = {}
+
+    for c in d.get("colors") or []:
+        if c.get("name"):
+            states[f"color:{c['name']}"] = bool(c.get("isSoldOut"))
+    for s in d.get("sizes") or []:
+        if s.get("name"):
+            states[f"size:{s['name']}"] = bool(s.get("isSoldOut"))
+    for combo in d.get("combinations") or []:
+        if combo.get("color") and combo.get("size"):
+            states[f"combo:{combo['color']}/{combo['size']}"] = bool(combo.get("isSoldOut"))
+
+    return states
+
+
+class ProductHistory:
+    """
+    한 상품의 전체 이력 (컬럼 배열)
+    """
+    def __init__(self):
+        self.labels: List[str] = []
+        self.label_index: Dict[str, int] = {}
+        self.ts = array("I")
+        self.prices = array("I")
+        self.offsets = array("I", [0])   # 비트맵 시작 위치 (len = 스냅샷 수 + 1)
+        self.bitmaps = bytearray()
+
+    def __len__(self):
+        return len(self.ts)
+
+    def add_label(self, label: str) -> int:
+        idx = self.label_index.get(label)
+        if idx is None:
+            idx = len(self.labels)
+            self.labels.append(label)
+            self.label_index[label] = idx
+        return idx
+
+    def add_snapshot(self, ts: int, price: int, bitmap: bytes):
+        self.ts.append(ts)
+        self.prices.append(price)
+        self.bitmaps += bitmap
+        self.offsets.append(len(self.bitmaps))
+
+    def bitmap(self, i: int) -> bytes:
+        return bytes(self.bitmaps[self.offsets[i]:self.offsets[i + 1]])
+
+    def is_sold_out(self, i: int, label_idx: int) -> bool:
+        start, end = self.offsets[i], self.offsets[i + 1]
+        pos = start + label_idx // 8
+        if pos >= end:
+            # 그 시점엔 아직 모르던 라벨 → 없던 옵션 = 품절 취급
+            return True
+        return bool((self.bitmaps[pos] >> (label_idx % 8)) & 1)
+
+    def range(self, since: Optional[int] = None, until: Optional[int] = None) -> Tuple[int, int]:
+        lo = bisect_left(self.ts, since) if since is not None else 0
+        hi = bisect_right(self.ts, until) if until is not None else len(self.ts)
+        return lo, hi
+
+
+class HistoryStore:
+    # 메모리에 올려두는 상품 수 (오래 도는 워커가 모든 상품의 이력을 들고 있지 않도록 LRU)
+    MAX_CACHED = 256
+
+    def __init__(self, root: str = "history", max_cached: int = MAX_CACHED):
+        self.root = root
+        self.max_cached = max(1, max_cached)
+        # key → (이력, 읽은 파일 (st_dev, st_ino), 파일에서 읽은 끝 위치, 끝 위치 직전 _TAIL 바이트)
+        self._cache: "OrderedDict[str, Tuple[ProductHistory, Optional[Tuple[int, int]], int, bytes]]" = OrderedDict()
+        self._lock = threading.RLock()
+
+    # --------------------------------------------------
+    # 파일 입출력
+    # --------------------------------------------------
+    def _path(self, key: str) -> str:
+        parts = [re.sub(r"[^\w.-]+", "_", p) for p in key.split("/") if p]
+        return os.path.join(self.root, *parts[:-1], parts[-1] + ".hist")
+
+    def load(self, key: str) -> ProductHistory:
+        with self._lock:
+            return self._sync(key)[0]
+
+    def _sync(self, key: str) -> Tuple[ProductHistory, int]:
+        """
+        캐시된 이력에 다른 프로세스가 그 뒤로 붙인 레코드만 이어서 읽는다.
+        파일이 통째로 바뀌었으면(다운샘플링) 처음부터 다시 읽음.
+        반환값: (이력, 온전히 읽은 파일 끝 위치)
+        """
+        path = self._path(key)
+        try:
+            st = os.stat(path)
+            file_id, size = (st.st_dev, st.st_ino), st.st_size
+        except FileNotFoundError:
+            file_id, size = None, 0
+
+        hist, end, tail = ProductHistory(), 0, b""
+        cached = self._cache.get(key)
+        if cached and cached[1] == file_id and len(cached[3]) <= cached[2] <= size:
+            hist, _, end, tail = cached
+
+        if size > end or tail:
+            start = end - len(tail)   # raw[0]의 파일 위치
+            with open(path, "rb") as f:
+                f.seek(start)
+                raw = f.read()
+            if not raw.startswith(tail):
+                # 같은 inode 번호를 받은 다른 파일 → 처음부터 다시
+                return self._reload(key)
+            end += self._decode(raw[len(tail):], hist)
+            tail = raw[max(0, end - _TAIL - start):end - start]
+
+        self._remember(key, hist, file_id, end, tail)
+        return hist, end
+
+    def _reload(self, key: str) -> Tuple[ProductHistory, int]:
+        self._cache.pop(key, None)
+        return self._sync(key)
+
+    def _remember(self, key: str, hist: ProductHistory, file_id: Optional[Tuple[int, int]], end: int, tail: bytes):
+        self._cache[key] = (hist, file_id, end, tail)
+        while len(self._cache) > self.max_cached:
+            self._cache.popitem(last=False)
+
+    @staticmethod
+    def _decode(raw: bytes, hist: ProductHistory) -> int:
+        """
+        반환값: 끝까지 온전히 읽은 위치 (뒤에 끊긴 레코드가 있으면 그 앞까지)
+        """
+        pos = 0
+        n = len(raw)
+        while pos < n:
+            kind = raw[pos:pos + 1]
+            if kind == _LABEL:
+                head = pos + 1 + _LABEL_HEAD.size
+                if head > n:
+                    break
+                (length,) = _LABEL_HEAD.unpack_from(raw, pos + 1)
+                if head + length > n:
+                    break
+                hist.add_label(raw[head:head + length].decode("utf-8"))
+                pos = head + length
+            elif kind == _SNAPSHOT:
+                head = pos + 1 + _SNAPSHOT_HEAD.size
+                if head > n:
+                    break
+                ts, price, nbytes = _SNAPSHOT_HEAD.unpack_from(raw, pos + 1)
+                if head + nbytes > n:
+                    break
+                hist.add_snapshot(ts, price, raw[head:head + nbytes])
+                pos = head + nbytes
+            else:
+                # 중간에 끊긴 쓰기 등 → 여기까지만 신뢰
+                break
+        return pos
+
+    @staticmethod
+    def _encode_label(label: str) -> bytes:
+        b = label.encode("utf-8")
+        return _LABEL + _LABEL_HEAD.pack(len(b)) + b
+
+    @staticmethod
+    def _encode_snapshot(ts: int, price: int, bitmap: bytes) -> bytes:
+        return _SNAPSHOT + _SNAPSHOT_HEAD.pack(ts, price, len(bitmap)) + bitmap
+
+    # --------------------------------------------------
+    # 기록
+    # --------------------------------------------------
+    def append(self, key: str, result: Any, ts: Optional[int] = None):
+        d = result.to_dict() if hasattr(result, "to_dict") else result
+        ts = int(ts if ts is not None else time.time())
+        price = int(d.get("price") or 0)
+
+        states = option_states(d)
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._lock, file_lock(path + ".lock"):
+            hist, end = self._sync(key)
+            data = self._encode_append(hist, states, ts, price)
+
+            # 끝에 끊긴 레코드(죽은 쓰기)가 남아 있으면 잘라내고 그 자리에 이어 씀
+            with open(path, "r+b" if os.path.exists(path) else "wb") as f:
+                f.seek(end)
+                f.truncate()
+                f.write(data)
+                st = os.fstat(f.fileno())
+            tail = (self._cache[key][3] + data)[-_TAIL:]
+            self._remember(key, hist, (st.st_dev, st.st_ino), end + len(data), tail)
+
+    def _encode_append(self, hist: ProductHistory, states: Dict[str, bool], ts: int, price: int) -> bytes:
+        """
+        새 라벨 + 스냅샷을 hist에 반영하고 파일에 붙일 바이트를 돌려줌
+        """
+        chunks = []
+        for label in states:
+            if label not in hist.label_index:
+                hist.add_label(label)
+                chunks.append(self._encode_label(label))
+
+        # 알려진 모든 라벨 기준 비트맵 (이번에 안 보인 옵션은 품절로 기록)
+        bits = 0
+        for idx, label in enumerate(hist.labels):
+            if states.get(label, True):
+                bits |= 1 << idx
+        # 마지막 바이트의 남는 비트도 1로 채워서, 나중에 추가될 라벨이 "품절"로 읽히게 함
+        width = (len(hist.labels) + 7) // 8
+        bits |= ((1 << (width * 8)) - 1) >> len(hist.labels) << len(hist.labels)
+        bitmap = bits.to_bytes(width, "little")
+
+        hist.add_snapshot(ts, price, bitmap)
+        chunks.append(self._encode_snapshot(ts, price, bitmap))
+        return b"".join(chunks)
+
+    # --------------------------------------------------
+    # 조회
+    # --------------------------------------------------
+    def price_series(self, key: str, since: Optional[int] = None, until: Optional[int] = None) -> List[Tuple[int, int]]:
+        """
+        예: store.price_series(key, since=time.time() - 90 * DAY)
+        """
+        hist = self.load(key)
+        lo, hi = hist.range(since, until)
+        return list(zip(hist.ts[lo:hi], hist.prices[lo:hi]))
+
+    def last_in_stock(self, key: str, option: str) -> Optional[int]:
+        """
+        option 라벨("size:270" 등)이 마지막으로 재고가 있던 시각. 없으면 None
+        """
+        hist = self.load(key)
+        idx = hist.label_index.get(option)
+        if idx is None:
+            return None
+        for i in range(len(hist) - 1, -1, -1):
+            if not hist.is_sold_out(i, idx):
+                return hist.ts[i]
+        return None
+
+    def stock_at(self, key: str, ts: int) -> Dict[str, bool]:
+        """
+        ts 시점(그 이전 마지막 스냅샷)의 {라벨: 품절여부}
+        """
+        hist = self.load(key)
+        i = bisect_right(hist.ts, ts) - 1
+        if i < 0:
+            return {}
+        return {label: hist.is_sold_out(i, idx) for idx, label in enumerate(hist.labels)}
+
+    # --------------------------------------------------
+    # 다운샘플링
+    # --------------------------------------------------
+    def downsample(self, key: str, older_than: int = 30 * DAY, bucket: int = DAY, now: Optional[int] = None) -> int:
+        """
+        older_than보다 오래된 스냅샷을 bucket 단위로 합친다.
+        - 가격: 구간의 마지막 값
+        - 재고: 구간 안에서 한 번이라도 재고가 있었으면 재고 있음 (비트맵 AND)
+        반환값: 줄어든 스냅샷 수
+        """
+        path = self._path(key)
+        if not os.path.exists(path):
+            return 0
+        # 읽기 ~ 교체 사이에 다른 프로세스가 붙인 기록이 사라지지 않도록 append와 같은 락
+        with self._lock, file_lock(path + ".lock"):
+            return self._downsample(key, older_than, bucket, now)
+
+    def _downsample(self, key: str, older_than: int, bucket: int, now: Optional[int]) -> int:
+        hist, _ = self._sync(key)
+        if not len(hist):
+            return 0
+
+        cutoff = int(now if now is not None else time.time()) - older_than
+        split = bisect_left(hist.ts, cutoff)
+
+        merged = ProductHistory()
+        for label in hist.labels:
+            merged.add_label(label)
+
+        width = (len(hist.labels) + 7) // 8
+        cur_bucket = None
+        cur_ts = cur_price = 0
+        cur_bits = 0
+
+        def flush():
+            merged.add_snapshot(cur_ts, cur_price, cur_bits.to_bytes(width, "little"))
+
+        for i in range(split):
+            b = hist.ts[i] // bucket
+            # 옛 비트맵은 라벨 수가 적을 수 있으므로 뒤쪽(모르던 라벨)은 품절로 채움
+            raw = hist.bitmap(i)
+            bits = int.from_bytes(raw, "little") | (((1 << (width * 8)) - 1) >> (len(raw) * 8) << (len(raw) * 8))
+
+            if b != cur_bucket:
+                if cur_bucket is not None:
+                    flush()
+                cur_bucket, cur_bits = b, bits
+            else:
+                cur_bits &= bits
+            cur_ts, cur_price = hist.ts[i], hist.prices[i]
+
+        if cur_bucket is not None:
+            flush()
+
+        for i in range(split, len(hist)):
+            merged.add_snapshot(hist.ts[i], hist.prices[i], hist.bitmap(i))
+
+        removed = len(hist) - len(merged)
+        if removed:
+            self._rewrite(key, merged)
+        return removed
+
+    def _rewrite(self, key: str, hist: ProductHistory):
+        chunks = [self._encode_label(label) for label in hist.labels]
+        for i in range(len(hist)):
+            chunks.append(self._encode_snapshot(hist.ts[i], hist.prices[i], hist.bitmap(i)))
+
+        data = b"".join(chunks)
+        path = self._path(key)
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+        st = os.stat(path)
+        self._remember(key, hist, (st.st_dev, st.st_ino), len(data), data[-_TAIL:])
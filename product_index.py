@@ -0,0 +1,292 @@
+import re
+import sys
+import json
+import time
+import sqlite3
+import unicodedata
+from typing import Any, Dict, List, Optional
+
+from price_history import product_key
+
+# ==========================================
+# LOCAL PRODUCT INDEX
+# ==========================================
+# 크롤러가 긁은 상품을 SQLite 파일 하나에 모아두고 사이트에 가지 않고 바로 검색한다.
+#
+#   products : 상품 1건 = 1행 (정규화 제목, 사이트, 가격, 재고 여부, 마지막 결과 JSON)
+#   options  : (color, size, sold_out) — 색상만 / 사이즈만 / 조합 모두 한 테이블
+#   titles   : FTS5 trigram 전문 검색 (한글 부분 일치, 접두어 포함)
+#
+# 크롤러: --index=product_index.db 를 주면 결과가 나올 때마다 upsert
+# 조회:   python product_index.py "블랙 후드 M 재고 5만원 이하"
+#         python product_index.py --serve   (stdin JSON 한 줄 → stdout 결과 한 줄, 서버가 상주 프로세스로 사용)
+
+DEFAULT_PATH = "product_index.db"
+DEFAULT_LIMIT = 20
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS products (
+    key        TEXT PRIMARY KEY,
+    site       TEXT NOT NULL,
+    url        TEXT NOT NULL,
+    title      TEXT NOT NULL,
+    norm_title TEXT NOT NULL,
+    price      INTEGER NOT NULL,
+    in_stock   INTEGER NOT NULL,
+    updated_at INTEGER NOT NULL,
+    doc        TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS products_price ON products(price);
+CREATE TABLE IF NOT EXISTS options (
+    key      TEXT NOT NULL,
+    color    TEXT,
+    size     TEXT,
+    sold_out INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS options_key ON options(key);
+CREATE INDEX IF NOT EXISTS options_size ON options(size, sold_out);
+CREATE INDEX IF NOT EXISTS options_color ON options(color, sold_out);
+"""
+_FTS_SCHEMA = "CREATE VIRTUAL TABLE IF NOT EXISTS titles USING fts5(key UNINDEXED, text, tokenize='trigram')"
+
+
+def normalize(text: Any) -> str:
+    """
+    검색용 정규화: 전각/반각 통일(NFKC), 소문자, 괄호·구분 기호 → 공백, 공백 압축
+    """
+    text = unicodedata.normalize("NFKC", str(text or "")).lower()
+    text = re.sub(r"[\[\]\(\)\{\}_/|·,]+", " ", text)
+    return re.sub(r"\s+", " ", text).strip()
+
+
+# --------------------------------------------------
+# 자연어 비슷한 검색어 → 필터
+# --------------------------------------------------
+_PRICE_MAX = re.compile(r"(?:under|below|<=?|최대)\s*([\d,.]+)\s*(만)?\s*원?|([\d,.]+)\s*(만)?\s*원?\s*(?:이하|미만|까지)")
+_PRICE_MIN = re.compile(r"(?:over|above|>=?|최소)\s*([\d,.]+)\s*(만)?\s*원?|([\d,.]+)\s*(만)?\s*원?\s*(?:이상|초과|부터)")
+_SIZE = re.compile(r"(?:in\s+)?size\s*[:=]?\s*(\S+)|사이즈\s*[:=]?\s*(\S+)")
+_COLOR = re.compile(r"colou?r\s*[:=]?\s*(\S+)|색상\s*[:=]?\s*(\S+)")
+_SITE = re.compile(r"site\s*[:=]\s*(\w+)")
+_IN_STOCK = re.compile(r"in[\s-]*stock|재고\s*(?:있음|있는)?|구매\s*가능")
+
+
+def _amount(number: str, man: Optional[str]) -> int:
+    value = float(number.replace(",", ""))
+    return int(value * 10000 if man else value)
+
+
+def parse_query(query: str) -> Dict[str, Any]:
+    """
+    "in stock in size M under 50,000원 후드" →
+    {"text": "후드", "in_stock": True, "size": "m", "max_price": 50000}
+    """
+    q = normalize(query.replace(",", "")) if query else ""
+    filters: Dict[str, Any] = {}
+
+    def take(pattern, handler):
+        nonlocal q
+        m = pattern.search(q)
+        if m:
+            handler(m)
+            q = (q[:m.start()] + " " + q[m.end():]).strip()
+
+    take(_PRICE_MAX, lambda m: filters.__setitem__("max_price", _amount(m.group(1) or m.group(3), m.group(2) or m.group(4))))
+    take(_PRICE_MIN, lambda m: filters.__setitem__("min_price", _amount(m.group(1) or m.group(3), m.group(2) or m.group(4))))
+    take(_SIZE, lambda m: filters.__setitem__("size", m.group(1) or m.group(2)))
+    take(_COLOR, lambda m: filters.__setitem__("color", m.group(1) or m.group(2)))
+    take(_SITE, lambda m: filters.__setitem__("site", m.group(1)))
+    take(_IN_STOCK, lambda m: filters.__setitem__("in_stock", True))
+
+    filters["text"] = re.sub(r"\s+", " ", q).strip()
+    return filters
+
+
+class ProductIndex:
+    def __init__(self, path: str = DEFAULT_PATH):
+        self.path = path
+        # 크롤러 프로세스 여러 개가 동시에 쓸 수 있도록 WAL + 대기
+        self.db = sqlite3.connect(path, timeout=10, check_same_thread=False)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.executescript(_SCHEMA)
+        try:
+            self.db.execute(_FTS_SCHEMA)
+            self.fts = True
+        except sqlite3.OperationalError:
+            # FTS5/trigram 없는 SQLite → LIKE 검색으로 대체
+            print("[PY DEBUG] FTS5 trigram unavailable → LIKE search", file=sys.stderr)
+            self.fts = False
+        self.db.commit()
+
+    def close(self):
+        self.db.close()
+
+    # --------------------------------------------------
+    # 기록
+    # --------------------------------------------------
+    def add(self, url: str, result: Any, ts: Optional[int] = None):
+        d = result.to_dict() if hasattr(result, "to_dict") else dict(result)
+        site = d.get("site") or ""
+        key = product_key(url, site)
+        title = d.get("title") or ""
+
+        rows = []
+        for c in d.get("colors") or []:
+            if c.get("name"):
+                rows.append((key, normalize(c["name"]), None, int(bool(c.get("isSoldOut")))))
+        for s in d.get("sizes") or []:
+            if s.get("name"):
+                rows.append((key, None, normalize(s["name"]), int(bool(s.get("isSoldOut")))))
+        for combo in d.get("combinations") or []:
+            if combo.get("color") and combo.get("size"):
+                rows.append((key, normalize(combo["color"]), normalize(combo["size"]), int(bool(combo.get("isSoldOut")))))
+
+        # 옵션 정보가 전혀 없으면 판매 중으로 간주
+        in_stock = int(not rows or any(not r[3] for r in rows))
+        doc = json.dumps({**d, "sourceUrl": url}, ensure_ascii=False)
+
+        with self.db:
+            self.db.execute("DELETE FROM options WHERE key = ?", (key,))
+            self.db.execute(
+                "INSERT OR REPLACE INTO products VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, site, url, title, normalize(title), int(d.get("price") or 0), in_stock,
+                 int(ts if ts is not None else time.time()), doc),
+            )
+            self.db.executemany("INSERT INTO options VALUES (?, ?, ?, ?)", rows)
+            if self.fts:
+                self.db.execute("DELETE FROM titles WHERE key = ?", (key,))
+                self.db.execute("INSERT INTO titles VALUES (?, ?)", (key, f"{normalize(title)} {site}"))
+
+    # --------------------------------------------------
+    # 조회
+    # --------------------------------------------------
+    def _text_clause(self, text: str, where: List[str], params: List[Any]):
+        for word in text.split():
+            if self.fts and len(word) >= 3:
+                # trigram은 3글자 이상만 색인 → 짧은 단어는 LIKE
+                where.append("p.key IN (SELECT key FROM titles WHERE titles MATCH ?)")
+                params.append('"' + word.replace('"', '""') + '"')
+            else:
+                where.append("p.norm_title LIKE ? ESCAPE '\\'")
+                params.append("%" + word.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%")
+
+    def search(
+        self,
+        text: str = "",
+        site: Optional[str] = None,
+        min_price: Optional[int] = None,
+        max_price: Optional[int] = None,
+        size: Optional[str] = None,
+        color: Optional[str] = None,
+        in_stock: bool = False,
+        limit: int = DEFAULT_LIMIT,
+    ) -> List[dict]:
+        """
+        size/color와 in_stock을 같이 주면 "그 옵션이 재고 있음"으로 해석
+        (색상+사이즈 둘 다 주면 조합 → 없으면 각각 재고 있는지로 판단)
+        """
+        where: List[str] = []
+        params: List[Any] = []
+
+        self._text_clause(normalize(text), where, params)
+        if site:
+            where.append("p.site = ?")
+            params.append(site)
+        if min_price is not None:
+            where.append("p.price >= ?")
+            params.append(int(min_price))
+        if max_price is not None:
+            where.append("p.price > 0 AND p.price <= ?")
+            params.append(int(max_price))
+
+        stock = " AND o.sold_out = 0" if in_stock else ""
+        size, color = normalize(size) if size else None, normalize(color) if color else None
+        if size and color:
+            where.append(
+                f"(EXISTS (SELECT 1 FROM options o WHERE o.key = p.key AND o.size = ? AND o.color = ?{stock})"
+                f" OR (NOT EXISTS (SELECT 1 FROM options o WHERE o.key = p.key AND o.size IS NOT NULL AND o.color IS NOT NULL)"
+                f" AND EXISTS (SELECT 1 FROM options o WHERE o.key = p.key AND o.size = ? AND o.color IS NULL{stock})"
+                f" AND EXISTS (SELECT 1 FROM options o WHERE o.key = p.key AND o.color = ? AND o.size IS NULL{stock})))"
+            )
+            params += [size, color, size, color]
+        elif size or color:
+            column, value = ("size", size) if size else ("color", color)
+            where.append(f"EXISTS (SELECT 1 FROM options o WHERE o.key = p.key AND o.{column} = ?{stock})")
+            params.append(value)
+        elif in_stock:
+            where.append("p.in_stock = 1")
+
+        sql = "SELECT p.doc, p.updated_at FROM products p"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY p.updated_at DESC LIMIT ?"
+        params.append(int(limit))
+
+        results = []
+        for row in self.db.execute(sql, params):
+            doc = json.loads(row["doc"])
+            doc["indexedAt"] = row["updated_at"]
+            results.append(doc)
+        return results
+
+    def query(self, query: str, limit: int = DEFAULT_LIMIT, **overrides) -> List[dict]:
+        filters = parse_query(query)
+        filters.update({k: v for k, v in overrides.items() if v is not None})
+        return self.search(limit=limit, **filters)
+
+    def __len__(self):
+        return self.db.execute("SELECT COUNT(*) FROM products").fetchone()[0]
+
+
+# ==========================================
+# CLI / 상주 조회 프로세스
+# ==========================================
+def serve(index: ProductIndex):
+    """
+    stdin: {"id": 1, "q": "블랙 후드 size M", "limit": 20, "site": ..., "maxPrice": ...}
+    stdout: {"id": 1, "results": [...], "filters": {...}, "ms": 0.8}
+    """
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+        start = time.perf_counter()
+        req: Dict[str, Any] = {}
+        try:
+            req = json.loads(line)
+            filters = parse_query(req.get("q", ""))
+            for src, dst in (("site", "site"), ("size", "size"), ("color", "color"),
+                             ("minPrice", "min_price"), ("maxPrice", "max_price"), ("inStock", "in_stock")):
+                if req.get(src) not in (None, ""):
+                    filters[dst] = req[src]
+            results = index.search(limit=int(req.get("limit") or DEFAULT_LIMIT), **filters)
+            out = {"id": req.get("id"), "results": results, "filters": filters}
+        except Exception as e:
+            out = {"id": req.get("id"), "error": str(e)}
+        out["ms"] = round((time.perf_counter() - start) * 1000, 2)
+        print(json.dumps(out, ensure_ascii=False), flush=True)
+
+
+def main():
+    args = sys.argv[1:]
+    path = next((a.split("=", 1)[1] for a in args if a.startswith("--index=")), DEFAULT_PATH)
+    index = ProductIndex(path)
+
+    if "--serve" in args:
+        serve(index)
+        return
+
+    query = " ".join(a for a in args if not a.startswith("--"))
+    start = time.perf_counter()
+    results = index.query(query)
+    print(json.dumps({
+        "filters": parse_query(query),
+        "count": len(results),
+        "ms": round((time.perf_counter() - start) * 1000, 2),
+        "results": [{k: r.get(k) for k in ("site", "title", "price", "sourceUrl")} for r in results],
+    }, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    sys.stdout.reconfigure(encoding="utf-8")
+    main()
@@ -7,6 +7,8 @@ console.log("[DEBUG] search.js loaded");
 
 const CONFIG = {
     API_URL: 'http://localhost:3000/api/scrape',
+    SEARCH_URL: 'http://localhost:3000/api/products/search',
+    SEARCH_LIMIT: 8,
     SITES: {
         musinsa: { name: 'MUSINSA', badge: 'badge-musinsa' },
         naver: { name: 'NAVER', badge: 'badge-naver' },
@@ -25,6 +27,7 @@ const CONSTANTS = {
     },
     MESSAGES: {
         URL_REQUIRED: '상품 URL을 입력해주세요!',
+        NO_MATCH: '저장된 상품 중 일치하는 것이 없습니다. 상품 URL을 붙여넣어 보세요.',
         SCRAPE_ERROR: '상품 정보를 가져오는데 실패했습니다.',
         CONFIRM_CLEAR: '정말 모든 상품을 삭제하시겠습니까? (되돌릴 수 없습니다)'
     }
@@ -80,6 +83,18 @@ const ApiService = {
             console.error("[API ERROR]", err);
             throw err;
         }
+    },
+
+    // 이미 한 번 긁은 상품을 로컬 색인에서 검색 (사이트 접속 없음)
+    // 예: "후드 in stock size M under 50,000원"
+    async searchIndex(query) {
+        const params = new URLSearchParams({ q: query, limit: CONFIG.SEARCH_LIMIT });
+        const res = await fetch(`${CONFIG.SEARCH_URL}?${params}`);
+        const data = await res.json();
+        if (!res.ok || data.error) {
+            throw new Error(data.error || CONSTANTS.MESSAGES.SCRAPE_ERROR);
+        }
+        return data.results || [];
     }
 };
 
@@ -194,7 +209,7 @@ const Renderer = {
                 <button class="delete-btn" data-action="delete">✕</button>
 
                 <div class="card-image"
-                     style="background-image: url('${data.image}')">
+                     style="background-image: url('${data.thumbnail || data.image}')">
                 </div>
 
                 <div class="card-body">
@@ -403,6 +418,11 @@ const App = {
             return;
         }
 
+        // URL이 아니면 로컬 색인 검색
+        if (!/^https?:\/\//i.test(url)) {
+            return this.handleSearch(url);
+        }
+
         this.setLoading(true);
 
         try {
@@ -417,6 +437,29 @@ const App = {
             this.savedProducts.unshift(data);
             this.saveToStorage();
 
+            this.elements.input.value = "";
+        } catch (err) {
+            alert(`${CONSTANTS.MESSAGES.SCRAPE_ERROR}\n${err.message}`);
+        } finally {
+            this.setLoading(false);
+            this.elements.input.focus();
+        }
+    },
+
+    async handleSearch(query) {
+        this.setLoading(true);
+
+        try {
+            const results = await ApiService.searchIndex(query);
+            const fresh = results.filter(r => !this.savedProducts.some(p => p.sourceUrl === r.sourceUrl));
+            if (!results.length) return alert(CONSTANTS.MESSAGES.NO_MATCH);
+
+            fresh.reverse().forEach(data => {
+                this.elements.container.insertAdjacentHTML("afterbegin", Renderer.createCard(data));
+                this.savedProducts.unshift(data);
+            });
+            this.saveToStorage();
+
             this.elements.input.value = "";
         } catch (err) {
             alert(`${CONSTANTS.MESSAGES.SCRAPE_ERROR}\n${err.message}`);
@@ -0,0 +1,146 @@
+// =======================================================
+// 크롤러 실행 스케줄러 (우선순위 + 입장 제어)
+// =======================================================
+// - interactive: 사용자가 기다리는 요청 (/api/scrape)
+// - background : 관심 상품 주기 갱신 등 (/api/refresh)
+//
+// 동시에 도는 크롬(파이썬 프로세스) 수를 slots로 제한하고,
+// 슬롯이 비면 항상 interactive 대기열부터 꺼낸다.
+// 백그라운드 배치는 URL 하나 = 작업 하나라서, 작업 경계마다
+// interactive 요청이 끼어들 수 있다 (실행 중인 작업을 죽이지는 않음).
+// 대기열이 가득 차면 쌓아두지 않고 바로 SaturatedError (retryAfter 초 포함).
+
+const PRIORITIES = ["interactive", "background"];
+
+class SaturatedError extends Error {
+  constructor(priority, retryAfter) {
+    super(`${priority} queue is full`);
+    this.name = "SaturatedError";
+    this.priority = priority;
+    this.retryAfter = retryAfter;
+  }
+}
+
+class Scheduler {
+  constructor({
+    slots = 2,
+    // 백그라운드가 동시에 쓸 수 있는 슬롯 수 (나머지는 interactive용으로 비워둠)
+    backgroundSlots = Math.max(1, slots - 1),
+    maxQueue = { interactive: 20, background: 200 },
+    // 작업 평균 소요 시간 초기값 (초), 이후 실행 결과로 갱신
+    initialJobSeconds = 15,
+  } = {}) {
+    this.slots = slots;
+    this.backgroundSlots = Math.min(backgroundSlots, slots);
+    this.maxQueue = maxQueue;
+    this.avgSeconds = initialJobSeconds;
+    this.queues = { interactive: [], background: [] };
+    this.running = { interactive: 0, background: 0 };
+    this.rejected = { interactive: 0, background: 0 };
+  }
+
+  // 남은 자리 (배치를 통째로 받을 수 있는지 확인용)
+  capacity(priority) {
+    return Math.max(0, this.maxQueue[priority] - this.queues[priority].length);
+  }
+
+  // 지금 넣으면 대략 몇 초 뒤에 시작될지 (Retry-After 용)
+  retryAfter(priority) {
+    const ahead =
+      priority === "interactive"
+        ? this.queues.interactive.length
+        : this.queues.interactive.length + this.queues.background.length;
+    const busy = this.running.interactive + this.running.background;
+    const waves = (ahead + busy) / this.slots;
+    return Math.max(1, Math.ceil(waves * this.avgSeconds));
+  }
+
+  // count개를 더 받을 자리가 없으면 SaturatedError (배치는 통째로 받거나 통째로 거절)
+  admit(priority, count) {
+    if (this.capacity(priority) < count) {
+      this.rejected[priority] += 1;
+      throw new SaturatedError(priority, this.retryAfter(priority));
+    }
+  }
+
+  /**
+   * task: () => Promise. 슬롯이 나면 실행된다.
+   * 반환: { promise, cancel } — cancel()은 아직 대기 중일 때만 효과가 있음
+   * 대기열이 가득 차면 SaturatedError를 바로 던진다.
+   */
+  submit(priority, task) {
+    if (!PRIORITIES.includes(priority)) {
+      throw new Error(`unknown priority: ${priority}`);
+    }
+    this.admit(priority, 1);
+
+    let entry;
+    const promise = new Promise((resolve, reject) => {
+      entry = { task, resolve, reject, cancelled: false };
+    });
+    this.queues[priority].push(entry);
+    this._pump();
+
+    const cancel = () => {
+      const queue = this.queues[priority];
+      const idx = queue.indexOf(entry);
+      if (idx === -1) return false;
+      queue.splice(idx, 1);
+      entry.cancelled = true;
+      entry.resolve(undefined);
+      return true;
+    };
+    return { promise, cancel };
+  }
+
+  _next() {
+    const busy = this.running.interactive + this.running.background;
+    if (busy >= this.slots) return null;
+    if (this.queues.interactive.length) return "interactive";
+    if (this.queues.background.length && this.running.background < this.backgroundSlots) {
+      return "background";
+    }
+    return null;
+  }
+
+  _pump() {
+    let priority;
+    while ((priority = this._next())) {
+      const entry = this.queues[priority].shift();
+      this._start(priority, entry);
+    }
+  }
+
+  _start(priority, entry) {
+    this.running[priority] += 1;
+    const startedAt = Date.now();
+
+    Promise.resolve()
+      .then(entry.task)
+      .then(entry.resolve, entry.reject)
+      .finally(() => {
+        const seconds = (Date.now() - startedAt) / 1000;
+        // 지수 이동 평균: 최근 작업 시간 쪽으로 천천히 따라감
+        this.avgSeconds = this.avgSeconds * 0.8 + seconds * 0.2;
+        this.running[priority] -= 1;
+        this._pump();
+      });
+  }
+
+  stats() {
+    return {
+      slots: this.slots,
+      backgroundSlots: this.backgroundSlots,
+      running: { ...this.running },
+      queued: {
+        interactive: this.queues.interactive.length,
+        background: this.queues.background.length,
+      },
+      maxQueue: { ...this.maxQueue },
+      rejected: { ...this.rejected },
+      avgJobSeconds: Math.round(this.avgSeconds * 10) / 10,
+    };
+  }
+}
+
+module.exports = { Scheduler, SaturatedError };
@@ -2,6 +2,8 @@ const express = require("express");
 const cors = require("cors");
 const path = require("path");
 const { spawn } = require("child_process"); // 파이썬 실행을 위한 모듈
+const { Scheduler, SaturatedError } = require("./scheduler");
+const { SiteBackoff, siteOf } = require("./site_backoff");
 
 const app = express();
 const PORT = process.env.PORT || 3000;
@@ -10,6 +12,10 @@ app.use(cors());
 app.use(express.json());
 app.use(express.static(path.join(__dirname, "public")));
 
+// 크롤러가 받아둔 상품 이미지/썸네일 (파일 이름 = 내용 해시라서 절대 안 바뀜)
+const IMAGE_CACHE_DIR = process.env.IMAGE_CACHE_DIR || "image_cache";
+app.use("/images", express.static(path.join(__dirname, IMAGE_CACHE_DIR), { maxAge: "365d", immutable: true }));
+
 // =======================================================
 // ★ 중요: 아까 성공했던 파이썬 실행 파일의 "절대 경로" ★
 // (백슬래시 \ 를 두 번씩 \\ 써야 오류가 안 납니다)
@@ -17,6 +23,75 @@ app.use(express.static(path.join(__dirname, "public")));
 const PYTHON_PATH = "python";
 console.log("[Node.js] server.js loaded");
 
+// ?deadline=초 → 크롤러 전체 시간 예산 (넘기면 부분 결과 + incomplete 필드)
+const deadlineArgs = (req) => {
+  const seconds = parseFloat(req.query.deadline);
+  return seconds > 0 ? [`--deadline=${seconds}`] : [];
+};
+
+// 동시에 띄울 크롬 수 / 대기열 길이 (넘치면 503 + Retry-After)
+const scheduler = new Scheduler({
+  slots: parseInt(process.env.CRAWLER_SLOTS) || 2,
+  maxQueue: {
+    interactive: parseInt(process.env.INTERACTIVE_QUEUE) || 20,
+    background: parseInt(process.env.BACKGROUND_QUEUE) || 200,
+  },
+});
+// 캡차/차단 페이지를 만난 사이트는 잠시 크롬을 띄우지 않음
+const siteBackoff = new SiteBackoff();
+const HISTORY_DIR = process.env.HISTORY_DIR || "history";
+const INDEX_PATH = process.env.INDEX_PATH || "product_index.db";
+// 조건부 요청 / 변경 감지 캐시 (안 바뀐 상품은 304나 해시 비교 한 번으로 끝)
+const CHANGE_CACHE_PATH = process.env.CHANGE_CACHE_PATH || "change_cache.db";
+// 설정하면 백그라운드 갱신 결과를 옵션 단위 행으로 내보냄 (분석용).
+// 갱신은 URL마다 프로세스가 따로 떠서 이어 쓸 수 있는 csv로 (parquet은 워커/큐 모드에서)
+const EXPORT_DIR = process.env.EXPORT_DIR || "";
+const exportArgs = () => (EXPORT_DIR ? [`--export=${EXPORT_DIR}`, "--export-format=csv"] : []);
+// 설정하면 백그라운드 갱신을 여기서 돌리지 않고 공유 큐로 보냄
+// (각 호스트에서 python crawler.py --queue=<같은 값> 워커가 가져감)
+const JOB_QUEUE = process.env.JOB_QUEUE || "";
+
+// 모든 크롤러 실행에 공통으로 붙는 인자
+const commonArgs = () => [
+  `--images=${IMAGE_CACHE_DIR}`,
+  `--index=${INDEX_PATH}`,
+  `--changes=${CHANGE_CACHE_PATH}`,
+];
+
+const rejectSaturated = (res, e) => {
+  console.warn(`[Node.js] ${e.message} → retry after ${e.retryAfter}s`);
+  res.set("Retry-After", String(e.retryAfter));
+  res.status(503).json({ error: "크롤러가 바쁩니다. 잠시 후 다시 시도해주세요.", retryAfter: e.retryAfter });
+};
+
+const rejectBlocked = (res, site, retryAfter) => {
+  res.set("Retry-After", String(retryAfter));
+  res.status(503).json({
+    error: "사이트가 크롤러를 막고 있습니다. 잠시 후 다시 시도해주세요.",
+    blocked: site,
+    retryAfter,
+  });
+};
+
+// 크롤러 결과에 blocked가 있으면 백오프에 기록, 정상 결과면 초기화
+const noteResult = (site, result) => {
+  if (result && result.blocked) return siteBackoff.record(site, result);
+  if (result && !result.error) siteBackoff.clear(site);
+  return 0;
+};
+
+// 대기열에 넣고, 자리가 없으면 바로 503. 기다리는 중에 클라이언트가 끊으면 대기열에서 뺌
+const enqueue = (res, priority, task) => {
+  let job;
+  try {
+    job = scheduler.submit(priority, task);
+  } catch (e) {
+    if (e instanceof SaturatedError) return rejectSaturated(res, e);
+    throw e;
+  }
+  res.on("close", () => job.cancel());
+};
+
 app.get("/test", (req, res) => {
   console.log("[Node.js] test endpoint hit");
   res.send("OK");
@@ -32,57 +107,298 @@ app.get("/api/scrape", (req, res) => {
 
   console.log(`[Node.js] 크롤링 요청 받음: ${productUrl}`);
 
-  // 1. 파이썬 스크립트 실행 (crawler.py에게 URL을 전달)
-  const pythonProcess = spawn(PYTHON_PATH, ["crawler.py", productUrl]);
+  const site = siteOf(productUrl);
+  const wait = siteBackoff.remaining(site);
+  if (wait) return rejectBlocked(res, site, wait);
 
-  let resultData = "";
-  let errorData = "";
+  enqueue(res, "interactive", () => new Promise((done) => {
+    // 1. 파이썬 스크립트 실행 (crawler.py에게 URL을 전달)
+    const pythonProcess = spawn(PYTHON_PATH, ["crawler.py", ...commonArgs(), ...deadlineArgs(req), productUrl]);
 
-  // 2. 파이썬이 출력(print)하는 데이터를 받아옴
-  pythonProcess.stdout.on("data", (data) => {
-    resultData += data.toString();
-  });
+    let resultData = "";
+    let errorData = "";
 
-  // 3. 파이썬 에러 로그 받기e 
-  pythonProcess.stderr.on("data", (data) => {
-    console.error("[PY DEBUG]", data.toString());  // 🔥 로그 출력  
-    errorData += data.toString();
+    // 2. 파이썬이 출력(print)하는 데이터를 받아옴
+    pythonProcess.stdout.on("data", (data) => {
+      resultData += data.toString();
+    });
+
+    // 3. 파이썬 에러 로그 받기e 
+    pythonProcess.stderr.on("data", (data) => {
+      console.error("[PY DEBUG]", data.toString());  // 🔥 로그 출력  
+      errorData += data.toString();
+    });
+
+    // 4. 파이썬 작업이 끝나면 실행되는 부분
+    pythonProcess.on("close", (code) => {
+      done();
+      if (code !== 0) {
+        console.error(`[Python Error] Exit Code: ${code}, Error: ${errorData}`);
+        return res.status(500).json({ error: "크롤링 실패", details: errorData });
+      }
+
+      try {
+        // 파이썬이 준 JSON 문자열을 실제 객체로 변환
+        // (가끔 파이썬 로그가 섞일 수 있어서 JSON 부분만 찾는게 안전하지만, 
+        // 현재 crawler.py는 깔끔하게 JSON만 뱉도록 짜여있음)
+        const parsedResult = JSON.parse(resultData);
+
+        // 캡차/차단/오류 페이지 → 크롬을 붙잡지 않고 바로 끝난 결과
+        if (parsedResult.blocked) {
+          const retryAfter = noteResult(site, parsedResult);
+          if (retryAfter) return rejectBlocked(res, site, retryAfter);
+          const status = parsedResult.blocked === "not_found" ? 404 : 502;
+          return res.status(status).json({ error: "크롤링 실패", ...parsedResult });
+        }
+        noteResult(site, parsedResult);
+
+        // 가격 포맷팅 (프론트엔드 편의용)
+        const format = (p) => p ? parseInt(p).toLocaleString() + "원" : "가격 정보 없음";
+        parsedResult.priceFormatted = format(parsedResult.price);
+        parsedResult.couponPriceFormatted = format(parsedResult.couponPrice);
+        parsedResult.sourceUrl = productUrl;
+
+        console.log("============== [Node.js PRICE DEBUG] ==============");
+        console.log("원본 price 값:", parsedResult.price);
+        console.log("포맷된 priceFormatted:", parsedResult.priceFormatted);
+        console.log("원본 couponPrice:", parsedResult.couponPrice);
+        console.log("포맷된 couponPriceFormatted:", parsedResult.couponPriceFormatted);
+        console.log("====================================================");
+        console.log(`[Node.js] 성공적으로 데이터 반환 완료`);
+        res.json(parsedResult);
+
+      } catch (e) {
+        console.error("[Node.js] JSON 파싱 에러:", e);
+        console.error("받은 데이터:", resultData);
+        res.status(500).json({ error: "데이터 처리 실패", raw: resultData });
+      }
+    });
+  }));
+});
+
+// 단계별 부분 결과를 NDJSON으로 바로바로 흘려보내는 스트리밍 버전
+app.get("/api/scrape/stream", (req, res) => {
+  const productUrl = req.query.url;
+
+  if (!productUrl) {
+    return res.status(400).json({ error: "URL이 필요합니다." });
+  }
+
+  console.log(`[Node.js] 스트리밍 크롤링 요청 받음: ${productUrl}`);
+
+  const site = siteOf(productUrl);
+  const wait = siteBackoff.remaining(site);
+  if (wait) return rejectBlocked(res, site, wait);
+
+  enqueue(res, "interactive", () => new Promise((done) => {
+    res.setHeader("Content-Type", "application/x-ndjson; charset=utf-8");
+    res.setHeader("Cache-Control", "no-cache");
+
+    const pythonProcess = spawn(PYTHON_PATH, ["crawler.py", "--stream", ...commonArgs(), ...deadlineArgs(req), productUrl]);
+
+    // 그대로 흘려보내면서 done / blocked 오류 이벤트만 줄 단위로 확인 (백오프 기록용)
+    let partial = "";
+    pythonProcess.stdout.on("data", (data) => {
+      res.write(data);
+      const lines = (partial + data.toString()).split("\n");
+      partial = lines.pop();
+      lines.forEach((line) => {
+        try {
+          const event = JSON.parse(line);
+          if (event.event === "done") noteResult(site, event.data);
+          else if (event.event === "error") noteResult(site, event);
+        } catch (e) {
+          // 줄 단위 JSON이 아니면 무시
+        }
+      });
+    });
+
+    pythonProcess.stderr.on("data", (data) => {
+      console.error("[PY DEBUG]", data.toString());
+    });
+
+    pythonProcess.on("close", (code) => {
+      done();
+      if (code !== 0) {
+        console.error(`[Python Error] Exit Code: ${code}`);
+        res.write(JSON.stringify({ event: "error", url: productUrl, data: { error: "크롤링 실패" } }) + "\n");
+      }
+      res.end();
+    });
+
+    // 클라이언트가 끊으면 파이썬도 정리
+    res.on("close", () => {
+      if (pythonProcess.exitCode === null) pythonProcess.kill();
+    });
+  }));
+});
+
+// 관심 상품 백그라운드 갱신: { "urls": [...] } → 이력(history)에만 기록
+// interactive 요청이 있으면 URL 하나 끝날 때마다 그쪽이 먼저 실행됨
+app.post("/api/refresh", (req, res) => {
+  const urls = (req.body && req.body.urls) || [];
+  if (!Array.isArray(urls) || !urls.length) {
+    return res.status(400).json({ error: "urls 배열이 필요합니다." });
+  }
+
+  if (JOB_QUEUE) {
+    return enqueueShared(urls, req, res);
+  }
+
+  try {
+    scheduler.admit("background", urls.length);
+  } catch (e) {
+    if (e instanceof SaturatedError) return rejectSaturated(res, e);
+    throw e;
+  }
+
+  urls.forEach((url) => {
+    scheduler.submit("background", () => new Promise((done) => {
+      // 실행 차례가 됐을 때 그 사이트가 쉬는 중이면 이번 갱신은 건너뜀
+      const site = siteOf(url);
+      if (siteBackoff.remaining(site)) {
+        console.warn(`[Node.js] 백그라운드 갱신 건너뜀 (${site} 백오프 중): ${url}`);
+        return done();
+      }
+      const pythonProcess = spawn(PYTHON_PATH, [
+        "crawler.py",
+        `--history=${HISTORY_DIR}`,
+        ...commonArgs(),
+        ...exportArgs(),
+        ...deadlineArgs(req),
+        url,
+      ]);
+      let resultData = "";
+      let errorData = "";
+      pythonProcess.stdout.on("data", (data) => {
+        resultData += data.toString();
+      });
+      pythonProcess.stderr.on("data", (data) => {
+        errorData += data.toString();
+      });
+      pythonProcess.on("close", (code) => {
+        if (code !== 0) console.error(`[Node.js] 백그라운드 갱신 실패 (${url}): ${errorData}`);
+        else {
+          try {
+            noteResult(site, JSON.parse(resultData));
+          } catch (e) {
+            console.error(`[Node.js] 백그라운드 갱신 결과 파싱 실패 (${url})`);
+          }
+        }
+        done();
+      });
+    }));
   });
 
-  // 4. 파이썬 작업이 끝나면 실행되는 부분
-  pythonProcess.on("close", (code) => {
-    if (code !== 0) {
-      console.error(`[Python Error] Exit Code: ${code}, Error: ${errorData}`);
-      return res.status(500).json({ error: "크롤링 실패", details: errorData });
+  res.status(202).json({ accepted: urls.length, ...scheduler.stats().queued });
+});
+
+// =======================================================
+// 로컬 상품 색인 검색 (크롤링 없이 이미 긁은 상품에서 찾기)
+// 파이썬 조회 프로세스 하나를 띄워두고 한 줄 JSON으로 주고받음
+// =======================================================
+const INDEX_QUERY_TIMEOUT = 5000;
+let indexProcess = null;
+const indexPending = new Map();
+let indexSeq = 0;
+
+const startIndexProcess = () => {
+  const proc = spawn(PYTHON_PATH, ["product_index.py", "--serve", `--index=${INDEX_PATH}`]);
+  let buffer = "";
+  proc.stdout.setEncoding("utf8");
+  proc.stdout.on("data", (chunk) => {
+    buffer += chunk;
+    let nl;
+    while ((nl = buffer.indexOf("\n")) >= 0) {
+      const line = buffer.slice(0, nl);
+      buffer = buffer.slice(nl + 1);
+      if (!line.trim()) continue;
+      try {
+        const msg = JSON.parse(line);
+        const resolve = indexPending.get(msg.id);
+        if (resolve) {
+          indexPending.delete(msg.id);
+          resolve(msg);
+        }
+      } catch (e) {
+        console.error("[Node.js] 색인 응답 파싱 실패:", line);
+      }
     }
+  });
+  proc.stderr.on("data", (data) => console.error("[INDEX]", data.toString()));
+  proc.on("close", (code) => {
+    console.error(`[Node.js] 색인 프로세스 종료 (code ${code})`);
+    indexProcess = null;
+    indexPending.forEach((resolve) => resolve({ error: "색인 프로세스가 종료되었습니다." }));
+    indexPending.clear();
+  });
+  return proc;
+};
+
+const queryIndex = (params) => new Promise((resolve) => {
+  if (!indexProcess) indexProcess = startIndexProcess();
+  const id = ++indexSeq;
+  const timer = setTimeout(() => {
+    indexPending.delete(id);
+    resolve({ error: "색인 조회 시간 초과" });
+  }, INDEX_QUERY_TIMEOUT);
+  indexPending.set(id, (msg) => {
+    clearTimeout(timer);
+    resolve(msg);
+  });
+  indexProcess.stdin.write(JSON.stringify({ id, ...params }) + "\n");
+});
+
+// 예: /api/products/search?q=후드 in stock size M under 50,000원
+//     /api/products/search?q=후드&site=musinsa&size=M&inStock=1&maxPrice=50000
+app.get("/api/products/search", async (req, res) => {
+  const { q = "", site, size, color, limit } = req.query;
+  const num = (v) => (v === undefined || v === "" ? undefined : Number(v));
+  const result = await queryIndex({
+    q,
+    site,
+    size,
+    color,
+    limit: num(limit),
+    minPrice: num(req.query.minPrice),
+    maxPrice: num(req.query.maxPrice),
+    inStock: req.query.inStock === "1" || req.query.inStock === "true" || undefined,
+  });
+
+  if (result.error) {
+    return res.status(500).json({ error: result.error });
+  }
+  res.json({ count: result.results.length, ms: result.ms, filters: result.filters, results: result.results });
+});
 
-    try {
-      // 파이썬이 준 JSON 문자열을 실제 객체로 변환
-      // (가끔 파이썬 로그가 섞일 수 있어서 JSON 부분만 찾는게 안전하지만, 
-      // 현재 crawler.py는 깔끔하게 JSON만 뱉도록 짜여있음)
-      const parsedResult = JSON.parse(resultData);
-
-      // 가격 포맷팅 (프론트엔드 편의용)
-      const format = (p) => p ? parseInt(p).toLocaleString() + "원" : "가격 정보 없음";
-      parsedResult.priceFormatted = format(parsedResult.price);
-      parsedResult.couponPriceFormatted = format(parsedResult.couponPrice);
-      parsedResult.sourceUrl = productUrl;
-
-      console.log("============== [Node.js PRICE DEBUG] ==============");
-      console.log("원본 price 값:", parsedResult.price);
-      console.log("포맷된 priceFormatted:", parsedResult.priceFormatted);
-      console.log("원본 couponPrice:", parsedResult.couponPrice);
-      console.log("포맷된 couponPriceFormatted:", parsedResult.couponPriceFormatted);
-      console.log("====================================================");
-      console.log(`[Node.js] 성공적으로 데이터 반환 완료`);
-      res.json(parsedResult);
-
-    } catch (e) {
-      console.error("[Node.js] JSON 파싱 에러:", e);
-      console.error("받은 데이터:", resultData);
-      res.status(500).json({ error: "데이터 처리 실패", raw: resultData });
+// 공유 작업 큐에 넣기 (job_queue.py put, 작업은 stdin으로 한 줄에 하나)
+const enqueueShared = (urls, req, res) => {
+  const deadline = parseFloat(req.query.deadline);
+  const putProcess = spawn(PYTHON_PATH, ["job_queue.py", "put", JOB_QUEUE]);
+  let output = "";
+  let errorData = "";
+  putProcess.stdout.on("data", (data) => {
+    output += data.toString();
+  });
+  putProcess.stderr.on("data", (data) => {
+    errorData += data.toString();
+  });
+  putProcess.on("close", (code) => {
+    if (code !== 0) {
+      console.error(`[Node.js] 공유 큐 등록 실패: ${errorData}`);
+      return res.status(500).json({ error: "작업 등록 실패", details: errorData });
     }
+    const { queued } = JSON.parse(output);
+    res.status(202).json({ accepted: queued.length, jobIds: queued, queue: "shared" });
   });
+  urls.forEach((url) => {
+    putProcess.stdin.write(JSON.stringify(deadline > 0 ? { url, deadline } : { url }) + "\n");
+  });
+  putProcess.stdin.end();
+};
+
+app.get("/api/scheduler", (req, res) => {
+  res.json({ ...scheduler.stats(), backoff: siteBackoff.stats() });
 });
 
 app.listen(PORT, () => {
@@ -0,0 +1,59 @@
+// =======================================================
+// 사이트별 차단 백오프
+// =======================================================
+// 크롤러가 캡차/로그인/차단 페이지를 만나면 바로 끝내고 결과에 blocked 필드를 넣는다
+// ({ error, blocked: "captcha", retryAfter }).
+// 그 사이트는 잠시 크롬을 띄우지 않고 503 + Retry-After로 바로 돌려줌.
+// 막힐 때마다 쉬는 시간을 두 배로, 한 번 성공하면 초기화 (crawler.py Config.BLOCK_BACKOFF_* 와 같은 값).
+// not_found / error_page는 그 URL만의 문제라서 사이트를 쉬게 하지 않음.
+
+const SITE_WIDE = ["captcha", "login", "blocked", "rate_limited"];
+
+// crawler.py / job_queue.py site_of 와 같은 규칙
+const siteOf = (url) => {
+  if (url.includes("musinsa.com")) return "musinsa";
+  if (url.includes("naver") || url.includes("smartstore")) return "naver";
+  return "";
+};
+
+class SiteBackoff {
+  constructor({ base = 60, max = 1800 } = {}) {
+    this.base = base;
+    this.max = max;
+    this.sites = new Map(); // site → { strikes, until(ms), kind }
+  }
+
+  // 아직 쉬는 중이면 남은 초, 아니면 0
+  remaining(site) {
+    const entry = this.sites.get(site);
+    if (!entry) return 0;
+    return Math.max(0, Math.ceil((entry.until - Date.now()) / 1000));
+  }
+
+  // 크롤러 결과/오류 → 사이트를 쉬게 했으면 쉬는 시간(초), 아니면 0
+  record(site, result) {
+    if (!site || !result || !SITE_WIDE.includes(result.blocked)) return 0;
+    const entry = this.sites.get(site) || { strikes: 0 };
+    entry.strikes += 1;
+    entry.kind = result.blocked;
+    const seconds = Math.max(result.retryAfter || 0, Math.min(this.max, this.base * 2 ** (entry.strikes - 1)));
+    entry.until = Date.now() + seconds * 1000;
+    this.sites.set(site, entry);
+    console.warn(`[Node.js] ${site} ${result.blocked} → ${seconds}s 동안 크롤링 중지`);
+    return seconds;
+  }
+
+  clear(site) {
+    this.sites.delete(site);
+  }
+
+  stats() {
+    const out = {};
+    for (const [site, entry] of this.sites) {
+      out[site] = { kind: entry.kind, strikes: entry.strikes, retryAfter: this.remaining(site) };
+    }
+    return out;
+  }
+}
+
+module.exports = { SiteBackoff, siteOf, SITE_WIDE };
@@ -0,0 +1,65 @@
+import json
+import threading
+
+import pytest
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+from cdp_driver import CDPConnection, CDPDriver, CDPElement
+
+
+class FakeConnection(CDPConnection):
+    """
+    웹소켓 없이 call()에 정해둔 응답을 돌려줌. 대기(wait_for)는 실제 구현 그대로
+    """
+    def __init__(self, replies):
+        self._waiters = []
+        self._lock = threading.Lock()
+        self.replies = replies
+        self.calls = []
+
+    def call(self, method, params=None, session_id=None, timeout=None):
+        self.calls.append((method, session_id))
+        return self.replies.get(method, {})
+
+    def fire(self, method, session_id):
+        # 수신 스레드가 이벤트를 받았을 때와 같은 처리
+        with self._lock:
+            hits = [w for w in self._waiters if w[0] == method and w[1] in (None, session_id)]
+            self._waiters = [w for w in self._waiters if w not in hits]
+        for _, _, fut in hits:
+            fut.set_result({})
+        return len(hits)
+
+
+def make_driver(conn):
+    driver = CDPDriver.__new__(CDPDriver)
+    driver.conn = conn
+    driver._sessions = {"tab-1": "session-1", "tab-2": "session-2"}
+    driver._current = "tab-1"
+    driver.page_load_timeout = 0.01
+    return driver
+
+
+def test_failed_navigation_releases_load_waiter():
+    conn = FakeConnection({"Page.navigate": {"errorText": "net::ERR_NAME_NOT_RESOLVED"}})
+    with pytest.raises(WebDriverException):
+        make_driver(conn).get("https://example.invalid")
+    assert conn._waiters == []
+
+
+def test_timed_out_navigation_releases_load_waiter():
+    conn = FakeConnection({"Page.navigate": {}})
+    with pytest.raises(TimeoutException):
+        make_driver(conn).get("https://example.com/slow")
+    assert conn._waiters == []
+    assert conn.fire("Page.loadEventFired", "session-1") == 0
+
+
+def test_element_script_runs_in_the_elements_tab():
+    conn = FakeConnection({"Runtime.callFunctionOn": {"result": {"type": "string", "value": json.dumps({"v": "x"})}}})
+    driver = make_driver(conn)
+    element = CDPElement(driver, "object-1", "session-1")
+    driver._current = "tab-2"
+
+    assert element.text == "x"
+    assert conn.calls == [("Runtime.callFunctionOn", "session-1")]
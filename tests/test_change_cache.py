@@ -0,0 +1,70 @@
+import time
+
+from change_cache import MAX_BODY, ChangeCache
+
+
+class FakeResponse:
+    def __init__(self, status_code, text="", headers=None):
+        self.status_code = status_code
+        self.text = text
+        self.content = text.encode("utf-8")
+        self.headers = headers or {}
+
+
+class FakeSession:
+    """
+    ETag가 같으면 304, 아니면 200 + 본문
+    """
+    def __init__(self, text, etag):
+        self.text, self.etag = text, etag
+        self.requests = []
+
+    def get(self, url, headers=None, timeout=None):
+        self.requests.append(dict(headers or {}))
+        if (headers or {}).get("If-None-Match") == self.etag:
+            return FakeResponse(304)
+        return FakeResponse(200, self.text, {"ETag": self.etag})
+
+
+def test_page_probe_keeps_only_validators_and_digest(tmp_path):
+    cache = ChangeCache(str(tmp_path / "changes.db"))
+    session = FakeSession("<html>" + "x" * 1000 + "</html>", '"v1"')
+    parsed = []
+
+    def summarize(html):
+        parsed.append(html)
+        return "digest-1"
+
+    assert cache.page("https://example.com/p/1", summarize, session=session) == "digest-1"
+    assert cache.page("https://example.com/p/1", summarize, session=session) == "digest-1"
+    assert len(parsed) == 1                       # 304 → 다시 파싱하지 않음
+    assert session.requests[1]["If-None-Match"] == '"v1"'
+    assert cache.db.execute("SELECT COUNT(*) FROM responses").fetchone()[0] == 0
+    assert cache.db.execute("SELECT * FROM pages").fetchone()[3] == "digest-1"
+
+
+def test_large_bodies_are_not_stored(tmp_path):
+    cache = ChangeCache(str(tmp_path / "changes.db"))
+    session = FakeSession("x" * (MAX_BODY + 1), '"big"')
+    assert cache.get("https://example.com/api", session=session)[1] is True
+    assert cache.get("https://example.com/api", session=session)[1] is True
+    assert "If-None-Match" not in session.requests[1]
+    assert cache.db.execute("SELECT COUNT(*) FROM responses").fetchone()[0] == 0
+
+
+def test_prune_drops_entries_not_checked_within_retention(tmp_path):
+    path = str(tmp_path / "changes.db")
+    cache = ChangeCache(path)
+    cache.get("https://example.com/api", session=FakeSession("{}", '"a"'))
+    cache.page("https://example.com/p/1", lambda html: "d", session=FakeSession("<html/>", '"b"'))
+    cache.remember("https://example.com/p/1", "d", {"v": 1})
+    old = int(time.time()) - 8 * 86400
+    for table in ("responses", "pages"):
+        cache.db.execute(f"UPDATE {table} SET checked_at = ?", (old,))
+    cache.db.commit()
+    cache.close()
+
+    reopened = ChangeCache(path, retention=7 * 86400)
+    assert reopened.db.execute("SELECT COUNT(*) FROM responses").fetchone()[0] == 0
+    assert reopened.db.execute("SELECT COUNT(*) FROM pages").fetchone()[0] == 0
+    assert reopened.product("https://example.com/p/1", "d") == {"v": 1}
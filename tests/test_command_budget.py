@@ -0,0 +1,171 @@
+import json
+
+import pytest
+
+import crawler
+from crawler import BaseScraper, CommandBudgetExceeded, CountingDriver, MusinsaScraper, NaverScraper
+
+
+# ==========================================
+# 가짜 브라우저 (셀렉터 → 요소 표만 가진 DOM)
+# ==========================================
+class FakeElement:
+    def __init__(self, text="", attrs=None, displayed=True):
+        self.text = text
+        self.tag_name = "div"
+        self.attrs = attrs or {}
+        self.displayed = displayed
+
+    def get_attribute(self, name):
+        return self.attrs.get(name)
+
+    def is_displayed(self):
+        return self.displayed
+
+    def click(self):
+        pass
+
+    def find_element(self, by, sel):
+        raise LookupError(sel)
+
+    def find_elements(self, by, sel):
+        return []
+
+
+class FakeDriver:
+    def __init__(self, url, elements=None, scripts=None, page_source="<html></html>", title=""):
+        self.current_url = url
+        self.elements = elements or {}
+        # 스크립트 안의 문자열 → 돌려줄 값 (처음 맞는 것)
+        self.scripts = scripts or []
+        self.page_source = page_source
+        self.title = title
+        self.current_window_handle = "tab-0"
+
+    def get(self, url):
+        pass
+
+    def set_page_load_timeout(self, seconds):
+        pass
+
+    def find_element(self, by, sel):
+        found = self.elements.get(sel)
+        if not found:
+            raise LookupError(sel)
+        return found[0]
+
+    def find_elements(self, by, sel):
+        return list(self.elements.get(sel, []))
+
+    def execute_script(self, script, *args):
+        if "responseStatus" in script:
+            return {"status": 200, "url": self.current_url, "title": self.title,
+                    "hasData": True, "text": "", "selectors": []}
+        for marker, value in self.scripts:
+            if marker in script:
+                return value
+        return None
+
+
+@pytest.fixture(autouse=True)
+def offline(monkeypatch):
+    # HTTP API / 대기 시간 없이 브라우저 명령 수만 봄
+    monkeypatch.setattr(BaseScraper, "_http_get", lambda self, *a, **kw: None)
+    monkeypatch.setattr(BaseScraper, "_sleep", lambda self, seconds: None)
+
+
+def scrape(scraper_cls, driver, url):
+    counting = CountingDriver(driver)
+    data = scraper_cls(counting, crawler.SelectorStats()).scrape(url)
+    return data, counting.command_stats
+
+
+MUSINSA_URL = "https://www.musinsa.com/products/1234"
+MUSINSA_NEXT_DATA = json.dumps({"props": {"pageProps": {"state": {"product": {
+    "goodsNo": 1234,
+    "goodsNm": "테스트 셔츠",
+    "goodsPrice": 39000,
+    "goodsImage": "//image.msscdn.net/1234.jpg",
+    "goodsOption": {
+        "basic": [{"no": 1, "name": "컬러"}, {"no": 2, "name": "사이즈"}],
+        "optionItems": [
+            {"optionValues": [{"optionNo": 1, "name": "블랙"}, {"optionNo": 2, "name": "M"}], "isSoldOut": False},
+            {"optionValues": [{"optionNo": 1, "name": "블랙"}, {"optionNo": 2, "name": "L"}], "isSoldOut": True},
+            {"optionValues": [{"optionNo": 1, "name": "화이트"}, {"optionNo": 2, "name": "M"}], "isSoldOut": False},
+        ],
+    },
+}}}}}, ensure_ascii=False)
+
+
+def musinsa_driver():
+    return FakeDriver(
+        MUSINSA_URL,
+        elements={
+            "__NEXT_DATA__": [FakeElement(attrs={"innerHTML": MUSINSA_NEXT_DATA})],
+            crawler.Config.META_TITLE: [FakeElement(attrs={"content": "테스트 셔츠 - 무신사"})],
+            crawler.Config.META_IMAGE: [FakeElement(attrs={"content": "https://image.msscdn.net/1234.jpg"})],
+            "span[class*='Price__']": [FakeElement(text="39,000원")],
+        },
+        title="테스트 셔츠 | 무신사",
+    )
+
+
+NAVER_URL = "https://smartstore.naver.com/shop/products/5678"
+NAVER_STATE = {"product": {"A": {
+    "name": "테스트 바지",
+    "salePrice": 52000,
+    "optionCombinations": [
+        {"optionName1": "네이비", "optionName2": "30", "stockQuantity": 3},
+        {"optionName1": "네이비", "optionName2": "32", "stockQuantity": 0},
+    ],
+}}}
+
+
+def naver_driver():
+    return FakeDriver(
+        NAVER_URL,
+        scripts=[
+            ("JSON.stringify", json.dumps(NAVER_STATE, ensure_ascii=False)),
+            ("!== undefined", True),
+            ("return window", NAVER_STATE),
+        ],
+        title="테스트 바지 : 네이버 스마트스토어",
+    )
+
+
+# ==========================================
+# 페이지별 왕복 예산 (줄이면 같이 낮추기, 늘어나면 이유를 확인)
+# ==========================================
+MUSINSA_BUDGET = 15
+NAVER_BUDGET = 8
+
+
+def test_musinsa_scrape_within_budget():
+    data, stats = scrape(MusinsaScraper, musinsa_driver(), MUSINSA_URL)
+    assert data.price == 39000
+    assert len(data.combinations) == 3
+    # 조합이 페이지 JSON에 있으면 드롭다운을 열지 않음
+    assert not any("dropdown" in caller for caller in stats.by_caller)
+    stats.check(MUSINSA_BUDGET)
+    assert stats.by_command.get("get", 0) == 1
+
+
+def test_naver_scrape_within_budget():
+    data, stats = scrape(NaverScraper, naver_driver(), NAVER_URL)
+    assert data.title == "테스트 바지"
+    assert data.price == 52000
+    stats.check(NAVER_BUDGET)
+    assert stats.by_command.get("get", 0) == 1
+
+
+def test_result_reports_command_totals():
+    data, stats = scrape(NaverScraper, naver_driver(), NAVER_URL)
+    assert data.commands == stats.to_dict()
+    assert data.to_dict()["driverCommands"]["total"] == stats.total
+    assert sum(stats.by_caller.values()) == stats.total
+
+
+def test_budget_exceeded_names_the_callers():
+    _, stats = scrape(NaverScraper, naver_driver(), NAVER_URL)
+    with pytest.raises(CommandBudgetExceeded, match="NaverScraper"):
+        stats.check(1)
@@ -0,0 +1,118 @@
+import json
+import random
+
+import pytest
+
+import json_scan
+
+
+# ==========================================
+# 기준 구현: 전체를 json.loads 한 dict에서 예전 방식대로 찾기
+# ==========================================
+def ref_first(data, paths):
+    for path in paths:
+        value = data
+        for key in path:
+            value = value.get(key) if isinstance(value, dict) else None
+        if value:
+            return value
+    return None
+
+
+def _sized(value):
+    try:
+        return len(value or []) > 0
+    except TypeError:
+        return False
+
+
+def ref_object_with_keys(data, keys, depth=0):
+    if depth > 5:
+        return None
+    if isinstance(data, dict):
+        if any(k in data and _sized(data[k]) for k in keys):
+            return data
+        for value in data.values():
+            if isinstance(value, dict):
+                found = ref_object_with_keys(value, keys, depth + 1)
+                if found:
+                    return found
+    return None
+
+
+PATHS = [
+    ("props", "pageProps", "state", "product"),
+    ("props", "pageProps", "state", "goods"),
+    ("props", "pageProps", "product"),
+    ("product", "A"),
+    ("product",),
+]
+KEYS = ["optionCombinations", "simpleOptions"]
+# 키 이름에 따옴표/괄호가 든 문자열, 키처럼 보이는 값 등 스캐너가 헷갈리기 쉬운 것들
+LEAVES = [1, "a\"]}{", None, [], {}, [1, {"x": "}"}], "", 2.5e3, True, "\\u00e9x", '"optionCombinations": [1]']
+NAMES = ["a", "b", "product", "A", "state", "goods", "optionCombinations", "simpleOptions",
+         "props", "pageProps", "k\\\"q"]
+
+
+def random_doc(rng, depth=0):
+    if depth > int(rng.random() * 16) or rng.random() < 0.2:
+        return rng.choice(LEAVES)
+    if rng.random() < 0.3:
+        return [random_doc(rng, depth + 1) for _ in range(rng.randint(0, 3))]
+    return {rng.choice(NAMES): random_doc(rng, depth + 1) for _ in range(rng.randint(0, 5))}
+
+
+def random_docs(seed, count):
+    rng = random.Random(seed)
+    for _ in range(count):
+        doc = random_doc(rng)
+        if isinstance(doc, dict):
+            text = json.dumps(doc, indent=rng.choice([None, 1]), ensure_ascii=rng.random() < 0.5)
+            yield doc, text
+
+
+# ==========================================
+# 고정 예제
+# ==========================================
+def test_find_first_takes_the_first_nonempty_path():
+    text = json.dumps({"props": {"pageProps": {"state": {"product": {}, "goods": {"goodsNo": 1}}}}})
+    assert json_scan.find_first(text, PATHS) == {"goodsNo": 1}
+
+
+def test_find_first_ignores_keys_inside_strings():
+    text = json.dumps({"note": '"product": {"fake": 1}', "product": {"real": 1}})
+    assert json_scan.find_first(text, [("product",)]) == {"real": 1}
+
+
+def test_find_object_with_keys_returns_the_owner():
+    state = {"product": {"A": {"name": "x", "optionCombinations": [{"id": 1}]}}}
+    assert json_scan.find_object_with_keys(json.dumps(state), KEYS) == state["product"]["A"]
+
+
+def test_find_object_with_keys_skips_empty_values():
+    state = {"a": {"optionCombinations": []}, "b": {"simpleOptions": [1]}}
+    assert json_scan.find_object_with_keys(json.dumps(state), KEYS) == {"simpleOptions": [1]}
+
+
+def test_skip_value_matches_raw_decode():
+    text = json.dumps({"a": [1, {"b": "]}\\\""}, None], "c": 2})
+    _, end = json.JSONDecoder().raw_decode(text)
+    assert json_scan.skip_value(text, 0) == end
+
+
+# ==========================================
+# 무작위 문서: 기준 구현과 결과가 같아야 함 (고정 시드)
+# ==========================================
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_matches_reference_on_random_documents(seed):
+    for doc, text in random_docs(seed, 3000):
+        assert json_scan.find_first(text, PATHS) == ref_first(doc, PATHS), text
+        assert json_scan.find_object_with_keys(text, KEYS) == ref_object_with_keys(doc, KEYS), text
+
+
+def test_matches_reference_without_balanced_regex(monkeypatch):
+    # possessive 정규식을 못 쓰는 파이썬(3.11 미만) 경로
+    monkeypatch.setattr(json_scan, "_BALANCED", None)
+    for doc, text in random_docs(4, 2000):
+        assert json_scan.find_first(text, PATHS) == ref_first(doc, PATHS), text
+        assert json_scan.find_object_with_keys(text, KEYS) == ref_object_with_keys(doc, KEYS), text
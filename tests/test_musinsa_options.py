@@ -0,0 +1,22 @@
+from crawler import MusinsaScraper
+
+
+def test_dropdown_keeps_multi_word_sizes():
+    combos = MusinsaScraper._parse_dropdown_items([
+        ["블랙 / FREE SIZE", False],
+        ["블랙 / ONE SIZE 품절", False],
+        ["화이트 / 270 (품절)", False],
+        ["네이비 / L 재입고 알림", True],
+        ["그레이 / XL 3개 남음", False],
+    ])
+    assert [(c["color"], c["size"], c["isSoldOut"]) for c in combos] == [
+        ("블랙", "FREE SIZE", False),
+        ("블랙", "ONE SIZE", True),
+        ("화이트", "270", True),
+        ("네이비", "L", True),
+        ("그레이", "XL", False),
+    ]
+
+
+def test_dropdown_without_color_size_pairs_is_not_a_matrix():
+    assert MusinsaScraper._parse_dropdown_items([["FREE SIZE", False], ["블랙 / M", False]]) == []
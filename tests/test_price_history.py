@@ -0,0 +1,51 @@
+from price_history import HistoryStore
+
+
+def sizes(*names):
+    return {"price": 1000, "sizes": [{"name": n, "isSoldOut": False} for n in names]}
+
+
+# ==========================================
+# 같은 상품 파일을 쓰는 저장소 두 개 (다른 프로세스 / 워커)
+# ==========================================
+def test_two_stores_share_label_indices(tmp_path):
+    a, b = HistoryStore(str(tmp_path)), HistoryStore(str(tmp_path))
+    a.append("musinsa/1", sizes("M"), ts=1)
+    b.append("musinsa/1", sizes("L"), ts=2)
+    a.append("musinsa/1", sizes("M", "S"), ts=3)
+
+    fresh = HistoryStore(str(tmp_path))
+    assert fresh.stock_at("musinsa/1", 2) == {"size:M": True, "size:L": False, "size:S": True}
+    assert fresh.stock_at("musinsa/1", 3) == {"size:M": False, "size:L": True, "size:S": False}
+    assert a.stock_at("musinsa/1", 3) == fresh.stock_at("musinsa/1", 3)
+    assert b.stock_at("musinsa/1", 3) == fresh.stock_at("musinsa/1", 3)
+
+
+def test_append_after_other_store_downsampled(tmp_path):
+    a, b = HistoryStore(str(tmp_path)), HistoryStore(str(tmp_path))
+    for day in range(5):
+        a.append("musinsa/1", sizes("M"), ts=day * 86400)
+    assert b.downsample("musinsa/1", older_than=0, bucket=10 * 86400, now=10 * 86400) == 4
+
+    a.append("musinsa/1", sizes("L"), ts=20 * 86400)
+    fresh = HistoryStore(str(tmp_path))
+    assert [ts for ts, _ in fresh.price_series("musinsa/1")] == [4 * 86400, 20 * 86400]
+    assert fresh.stock_at("musinsa/1", 20 * 86400) == {"size:M": True, "size:L": False}
+
+
+def test_torn_tail_is_replaced_by_next_append(tmp_path):
+    store = HistoryStore(str(tmp_path))
+    store.append("musinsa/1", sizes("M"), ts=1)
+    with open(store._path("musinsa/1"), "ab") as f:
+        f.write(b"S\x01\x02")   # 쓰다가 죽은 스냅샷
+
+    HistoryStore(str(tmp_path)).append("musinsa/1", sizes("M"), ts=2)
+    assert HistoryStore(str(tmp_path)).price_series("musinsa/1") == [(1, 1000), (2, 1000)]
+
+
+def test_cache_is_bounded(tmp_path):
+    store = HistoryStore(str(tmp_path), max_cached=2)
+    for n in range(5):
+        store.append(f"musinsa/{n}", sizes("M"), ts=n)
+    assert len(store._cache) == 2
+    assert store.price_series("musinsa/0") == [(0, 1000)]
@@ -0,0 +1,37 @@
+import json
+
+from crawler import SelectorStats
+
+
+GROUP = "musinsa:goods:price"
+CANDIDATES = [".dead", ".alive"]
+
+
+def write_stats(path, calls=0):
+    stats = {GROUP: {".dead": [0, SelectorStats.DROP_AFTER], ".alive": [20, 20]}}
+    if calls:
+        stats[GROUP][SelectorStats.CALLS] = [0, calls]
+    path.write_text(json.dumps(stats), encoding="utf-8")
+
+
+def test_dead_selector_is_dropped(tmp_path):
+    path = tmp_path / "stats.json"
+    write_stats(path, calls=1)
+    assert SelectorStats(str(path)).order(GROUP, CANDIDATES) == [".alive"]
+
+
+def test_dead_selector_comes_back_across_processes(tmp_path):
+    # server.js처럼 스크래핑마다 새 프로세스: 파일에서 읽고 → order 한 번 → 저장
+    path = tmp_path / "stats.json"
+    write_stats(path)
+    orders = []
+    for _ in range(SelectorStats.RETRY_EVERY):
+        stats = SelectorStats(str(path))
+        orders.append(stats.order(GROUP, CANDIDATES))
+        stats.save()
+
+    retried = [o for o in orders if ".dead" in o]
+    assert retried == [[".alive", ".dead"]]
+    assert orders[-1] == retried[0]
+    saved = json.loads(path.read_text(encoding="utf-8"))
+    assert saved[GROUP][SelectorStats.CALLS] == [0, SelectorStats.RETRY_EVERY]